@@ -0,0 +1,7 @@
+"""Compiler benchmarks.
+
+Run individual benchmarks from the repository root, e.g. `python -m benchmarks.bench_destruct_template`.
+`python -m benchmarks.bench_compiler` times all compiler phases on synthetic descriptors
+(see `benchmarks.synthetic`) and can compare against a saved baseline. `python -m benchmarks.bench_wrappers`
+does the same for calling the generated wrappers.
+"""
@@ -0,0 +1,128 @@
+"""Benchmark compiler throughput per phase on synthetic descriptors.
+
+Times `from_boutiques`, `optimize`, `LookupParam` construction, `compile_interface` (which includes
+building its own `LookupParam`) and module generation separately. Results can be saved as JSON and
+compared against a previous run to catch regressions:
+
+    python -m benchmarks.bench_compiler --json baseline.json
+    python -m benchmarks.bench_compiler --baseline baseline.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+from typing import Callable, Iterable, TypeVar
+
+import styx.ir.core as ir
+from benchmarks.synthetic import DescriptorShape, synthetic_descriptor
+from styx.backend.generic.gen.interface import compile_interface
+from styx.backend.generic.gen.lookup import LookupParam
+from styx.backend.generic.model import GenericModule
+from styx.backend.generic.scope import Scope
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.optimize import optimize
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+PRESETS: dict[str, DescriptorShape] = {
+    "flat": DescriptorShape(num_inputs=20),
+    "wide": DescriptorShape(num_inputs=200, num_outputs=20),
+    "deep": DescriptorShape(num_inputs=5, depth=8),
+    "union": DescriptorShape(num_inputs=10, depth=3, alternatives=3),
+    "lists": DescriptorShape(num_inputs=50, list_every=1),
+}
+"""Descriptor shapes by name."""
+
+PHASES = ("from_boutiques", "optimize", "lookup_param", "compile_interface", "generate_module")
+
+
+def _timed(func: Callable[[T], R], items: Iterable[T]) -> tuple[float, list[R]]:
+    """Apply a function to all items, returning the elapsed time and results."""
+    start = time.perf_counter()
+    results = [func(item) for item in items]
+    return time.perf_counter() - start, results
+
+
+def _lookup_param(lang: PythonLanguageProvider, interface: ir.Interface) -> LookupParam:
+    """Build the lookup tables in fresh scopes (like `compile_interface`)."""
+    package_scope = Scope(lang.language_scope())
+    return LookupParam(
+        lang=lang,
+        interface=interface,
+        package_scope=package_scope,
+        function_symbol=package_scope.add_or_dodge(lang.symbol_var_case_from(interface.command.base.name)),
+        function_scope=lang.language_scope(),
+    )
+
+
+def _compile_interface(lang: PythonLanguageProvider, interface: ir.Interface) -> GenericModule:
+    module = GenericModule()
+    compile_interface(
+        lang=lang, interface=interface, package_scope=Scope(lang.language_scope()), interface_module=module
+    )
+    return module
+
+
+def bench_shape(shape: DescriptorShape, count: int, repeat: int) -> dict[str, float]:
+    """Best time per descriptor (seconds) for each phase."""
+    lang = PythonLanguageProvider()
+    descriptors = [synthetic_descriptor(f"tool_{i}", shape) for i in range(count)]
+    best = dict.fromkeys(PHASES, float("inf"))
+    for _ in range(repeat):
+        times: dict[str, float] = {}
+        times["from_boutiques"], interfaces = _timed(lambda d: from_boutiques(d, "bench"), descriptors)
+        times["optimize"], interfaces = _timed(optimize, interfaces)
+        times["lookup_param"], _ = _timed(lambda i: _lookup_param(lang, i), interfaces)
+        times["compile_interface"], modules = _timed(lambda i: _compile_interface(lang, i), interfaces)
+        times["generate_module"], _ = _timed(lang.generate_module_source, modules)
+        for phase, seconds in times.items():
+            best[phase] = min(best[phase], seconds / count)
+    return best
+
+
+def _regressions(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    regressions = []
+    for preset, phases in results.items():
+        for phase, seconds in phases.items():
+            reference = baseline.get(preset, {}).get(phase)
+            if reference is not None and seconds > reference * (1 + tolerance):
+                regressions.append(f"{preset}/{phase}: {reference * 1000:.3f} ms -> {seconds * 1000:.3f} ms")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("presets", nargs="*", help=f"Descriptor shapes {list(PRESETS)} (default: all).")
+    parser.add_argument("-n", "--count", type=int, default=20, help="Descriptors per shape (default: 20).")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Repetitions, the best is reported (default: 3).")
+    parser.add_argument("--json", type=pathlib.Path, help="Write results to a JSON file.")
+    parser.add_argument("--baseline", type=pathlib.Path, help="Compare against results of a previous run.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (default: 0.25).")
+    args = parser.parse_args(argv)
+    if unknown := set(args.presets) - PRESETS.keys():
+        parser.error(f"unknown shapes: {', '.join(sorted(unknown))}")
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'shape':<8}" + "".join(f"{phase:>18}" for phase in PHASES) + "   [ms per descriptor]")
+    for preset in args.presets or PRESETS:
+        results[preset] = bench_shape(PRESETS[preset], args.count, args.repeat)
+        print(f"{preset:<8}" + "".join(f"{results[preset][phase] * 1000:>18.3f}" for phase in PHASES))
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.baseline is not None:
+        regressions = _regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Benchmark Boutiques template destruction.
+
+Compares the single-pass tokenizer of `destruct_template` against splitting by alias priority.
+"""
+
+import timeit
+
+from styx.frontend.boutiques.core import (
+    _destruct_template_by_priority,
+    _destruct_template_tokenized,
+    _template_tokenizer,
+)
+from styx.frontend.boutiques.utils import boutiques_split_command
+
+
+def _command_line(num_inputs: int) -> tuple[list[str], dict[str, int]]:
+    """Command line arguments and value-key lookup of a tool with many inputs."""
+    lookup = {f"[INPUT_{i}]": i for i in range(num_inputs)}
+    command_line = " ".join(["tool", *(f"-i{i}=[INPUT_{i}]" for i in range(num_inputs))])
+    return boutiques_split_command(command_line), lookup
+
+
+def _time(stmt: object, number: int) -> float:
+    """Best time per call in milliseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1000  # type: ignore
+
+
+def main() -> None:
+    print(f"{'inputs':>8} {'priority [ms]':>14} {'tokenizer [ms]':>15} {'build [ms]':>11} {'speedup':>8}")
+    for num_inputs in (10, 50, 100, 500, 1000):
+        args, lookup = _command_line(num_inputs)
+        number = max(1, 2000 // num_inputs)
+
+        def _priority() -> None:
+            for arg in args:
+                _destruct_template_by_priority(arg, lookup)
+
+        def _tokenizer() -> None:
+            tokenizer = _template_tokenizer(tuple(lookup))
+            for arg in args:
+                _destruct_template_tokenized(arg, lookup, tokenizer)
+
+        def _build() -> None:
+            _template_tokenizer.cache_clear()
+            _template_tokenizer(tuple(lookup))
+
+        t_priority = _time(_priority, number)
+        t_build = _time(_build, 1)
+        t_tokenizer = _time(_tokenizer, number)
+        print(
+            f"{num_inputs:>8} {t_priority:>14.3f} {t_tokenizer:>15.3f} {t_build:>11.3f} "
+            f"{t_priority / t_tokenizer:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
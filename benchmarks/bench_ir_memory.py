@@ -0,0 +1,42 @@
+"""Benchmark memory held by the IR of a synthetic descriptor corpus."""
+
+import gc
+import re
+import tracemalloc
+
+from benchmarks.synthetic import DescriptorShape, synthetic_descriptor
+from styx.frontend.boutiques import from_boutiques
+from styx.frontend.boutiques.core import _template_tokenizer
+
+CORPUS: list[tuple[int, DescriptorShape]] = [
+    (300, DescriptorShape(num_inputs=20)),
+    (100, DescriptorShape(num_inputs=100, num_outputs=10)),
+    (50, DescriptorShape(num_inputs=10, depth=3, alternatives=3)),
+]
+"""Number of descriptors per shape."""
+
+
+def main() -> None:
+    descriptors = [
+        synthetic_descriptor(f"tool_{shape_index}_{i}", shape)
+        for shape_index, (count, shape) in enumerate(CORPUS)
+        for i in range(count)
+    ]
+    gc.collect()
+    tracemalloc.start()
+    interfaces = [from_boutiques(descriptor, "bench") for descriptor in descriptors]
+    # Only count memory held by the IR, not frontend caches
+    _template_tokenizer.cache_clear()
+    re.purge()
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    num_params = sum(1 + sum(1 for _ in i.command.iter_params_recursively()) for i in interfaces)
+    print(f"interfaces: {len(interfaces):10}")
+    print(f"params:     {num_params:10}")
+    print(f"IR memory:  {held / 2**20:10.1f} MiB ({held / num_params:.0f} bytes per param)")
+
+
+if __name__ == "__main__":
+    main()
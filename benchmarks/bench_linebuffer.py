@@ -0,0 +1,69 @@
+"""Benchmark generating module source from the generic module model.
+
+Reports time and memory allocated (tracemalloc) for code generation of a large descriptor
+with nested sub-commands, rendered in memory and streamed to a (discarding) text stream.
+"""
+
+import io
+import timeit
+import tracemalloc
+from typing import Callable, Iterable
+
+from benchmarks.synthetic import DescriptorShape, synthetic_descriptor
+from styx.backend.generic.gen.interface import compile_interface
+from styx.backend.generic.model import GenericModule
+from styx.backend.generic.scope import Scope
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+
+
+class _NullStream(io.StringIO):
+    """Text stream discarding everything written to it."""
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        for _ in lines:
+            pass
+
+
+def _peak(call: Callable[[], object]) -> int:
+    """Peak memory allocated during a call (bytes)."""
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    lang = PythonLanguageProvider()
+    interface = from_boutiques(synthetic_descriptor("tool", DescriptorShape(depth=4, alternatives=2)), "bench")
+    module = GenericModule()
+    compile_interface(
+        lang=lang, interface=interface, package_scope=Scope(lang.language_scope()), interface_module=module
+    )
+
+    def _generate() -> str:
+        return lang.generate_module_source(module)
+
+    def _write() -> None:
+        lang.write_module(module, _NullStream())
+
+    source = _generate()
+    peak = _peak(_generate)
+    peak_write = _peak(_write)
+
+    number = 10
+    elapsed = min(timeit.repeat(_generate, number=number, repeat=5)) / number * 1000
+    print(f"source:          {len(source.splitlines()):10} lines")
+    print(f"generate module: {elapsed:10.2f} ms")
+    print(f"peak allocated:  {peak / 1024:10.0f} KiB")
+    print(f"peak streamed:   {peak_write / 1024:10.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
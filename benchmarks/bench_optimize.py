@@ -0,0 +1,47 @@
+"""Benchmark the effect of IR optimization passes on the generated wrappers.
+
+Compiles a synthetic descriptor without optimizations, with each pass alone and with all passes,
+then counts the statements adding command line arguments in the generated module and times building
+them by calling the generated wrapper with a runner that does not execute anything.
+"""
+
+import timeit
+from typing import Callable
+
+from benchmarks.synthetic import DescriptorShape, synthetic_descriptor
+from benchmarks.wrappers import LoadedWrapper, NullRunner
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.optimize import PASSES, optimize
+
+SHAPE = DescriptorShape(num_inputs=40, literals=4, list_every=5, optional_strings=False)
+"""Required String inputs are followed by required File inputs, which unconditional groups can be collapsed for."""
+
+
+def _wrapper_call(passes: list[str]) -> tuple[int, int, Callable[[], object]]:
+    """Compile the descriptor with the given passes.
+
+    Returns:
+        Number of lines, number of statements adding cargs and a call of the wrapper.
+    """
+    wrapper = LoadedWrapper(optimize(from_boutiques(synthetic_descriptor("tool", SHAPE), "bench"), passes))
+    arguments = wrapper.arguments()
+    runner = NullRunner()
+    statements = wrapper.source.count("cargs.append(") + wrapper.source.count("cargs.extend(")
+    return len(wrapper.source.splitlines()), statements, lambda: wrapper.function(**arguments, runner=runner)
+
+
+def main() -> None:
+    configurations = {"none": [], **{name: [name] for name in PASSES}, "all": list(PASSES)}
+    calls = {name: _wrapper_call(passes) for name, passes in configurations.items()}
+    number = 1000
+    best = dict.fromkeys(configurations, float("inf"))
+    for _ in range(20):  # Interleaved, so that noise affects all configurations alike
+        for name, (_, _, call) in calls.items():
+            best[name] = min(best[name], timeit.timeit(call, number=number) / number * 1e6)
+    print(f"{'passes':<32}{'lines':>8}{'statements':>12}{'call [us]':>12}{'speedup':>10}")
+    for name, (lines, statements, _) in calls.items():
+        print(f"{name:<32}{lines:>8}{statements:>12}{best[name]:>12.2f}{best['none'] / best[name]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark reloading a parsed corpus from the binary IR format vs. re-running `from_boutiques`."""
+
+import io
+import json
+import time
+
+from benchmarks.bench_ir_memory import CORPUS
+from benchmarks.synthetic import synthetic_descriptor
+from styx.frontend.boutiques import from_boutiques
+from styx.ir import serialize
+
+
+def main() -> None:
+    descriptors = [
+        json.dumps(synthetic_descriptor(f"tool_{shape_index}_{i}", shape))
+        for shape_index, (count, shape) in enumerate(CORPUS)
+        for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    interfaces = [from_boutiques(json.loads(descriptor), "bench") for descriptor in descriptors]
+    t_parse = time.perf_counter() - start
+
+    stream = io.BytesIO()
+    start = time.perf_counter()
+    serialize.dump(interfaces, stream)
+    t_dump = time.perf_counter() - start
+
+    stream.seek(0)
+    start = time.perf_counter()
+    loaded = list(serialize.load(stream))
+    t_load = time.perf_counter() - start
+    assert len(loaded) == len(interfaces)
+
+    size_json = sum(len(descriptor) for descriptor in descriptors)
+    print(f"interfaces:           {len(interfaces):10}")
+    print(f"JSON + from_boutiques {t_parse:10.3f}s {size_json / 2**20:8.1f} MiB")
+    print(f"serialize.dump        {t_dump:10.3f}s {len(stream.getvalue()) / 2**20:8.1f} MiB")
+    print(f"serialize.load        {t_load:10.3f}s ({t_parse / t_load:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
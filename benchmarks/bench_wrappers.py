@@ -0,0 +1,136 @@
+"""Benchmark calling generated Python wrappers.
+
+Compiles synthetic descriptors, loads the generated modules in-process and measures per-call latency
+and peak memory allocated per call of the wrapper function (constraint checks, cargs building, outputs
+construction) and of the `run()`/`outputs()` methods of its sub-command. The runner does not execute
+anything (see `benchmarks.wrappers.NullRunner`), so only the generated code is measured. Results can be
+saved as JSON and compared against a previous run (e.g. of the previous release):
+
+    python -m benchmarks.bench_wrappers --json baseline.json
+    python -m benchmarks.bench_wrappers --baseline baseline.json --tolerance 0.25
+
+`--flat-cargs` compiles the wrappers with flat cargs building (see `PythonLanguageProvider`).
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import timeit
+import tracemalloc
+from typing import Callable
+
+import styx.ir.core as ir
+from benchmarks.synthetic import DescriptorShape, synthetic_descriptor
+from benchmarks.wrappers import LoadedWrapper, NullRunner
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.optimize import optimize
+
+PRESETS: dict[str, DescriptorShape] = {
+    "flat": DescriptorShape(num_inputs=20),
+    "wide": DescriptorShape(num_inputs=200, num_outputs=20),
+    "lists": DescriptorShape(num_inputs=50, list_every=1),
+    "deep": DescriptorShape(num_inputs=5, depth=8),
+    "union": DescriptorShape(num_inputs=10, depth=3, alternatives=3),
+    "chain": DescriptorShape(num_inputs=3, depth=8, list_every=0, optional_strings=False),
+}
+"""Descriptor shapes by name."""
+
+TARGETS = ("call", "run", "outputs")
+"""Measured callables: the wrapper function and the methods of its sub-command (if any)."""
+
+
+def _per_call(call: Callable[[], object], number: int, repeat: int) -> float:
+    """Best time per call (seconds)."""
+    return min(timeit.repeat(call, number=number, repeat=repeat)) / number
+
+
+def _allocated(call: Callable[[], object]) -> int:
+    """Peak memory allocated during a call (bytes)."""
+    call()  # Warm up caches (e.g. interned strings, method lookups)
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _targets(wrapper: LoadedWrapper) -> dict[str, Callable[[], object]]:
+    runner = NullRunner()
+    arguments = wrapper.arguments()
+    targets: dict[str, Callable[[], object]] = {"call": lambda: wrapper.function(**arguments, runner=runner)}
+    for param in wrapper.interface.command.body.iter_params():
+        if isinstance(param.body, ir.Param.Struct | ir.Param.StructUnion):
+            sub_command = arguments[wrapper.lookup.py_symbol[param.base.id_]]
+            targets["run"] = lambda: sub_command.run(runner)  # type: ignore[attr-defined]
+            if hasattr(sub_command, "outputs"):
+                targets["outputs"] = lambda: sub_command.outputs(runner)  # type: ignore[attr-defined]
+            break
+    return targets
+
+
+def bench_shape(shape: DescriptorShape, number: int, repeat: int, flat_cargs: bool = False) -> dict[str, float]:
+    """Best time per call (seconds) and peak bytes allocated per call for each target."""
+    wrapper = LoadedWrapper(
+        optimize(from_boutiques(synthetic_descriptor("tool", shape), "bench")), PythonLanguageProvider(flat_cargs)
+    )
+    results = {}
+    for target, call in _targets(wrapper).items():
+        results[f"{target}_seconds"] = _per_call(call, number, repeat)
+        results[f"{target}_bytes"] = _allocated(call)
+    return results
+
+
+def _regressions(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    regressions = []
+    for preset, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(preset, {}).get(metric)
+            if reference is not None and value > reference * (1 + tolerance):
+                regressions.append(f"{preset}/{metric}: {reference:.3g} -> {value:.3g}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("presets", nargs="*", help=f"Descriptor shapes {list(PRESETS)} (default: all).")
+    parser.add_argument("-n", "--number", type=int, default=1000, help="Calls per repetition (default: 1000).")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Repetitions, the best is reported (default: 5).")
+    parser.add_argument("--flat-cargs", action="store_true", help="Generate flat cargs building.")
+    parser.add_argument("--json", type=pathlib.Path, help="Write results to a JSON file.")
+    parser.add_argument("--baseline", type=pathlib.Path, help="Compare against results of a previous run.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (default: 0.25).")
+    args = parser.parse_args(argv)
+    if unknown := set(args.presets) - PRESETS.keys():
+        parser.error(f"unknown shapes: {', '.join(sorted(unknown))}")
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'shape':<8}" + "".join(f"{target + ' [us]':>14}{target + ' [KiB]':>14}" for target in TARGETS))
+    for preset in args.presets or PRESETS:
+        results[preset] = bench_shape(PRESETS[preset], args.number, args.repeat, args.flat_cargs)
+        row = f"{preset:<8}"
+        for target in TARGETS:
+            if f"{target}_seconds" in results[preset]:
+                row += f"{results[preset][f'{target}_seconds'] * 1e6:>14.2f}"
+                row += f"{results[preset][f'{target}_bytes'] / 1024:>14.1f}"
+            else:
+                row += f"{'-':>14}{'-':>14}"
+        print(row)
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.baseline is not None:
+        regressions = _regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Synthetic Boutiques descriptors of controlled size for benchmarks."""
+
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class DescriptorShape:
+    """Size parameters of a synthetic descriptor."""
+
+    num_inputs: int = 20
+    """Number of inputs per (sub-)command (excluding the nested sub-command input)."""
+
+    depth: int = 0
+    """Nesting depth of sub-commands."""
+
+    alternatives: int = 1
+    """Alternatives per nested sub-command input. One is a `SubCommand`, more a `SubCommandUnion`."""
+
+    list_every: int = 4
+    """Every n-th input is a list (0 for none)."""
+
+    num_outputs: int = 2
+    """Number of output files per (sub-)command. Path templates reference inputs."""
+
+    literals: int = 0
+    """Number of literal words (e.g. fixed sub-command names) preceding the inputs of each (sub-)command."""
+
+    optional_strings: bool = True
+    """Whether String inputs are optional. Files are always required, flags and lists always optional."""
+
+
+def _input(prefix: str, i: int, shape: DescriptorShape) -> dict:
+    input_ = {
+        "id": f"{prefix}_{i}",
+        "name": f"Input {i} of {prefix}",
+        "description": f"Synthetic input number {i}.",
+        "value-key": f"[{prefix.upper()}_{i}]",
+    }
+    if shape.list_every and i % shape.list_every == shape.list_every - 1:
+        return {
+            **input_,
+            "type": "Number",
+            "list": True,
+            "optional": True,
+            "min-list-entries": 1,
+            "minimum": 0,
+            "maximum": 100,
+        }
+    match i % 3:
+        case 0:
+            return {**input_, "type": "File"}
+        case 1:
+            return {**input_, "type": "Flag", "command-line-flag": f"--flag-{i}", "optional": True}
+        case _:
+            return {**input_, "type": "String", "command-line-flag": f"-s{i}", "optional": shape.optional_strings}
+
+
+def _command(prefix: str, depth: int, shape: DescriptorShape) -> dict:
+    inputs = [_input(prefix, i, shape) for i in range(shape.num_inputs)]
+    if depth > 0:
+        subcommands = [_command(f"{prefix}_{alt}", depth - 1, shape) for alt in range(shape.alternatives)]
+        inputs.append({
+            "id": f"{prefix}_sub",
+            "name": "Sub-command",
+            "value-key": f"[{prefix.upper()}_SUB]",
+            "type": subcommands[0] if len(subcommands) == 1 else subcommands,
+        })
+    file_keys = [input_["value-key"] for input_ in inputs if input_["type"] == "File"] or ["out"]
+    outputs = [
+        {
+            "id": f"{prefix}_out_{i}",
+            "name": f"Output {i}",
+            "path-template": f"{file_keys[i % len(file_keys)]}_out_{i}.nii.gz",
+            "path-template-stripped-extensions": [".nii.gz", ".nii"],
+        }
+        for i in range(shape.num_outputs)
+    ]
+    return {
+        "id": prefix,
+        "command-line": " ".join([
+            *(f"{prefix}-word-{i}" for i in range(shape.literals)),
+            *(input_["value-key"] for input_ in inputs),
+        ]),
+        "inputs": inputs,
+        "output-files": outputs,
+    }
+
+
+def synthetic_descriptor(name: str, shape: DescriptorShape) -> dict:
+    """Generate a Boutiques descriptor with the given shape."""
+    command = _command(name, shape.depth, shape)
+    command.pop("id")
+    return {
+        "name": name,
+        "tool-version": "1.0",
+        "description": f"Synthetic tool {name}.",
+        "schema-version": "0.5",
+        "container-image": {"type": "docker", "image": f"synthetic/{name}"},
+        **command,
+    }
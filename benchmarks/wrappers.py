@@ -0,0 +1,87 @@
+"""Load generated Python wrappers in-process and call them with a runner that does not execute anything."""
+
+import types
+
+from styxdefs import Execution, Metadata, OutputPathType, Runner
+
+import styx.ir.core as ir
+from styx.backend.generic.core import compile_language
+from styx.backend.generic.gen.lookup import LookupParam
+from styx.backend.generic.scope import Scope
+from styx.backend.python.languageprovider import PythonLanguageProvider
+
+
+class NullRunner(Runner, Execution):
+    """Runner (and its own execution) that only returns paths, like `tests.utils.dummy_runner.DummyRunner`."""
+
+    def start_execution(self, metadata: Metadata) -> Execution:
+        return self
+
+    def input_file(self, host_file: object, resolve_parent: bool = False, mutable: bool = False) -> str:
+        return str(host_file)
+
+    def output_file(self, local_file: str, optional: bool = False) -> OutputPathType:
+        return local_file
+
+    def run(self, cargs: list[str], handle_stdout: object = None, handle_stderr: object = None) -> None:
+        pass
+
+
+class LoadedWrapper:
+    """Generated module of an interface with symbol lookups to build valid arguments for it."""
+
+    def __init__(self, interface: ir.Interface, lang: PythonLanguageProvider | None = None) -> None:
+        """Compile and load an (already optimized) interface.
+
+        Args:
+            interface: Interface to compile.
+            lang: Language provider (with its code generation options), a default one if None.
+        """
+        lang = PythonLanguageProvider() if lang is None else lang
+        self.interface = interface
+        self.source: str = next(compile_language(lang, [interface]))[0]
+        """Generated module source."""
+        self.module = types.ModuleType(f"bench_{interface.command.base.name}")
+        exec(self.source, self.module.__dict__)
+        # Symbols are assigned deterministically, so fresh scopes resolve the same names as the compiler
+        package_scope = Scope(lang.language_scope())
+        self.lookup = LookupParam(
+            lang=lang,
+            interface=interface,
+            package_scope=package_scope,
+            function_symbol=package_scope.add_or_dodge(lang.symbol_var_case_from(interface.command.base.name)),
+            function_scope=lang.language_scope(),
+        )
+        self.function = getattr(self.module, self.lookup.py_struct_type[interface.command.base.id_])
+        """Generated wrapper function."""
+
+    def arguments(self, struct: ir.Param[ir.Param.Struct] | None = None) -> dict[str, object]:
+        """Keyword arguments setting every param of a struct (the command by default) to a valid value."""
+        struct = self.interface.command if struct is None else struct
+        return {self.lookup.py_symbol[param.base.id_]: self.value(param) for param in struct.body.iter_params()}
+
+    def value(self, param: ir.Param) -> object:
+        """Valid value for a param. Sub-commands are instantiated, unions use their first alternative."""
+        match param.body:
+            case ir.Param.Bool():
+                value: object = True
+            case ir.Param.Int() | ir.Param.Float():
+                value = 1 if param.body.min_value is None else param.body.min_value
+            case ir.Param.File():
+                value = "in.nii.gz"
+            case ir.Param.Struct():
+                value = self.instance(param)
+            case ir.Param.StructUnion():
+                value = self.instance(param.body.alts[0])
+            case _:
+                value = "value"
+        if param.list_ is None:
+            return value
+        length = max(2, param.list_.count_min or 0)
+        if param.list_.count_max is not None:
+            length = min(length, param.list_.count_max)
+        return [value] * length
+
+    def instance(self, struct: ir.Param[ir.Param.Struct]) -> object:
+        """Instance of the generated class of a sub-command."""
+        return getattr(self.module, self.lookup.py_struct_type[struct.base.id_])(**self.arguments(struct))
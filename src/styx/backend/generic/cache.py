@@ -0,0 +1,134 @@
+"""On-disk cache of compiled interface modules."""
+
+import dataclasses
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import pathlib
+import sys
+import tempfile
+
+from styx.backend.generic.languageprovider import LanguageProvider
+from styx.ir.core import Interface
+from styx.ir.serialize import digest
+
+
+@dataclasses.dataclass
+class CompiledModule:
+    """Interface module compiled against an otherwise empty package scope."""
+
+    source: str
+    """Generated module source."""
+
+    scope_queries: set[str]
+    """Symbols that were looked up in the package scope (or its parents)."""
+
+    scope_symbols: list[str]
+    """Symbols that were added to the package scope, in order."""
+
+    exports: list[str]
+    """Symbols exported by the module."""
+
+
+@functools.cache
+def styx_version() -> str:
+    """Version of the installed styx compiler.
+
+    Without package metadata (e.g. running from a source checkout), this is a hash of the compiler
+    sources instead, so changes to them still invalidate cached modules. Editable installs report
+    the installed version, their caches must be cleared by hand after changing the compiler.
+    """
+    try:
+        return importlib.metadata.version("styxcompiler")
+    except importlib.metadata.PackageNotFoundError:
+        return f"unknown+{_source_digest()}"
+
+
+def _source_digest() -> str:
+    """Hash of the sources of the styx package."""
+    root = pathlib.Path(__file__).parents[2]
+    h = hashlib.sha1()
+    for path in sorted(root.rglob("*.py")):
+        h.update(path.relative_to(root).as_posix().encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+class CompileCache:
+    """Content-addressed cache mapping interfaces to their compiled modules.
+
+    Entries are keyed on the interface contents (see `styx.ir.serialize.digest`, so interfaces changed
+    after loading, e.g. by `optimize`, get their own entries), the language provider and its options
+    (see `LanguageProvider.cache_key`), the styx version and the styxdefs compatibility of the
+    generated code. They also include the Python version, as generated symbols dodge the names of
+    builtins and standard library modules of the running interpreter.
+    """
+
+    def __init__(self, path: str | pathlib.Path, salt: str = "") -> None:
+        """Create a cache backed by a directory (created on demand).
+
+        Args:
+            path: Cache directory.
+            salt: Added to all keys. Distinguishes entries that depend on anything else than the
+                above (e.g. a custom language provider with options missing from its `cache_key`).
+        """
+        self.path = pathlib.Path(path)
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, lang: LanguageProvider, interface: Interface, dedupe_structs: bool = False) -> str:
+        """Cache key of an interface compiled by a language provider (with the given compile options)."""
+        parts = [
+            digest(interface),
+            f"{type(lang).__module__}.{type(lang).__qualname__}",
+            lang.cache_key(),
+            styx_version(),
+            "python{}.{}".format(*sys.version_info[:2]),
+            lang.styxdefs_compat(),
+        ]
+        if dedupe_structs:
+            parts.append("dedupe_structs")
+        if self.salt:
+            parts.append(self.salt)
+        return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> pathlib.Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> CompiledModule | None:
+        """Look up a compiled module. Unreadable entries are treated as missing."""
+        try:
+            data = json.loads(self._entry_path(key).read_text(encoding="utf-8"))
+            entry = CompiledModule(
+                source=data["source"],
+                scope_queries=set(data["scope_queries"]),
+                scope_symbols=data["scope_symbols"],
+                exports=data["exports"],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: CompiledModule) -> None:
+        """Store a compiled module (atomically replacing any previous entry)."""
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "source": entry.source,
+            "scope_queries": sorted(entry.scope_queries),
+            "scope_symbols": entry.scope_symbols,
+            "exports": entry.exports,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
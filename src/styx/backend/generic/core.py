@@ -1,13 +1,19 @@
+import collections
+import concurrent.futures
 import dataclasses
-from typing import Any, Generator, Iterable
+from typing import Any, Generator, Iterable, TextIO
 
+from styx.backend.generic.cache import CompileCache, CompiledModule
 from styx.backend.generic.documentation import docs_to_docstring
 from styx.backend.generic.gen.interface import compile_interface
 from styx.backend.generic.languageprovider import LanguageProvider
-from styx.backend.generic.linebuffer import collapse
 from styx.backend.generic.model import GenericModule
 from styx.backend.generic.scope import Scope
 from styx.ir.core import Interface, Package
+from styx.profiling import UNKNOWN_SUBJECT, interface_subject, subject, timed
+
+_PENDING_PER_WORKER = 4
+"""Number of interfaces queued per worker process before results are consumed."""
 
 
 @dataclasses.dataclass
@@ -16,24 +22,211 @@ class _PackageData:
     package_symbol: str
     scope: Scope
     module: GenericModule
+    module_exports: dict[str, list[str]] = dataclasses.field(default_factory=dict)
 
 
-def compile_language(
-    lang: LanguageProvider, interfaces: Iterable[Interface]
-) -> Generator[tuple[str, list[str]], Any, None]:
-    """For a stream of IR interfaces return a stream of Python modules and their module paths.
+class _RecordingSet(set[str]):
+    """Symbol set that records every membership test."""
+
+    def __init__(self, queries: set[str]) -> None:
+        super().__init__()
+        self.queries = queries
+
+    def __contains__(self, symbol: object) -> bool:
+        self.queries.add(symbol)  # type: ignore[arg-type]
+        return super().__contains__(symbol)
+
+
+class _RecordingScope(Scope):
+    """Package scope that records every symbol looked up in (also via child scopes) or added to it."""
+
+    def __init__(self, parent: Scope | LanguageProvider) -> None:
+        self.queries: set[str] = set()
+        self.added: list[str] = []
+        super().__init__(parent)
+
+    def _new_symbol_set(self) -> set[str]:
+        return _RecordingSet(self.queries)
+
+    def add_or_die(self, symbol: str) -> str:
+        symbol = super().add_or_die(symbol)
+        self.added.append(symbol)
+        return symbol
+
+
+class ModuleSource:
+    """Generated module which is rendered on demand.
+
+    Modules compiled in this process are kept as generic modules and only rendered when they are
+    written, so large modules never need to be materialized as a single string.
+    """
+
+    def __init__(self, lang: LanguageProvider, module: GenericModule | str, name: str | None = None) -> None:
+        """Create from a generic module or from already generated source.
+
+        Args:
+            lang: Language provider.
+            module: Generic module or generated source.
+            name: Name to attribute generation to when profiling.
+        """
+        self._lang = lang
+        self._module = module
+        self.name = name
+
+    def write(self, stream: TextIO) -> None:
+        """Write the module source to a text stream."""
+        if isinstance(self._module, str):
+            stream.write(self._module)
+            return
+        with subject(self.name or UNKNOWN_SUBJECT), timed("generate_module"):
+            self._lang.write_module(self._module, stream)
+
+    def source(self) -> str:
+        """Render the module source in memory."""
+        if isinstance(self._module, str):
+            return self._module
+        with subject(self.name or UNKNOWN_SUBJECT), timed("generate_module"):
+            return self._lang.generate_module_source(self._module)
+
+
+def _compile_interface_module(
+    lang: LanguageProvider, interface: Interface, package_scope: Scope, dedupe_structs: bool = False
+) -> GenericModule:
+    """Compile a single interface to a module, claiming its symbols in the package scope."""
+    interface_module: GenericModule = GenericModule()
+    compile_interface(
+        lang=lang,
+        interface=interface,
+        package_scope=package_scope,
+        interface_module=interface_module,
+        dedupe_structs=dedupe_structs,
+    )
+    return interface_module
 
-    Args:
-        lang: Language provider.
-        interfaces: Stream of IR interfaces.
+
+def _compile_isolated(lang: LanguageProvider, interface: Interface, dedupe_structs: bool = False) -> CompiledModule:
+    """Compile a single interface without access to the shared package scope.
+
+    This is safe to run in a worker process. The recorded scope accesses allow the caller
+    to check whether the result is identical to compiling against the shared package scope.
+    """
+    package_scope = _RecordingScope(parent=lang.language_scope())
+    interface_module = _compile_interface_module(lang, interface, package_scope, dedupe_structs)
+    with subject(interface_subject(interface)), timed("generate_module"):
+        source = lang.generate_module_source(interface_module)
+    return CompiledModule(
+        source=source,
+        scope_queries=package_scope.queries,
+        scope_symbols=package_scope.added,
+        exports=interface_module.exports,
+    )
+
+
+def _adopt_isolated(package_scope: Scope, reserved_scope: Scope, isolated: CompiledModule) -> bool:
+    """Claim the symbols of an isolated compile in the shared package scope.
+
+    An isolated compile only saw the reserved language symbols. If none of the symbols it looked up
+    have been claimed in the package scope since, every lookup would have resolved the same way
+    and the generated source is identical to a serial compile.
 
     Returns:
-        Stream of tuples (Python module, module path).
+        False (without modifying the scope) if the isolated compile is not valid for this scope.
+    """
+    for symbol in isolated.scope_queries:
+        if symbol in package_scope and symbol not in reserved_scope:
+            return False
+    for symbol in isolated.scope_symbols:
+        package_scope.add_or_die(symbol)
+    return True
+
+
+def _iter_compiled(
+    lang: LanguageProvider,
+    interfaces: Iterable[Interface],
+    cache: CompileCache | None,
+    dedupe_structs: bool = False,
+) -> Generator[tuple[Interface, CompiledModule | None], Any, None]:
+    """Stream interfaces together with their cached compile results (if any)."""
+    for interface in interfaces:
+        if cache is None:
+            yield interface, None
+            continue
+        key = cache.key(lang, interface, dedupe_structs)
+        if (compiled := cache.get(key)) is None:
+            compiled = _compile_isolated(lang, interface, dedupe_structs)
+            cache.put(key, compiled)
+        yield interface, compiled
+
+
+def _iter_compiled_parallel(
+    lang: LanguageProvider,
+    interfaces: Iterable[Interface],
+    cache: CompileCache | None,
+    workers: int,
+    dedupe_structs: bool = False,
+) -> Generator[tuple[Interface, CompiledModule | None], Any, None]:
+    """Stream interfaces together with their isolated compile results, compiled in a process pool.
+
+    Results are yielded in input order.
+    """
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    pending: collections.deque[
+        tuple[Interface, str | None, CompiledModule | concurrent.futures.Future[CompiledModule]]
+    ] = collections.deque()
+
+    def _pop() -> tuple[Interface, CompiledModule]:
+        interface, key, compiled = pending.popleft()
+        if isinstance(compiled, concurrent.futures.Future):
+            compiled = compiled.result()
+            if cache is not None and key is not None:
+                cache.put(key, compiled)
+        return interface, compiled
+
+    try:
+        for interface in interfaces:
+            key: str | None = None
+            cached: CompiledModule | None = None
+            if cache is not None:
+                key = cache.key(lang, interface, dedupe_structs)
+                cached = cache.get(key)
+            if cached is None:
+                pending.append((interface, key, executor.submit(_compile_isolated, lang, interface, dedupe_structs)))
+            else:
+                pending.append((interface, key, cached))
+            if len(pending) >= workers * _PENDING_PER_WORKER:
+                yield _pop()
+        while pending:
+            yield _pop()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def compile_language_modules(
+    lang: LanguageProvider,
+    interfaces: Iterable[Interface],
+    workers: int = 1,
+    cache: CompileCache | None = None,
+    lazy_init: bool = False,
+    dedupe_structs: bool = False,
+) -> Generator[tuple[ModuleSource, list[str]], Any, None]:
+    """For a stream of IR interfaces return a stream of modules and their module paths.
+
+    Like `compile_language`, but modules are only rendered when they are written
+    (see `ModuleSource`).
+
+    Returns:
+        Stream of tuples (module, module path).
     """
     packages: dict[str, _PackageData] = {}
     global_scope = lang.language_scope()
+    reserved_scope = lang.language_scope()
 
-    for interface in interfaces:
+    compiled_interfaces = (
+        _iter_compiled_parallel(lang, interfaces, cache, workers, dedupe_structs)
+        if workers > 1
+        else _iter_compiled(lang, interfaces, cache, dedupe_structs)
+    )
+    for interface, isolated in compiled_interfaces:
         if interface.package.name not in packages:
             packages[interface.package.name] = _PackageData(
                 package=interface.package,
@@ -48,13 +241,54 @@ def compile_language(
         # interface_module_symbol = global_scope.add_or_dodge(python_snakify(interface.command.param.name))
         interface_module_symbol = lang.symbol_var_case_from(interface.command.base.name)
 
-        interface_module: GenericModule = GenericModule()
-        compile_interface(
-            lang=lang, interface=interface, package_scope=package_data.scope, interface_module=interface_module
-        )
-        package_data.module.imports.append(f"from .{interface_module_symbol} import *")
-        yield collapse(lang.generate_module(interface_module)), [package_data.package_symbol, interface_module_symbol]
+        if isolated is not None and _adopt_isolated(package_data.scope, reserved_scope, isolated):
+            module, exports = ModuleSource(lang, isolated.source), isolated.exports
+        else:
+            interface_module = _compile_interface_module(lang, interface, package_data.scope, dedupe_structs)
+            module = ModuleSource(lang, interface_module, interface_subject(interface))
+            exports = interface_module.exports
+        if lazy_init:
+            package_data.module_exports[interface_module_symbol] = exports
+        else:
+            package_data.module.imports.append(f"from .{interface_module_symbol} import *")
+        yield module, [package_data.package_symbol, interface_module_symbol]
 
     for package_data in packages.values():
         package_data.module.imports.sort()
-        yield collapse(lang.generate_module(package_data.module)), [package_data.package_symbol, "__init__"]
+        if lazy_init:
+            package_data.module.header.extend(lang.generate_lazy_exports(package_data.module_exports))
+            package_data.module.exports.extend(
+                symbol for exports in package_data.module_exports.values() for symbol in exports
+            )
+        yield (
+            ModuleSource(lang, package_data.module, f"{package_data.package.name}/__init__"),
+            [package_data.package_symbol, "__init__"],
+        )
+
+
+def compile_language(
+    lang: LanguageProvider,
+    interfaces: Iterable[Interface],
+    workers: int = 1,
+    cache: CompileCache | None = None,
+    lazy_init: bool = False,
+    dedupe_structs: bool = False,
+) -> Generator[tuple[str, list[str]], Any, None]:
+    """For a stream of IR interfaces return a stream of Python modules and their module paths.
+
+    Args:
+        lang: Language provider.
+        interfaces: Stream of IR interfaces.
+        workers: Number of worker processes. With more than one worker, interfaces are compiled
+            in a process pool. Symbol assignment and output are identical to a serial compile.
+        cache: Compile cache. Interfaces found in the cache are not recompiled.
+        lazy_init: Generate package modules that import wrapper modules on first access
+            of one of their symbols instead of importing all of them eagerly.
+        dedupe_structs: Generate a single class for structurally identical sub-commands within
+            an interface instead of one per occurrence (see `styx.ir.fingerprint`).
+
+    Returns:
+        Stream of tuples (Python module, module path).
+    """
+    for module, module_path in compile_language_modules(lang, interfaces, workers, cache, lazy_init, dedupe_structs):
+        yield module.source(), module_path
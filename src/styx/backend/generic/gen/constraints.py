@@ -1,10 +1,61 @@
+import bisect
+
 import styx.ir.core as ir
 from styx.backend.generic.gen.lookup import LookupParam
 from styx.backend.generic.languageprovider import LanguageProvider
 from styx.backend.generic.linebuffer import LineBuffer, indent
-from styx.backend.generic.model import GenericFunc
+from styx.backend.generic.model import GenericFunc, GenericModule
+from styx.backend.generic.utils import enquote
 from styx.backend.python.languageprovider import PythonLanguageProvider
 
+_VALIDATE = "_VALIDATE"
+"""Module constant guarding all constraint checks (see `_VALIDATE_DEF`)."""
+
+_VALIDATE_DEF: LineBuffer = [
+    "# Constraint checks are skipped if STYX_SKIP_VALIDATION is set (e.g. to 1) when importing this module",
+    f'{_VALIDATE} = os.environ.get("STYX_SKIP_VALIDATION", "") in ("", "0")',
+]
+
+_CHECK_LIST_BOUNDS = "_check_list_bounds"
+"""Module-level helper validating numeric list params (see `_CHECK_LIST_BOUNDS_DEF`, declared in the footer).
+
+Declared once in each module that needs it: wrapper modules only depend on styxdefs (which has no
+such helper) and must stay importable on their own, without other generated modules.
+"""
+
+_CHECK_LIST_BOUNDS_DEF: LineBuffer = [
+    "",  # Two blank lines after the footer's own one
+    f"def {_CHECK_LIST_BOUNDS}(",
+    *indent([
+        "name: str,",
+        "values: typing.Any,",
+        "minimum: float | None = None,",
+        "maximum: float | None = None,",
+    ]),
+    ") -> None:",
+    *indent([
+        '"""Check that all numbers of a list (or NumPy array) are within inclusive bounds."""',
+        "if len(values) == 0:",
+        *indent(["return"]),
+        "# Builtin min/max scan lists in C, NumPy arrays scan themselves much faster than via iteration",
+        'native = type(values) is not list and hasattr(values, "min")',
+        "if minimum is not None and (values.min() if native else min(values)) < minimum:",
+        *indent([
+            "value = next(v for v in values if v < minimum)",
+            'expectation = f"between {minimum} <= x <= {maximum}" if maximum is not None '
+            'else f"greater than {minimum} <= x"',
+            "raise ValueError(f\"All elements of '{name}' must be {expectation} but {value} is not\")",
+        ]),
+        "if maximum is not None and (values.max() if native else max(values)) > maximum:",
+        *indent([
+            "value = next(v for v in values if v > maximum)",
+            'expectation = f"between {minimum} <= x <= {maximum}" if minimum is not None '
+            'else f"less than x <= {maximum}"',
+            "raise ValueError(f\"All elements of '{name}' must be {expectation} but {value} is not\")",
+        ]),
+    ]),
+]
+
 
 def _generate_raise_value_err(obj: str, expectation: str, reality: str | None = None) -> LineBuffer:
     fstr = ""
@@ -19,10 +70,16 @@ def _generate_raise_value_err(obj: str, expectation: str, reality: str | None =
 
 
 def _param_compile_constraint_checks(
-    lang: LanguageProvider, buf: LineBuffer, param: ir.Param, lookup: LookupParam
+    lang: LanguageProvider,
+    buf: LineBuffer,
+    param: ir.Param,
+    lookup: LookupParam,
+    module: GenericModule,
+    access_via_self: bool = False,
 ) -> None:
     """Generate input constraint validation code for an input argument."""
-    py_symbol = lookup.py_symbol[param.base.id_]
+    name = lookup.py_symbol[param.base.id_]
+    py_symbol = lang.expr_access_attr_via_self(name) if access_via_self else name
 
     min_value: float | int | None = None
     max_value: float | int | None = None
@@ -32,7 +89,7 @@ def _param_compile_constraint_checks(
     if isinstance(param.body, (ir.Param.Float, ir.Param.Int)):
         min_value = param.body.min_value
         max_value = param.body.max_value
-    elif param.list_:
+    if param.list_:
         list_count_min = param.list_.count_min
         list_count_max = param.list_.count_max
 
@@ -49,7 +106,7 @@ def _param_compile_constraint_checks(
                 f"if {val_opt}(len({py_symbol}) != {list_count_min}): ",
                 *indent(
                     _generate_raise_value_err(
-                        f"Length of '{py_symbol}'",
+                        f"Length of '{name}'",
                         f"{list_count_min}",
                         f"{{len({py_symbol})}}",
                     )
@@ -61,7 +118,7 @@ def _param_compile_constraint_checks(
                 f"if {val_opt}not ({list_count_min} <= len({py_symbol}) <= {list_count_max}): ",
                 *indent(
                     _generate_raise_value_err(
-                        f"Length of '{py_symbol}'",
+                        f"Length of '{name}'",
                         f"between {list_count_min} and {list_count_max}",
                         f"{{len({py_symbol})}}",
                     )
@@ -73,7 +130,7 @@ def _param_compile_constraint_checks(
             f"if {val_opt}not ({list_count_min} <= len({py_symbol})): ",
             *indent(
                 _generate_raise_value_err(
-                    f"Length of '{py_symbol}'",
+                    f"Length of '{name}'",
                     f"greater than {list_count_min}",
                     f"{{len({py_symbol})}}",
                 )
@@ -85,86 +142,71 @@ def _param_compile_constraint_checks(
             f"if {val_opt}not (len({py_symbol}) <= {list_count_max}): ",
             *indent(
                 _generate_raise_value_err(
-                    f"Length of '{py_symbol}'",
+                    f"Length of '{name}'",
                     f"less than {list_count_max}",
                     f"{{len({py_symbol})}}",
                 )
             ),
         ])
 
+    # Numeric list range validation (by a helper shared within the module)
+    if param.list_ and (min_value is not None or max_value is not None):
+        if min_value is not None and max_value is not None:
+            assert min_value <= max_value
+        if f"def {_CHECK_LIST_BOUNDS}(" not in module.footer:
+            module.footer.extend(_CHECK_LIST_BOUNDS_DEF)
+        bounds = []
+        if min_value is not None:
+            bounds.append(f"{min_value} <= min({py_symbol})")
+        if max_value is not None:
+            bounds.append(f"max({py_symbol}) <= {max_value}")
+        # Valid lists pass inline, the helper handles other sequences and reports violations
+        buf.extend([
+            f"if {val_opt}not (type({py_symbol}) is list and (len({py_symbol}) == 0 or {' and '.join(bounds)})):",
+            *indent([f"{_CHECK_LIST_BOUNDS}({enquote(name)}, {py_symbol}, {min_value}, {max_value})"]),
+        ])
+        return
+
     # Numeric argument range validation
     op_min = "<="
     op_max = "<="
     if min_value is not None and max_value is not None:
         # Case: X <= arg <= Y
         assert min_value <= max_value
-        if param.list_:
-            buf.extend([
-                f"if {val_opt}not ({min_value} {op_min} min({py_symbol}) and max({py_symbol}) {op_max} {max_value}): ",
-                *indent(
-                    _generate_raise_value_err(
-                        f"All elements of '{py_symbol}'",
-                        f"between {min_value} {op_min} x {op_max} {max_value}",
-                    )
-                ),
-            ])
-        else:
-            buf.extend([
-                f"if {val_opt}not ({min_value} {op_min} {py_symbol} {op_max} {max_value}): ",
-                *indent(
-                    _generate_raise_value_err(
-                        f"'{py_symbol}'",
-                        f"between {min_value} {op_min} x {op_max} {max_value}",
-                        f"{{{py_symbol}}}",
-                    )
-                ),
-            ])
+        buf.extend([
+            f"if {val_opt}not ({min_value} {op_min} {py_symbol} {op_max} {max_value}): ",
+            *indent(
+                _generate_raise_value_err(
+                    f"'{name}'",
+                    f"between {min_value} {op_min} x {op_max} {max_value}",
+                    f"{{{py_symbol}}}",
+                )
+            ),
+        ])
     elif min_value is not None:
         # Case: X <= arg
-        if param.list_:
-            buf.extend([
-                f"if {val_opt}not ({min_value} {op_min} min({py_symbol})): ",
-                *indent(
-                    _generate_raise_value_err(
-                        f"All elements of '{py_symbol}'",
-                        f"greater than {min_value} {op_min} x",
-                    )
-                ),
-            ])
-        else:
-            buf.extend([
-                f"if {val_opt}not ({min_value} {op_min} {py_symbol}): ",
-                *indent(
-                    _generate_raise_value_err(
-                        f"'{py_symbol}'",
-                        f"greater than {min_value} {op_min} x",
-                        f"{{{py_symbol}}}",
-                    )
-                ),
-            ])
+        buf.extend([
+            f"if {val_opt}not ({min_value} {op_min} {py_symbol}): ",
+            *indent(
+                _generate_raise_value_err(
+                    f"'{name}'",
+                    f"greater than {min_value} {op_min} x",
+                    f"{{{py_symbol}}}",
+                )
+            ),
+        ])
     elif max_value is not None:
         # Case: arg <= X
-        if param.list_:
-            buf.extend([
-                f"if {val_opt}not (max({py_symbol}) {op_max} {max_value}): ",
-                *indent(
-                    _generate_raise_value_err(
-                        f"All elements of '{py_symbol}'",
-                        f"less than x {op_max} {max_value}",
-                    )
-                ),
-            ])
-        else:
-            buf.extend([
-                f"if {val_opt}not ({py_symbol} {op_max} {max_value}): ",
-                *indent(
-                    _generate_raise_value_err(
-                        f"'{py_symbol}'",
-                        f"less than x {op_max} {max_value}",
-                        f"{{{py_symbol}}}",
-                    )
-                ),
-            ])
+        buf.extend([
+            f"if {val_opt}not ({py_symbol} {op_max} {max_value}): ",
+            *indent(
+                _generate_raise_value_err(
+                    f"'{name}'",
+                    f"less than x {op_max} {max_value}",
+                    f"{{{py_symbol}}}",
+                )
+            ),
+        ])
 
 
 def struct_compile_constraint_checks(
@@ -172,8 +214,25 @@ def struct_compile_constraint_checks(
     func: GenericFunc,
     struct: ir.Param[ir.Param.Struct],
     lookup: LookupParam,
+    module: GenericModule,
+    access_via_self: bool = False,
 ) -> None:
+    """Generate input constraint validation code for all params of a struct.
+
+    The checks are guarded by a module constant, so they can be skipped for inputs that
+    were already validated upstream.
+    """
     if not isinstance(lang, PythonLanguageProvider):  # todo
         return
+    buf: LineBuffer = []
     for param in struct.body.iter_params():
-        _param_compile_constraint_checks(lang, func.body, param, lookup)
+        _param_compile_constraint_checks(lang, buf, param, lookup, module, access_via_self)
+    if not buf:
+        return
+    if "import os" not in module.imports:
+        # Keep the standard library imports (up to the first blank line) sorted
+        stdlib_end = module.imports.index("") if "" in module.imports else len(module.imports)
+        bisect.insort(module.imports, "import os", hi=stdlib_end)
+    if _VALIDATE_DEF[-1] not in module.header:
+        module.header.extend(_VALIDATE_DEF)
+    func.body.extend([f"if {_VALIDATE}:", *indent(buf)])
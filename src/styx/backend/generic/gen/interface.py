@@ -7,9 +7,32 @@ from styx.backend.generic.languageprovider import LanguageProvider, MStr
 from styx.backend.generic.linebuffer import LineBuffer
 from styx.backend.generic.model import GenericArg, GenericDataClass, GenericFunc, GenericModule, GenericNamedTuple
 from styx.backend.generic.scope import Scope
-from styx.backend.generic.utils import enquote, struct_has_outputs
+from styx.backend.generic.utils import enquote
+from styx.profiling import interface_subject, phase
 
 
+class _CargsConstants:
+    """Module constants of literal command line args, shared by all structs of a module."""
+
+    def __init__(self, lang: LanguageProvider, module: GenericModule, scope: Scope) -> None:
+        self.lang = lang
+        self.module = module
+        self.scope = scope
+        self.symbols: dict[tuple[str, ...], str] = {}
+        self._count: dict[str, int] = {}
+
+    def symbol(self, name: str, values: list[str]) -> str:
+        """Symbol of the constant of `values`, declared on first use (named after `name`)."""
+        key = tuple(values)
+        if (symbol := self.symbols.get(key)) is None:
+            index = self._count[name] = self._count.get(name, -1) + 1
+            symbol = self.scope.add_or_dodge(self.lang.symbol_constant_case_from(f"{name}_cargs_{index}"))
+            self.module.header.extend(self.lang.cargs_constant_declare(symbol, values))
+            self.symbols[key] = symbol
+        return symbol
+
+
+@phase("compile_struct")
 def _compile_struct(
     lang: LanguageProvider,
     struct: ir.Param[ir.Param.Struct],
@@ -17,10 +40,11 @@ def _compile_struct(
     lookup: LookupParam,
     metadata_symbol: str,
     root_function: bool,
+    constants: _CargsConstants,
     stdout_as_string_output: ir.StdOutErrAsStringOutput | None = None,
     stderr_as_string_output: ir.StdOutErrAsStringOutput | None = None,
 ) -> None:
-    has_outputs = root_function or struct_has_outputs(struct)
+    has_outputs = root_function or lookup.has_outputs[struct.base.id_]
 
     outputs_type = lookup.py_output_type[struct.base.id_]
 
@@ -54,6 +78,15 @@ def _compile_struct(
                 ),
             ],
         )
+        if lang.cargs_passed_in():
+            func_cargs_building.args.append(
+                GenericArg(
+                    name="cargs",
+                    type=lang.type_optional(lang.type_string_list()),
+                    default=lang.expr_null(),
+                    docstring="Command line arguments to extend (a new list by default).",
+                )
+            )
         struct_class: GenericDataClass = GenericDataClass(
             name=lookup.py_struct_type[struct.base.id_],
             docstring=docs_to_docstring(struct.base.docs),
@@ -90,16 +123,20 @@ def _compile_struct(
         )
 
         if isinstance(elem.body, ir.Param.Struct):
-            _compile_struct(
-                lang=lang,
-                struct=elem,
-                interface_module=interface_module,
-                lookup=lookup,
-                metadata_symbol=metadata_symbol,
-                root_function=False,
-            )
+            if elem.base.id_ not in lookup.shared_struct:
+                _compile_struct(
+                    lang=lang,
+                    struct=elem,
+                    interface_module=interface_module,
+                    lookup=lookup,
+                    metadata_symbol=metadata_symbol,
+                    root_function=False,
+                    constants=constants,
+                )
         elif isinstance(elem.body, ir.Param.StructUnion):
             for child in elem.body.alts:
+                if child.base.id_ in lookup.shared_struct:
+                    continue
                 _compile_struct(
                     lang=lang,
                     struct=child,
@@ -107,9 +144,17 @@ def _compile_struct(
                     lookup=lookup,
                     metadata_symbol=metadata_symbol,
                     root_function=False,
+                    constants=constants,
                 )
 
-    struct_compile_constraint_checks(lang=lang, func=func_cargs_building, struct=struct, lookup=lookup)
+    struct_compile_constraint_checks(
+        lang=lang,
+        func=func_cargs_building,
+        struct=struct,
+        lookup=lookup,
+        module=interface_module,
+        access_via_self=not root_function,
+    )
 
     if has_outputs:
         _compile_outputs_class(
@@ -127,7 +172,15 @@ def _compile_struct(
             *lang.execution_declare("execution", metadata_symbol),
         ])
 
-    _compile_cargs_building(lang, struct, lookup, func_cargs_building, access_via_self=not root_function)
+    _compile_cargs_building(
+        lang,
+        struct,
+        lookup,
+        func_cargs_building,
+        access_via_self=not root_function,
+        constants=constants,
+        cargs_passed_in=not root_function and lang.cargs_passed_in(),
+    )
 
     if root_function:
         pyargs.append(
@@ -177,14 +230,79 @@ def _compile_struct(
         interface_module.exports.append(struct_class.name)
 
 
+def _cargs_add_literals(
+    lang: LanguageProvider, literals: list[str], constants: _CargsConstants, name: str
+) -> LineBuffer:
+    """Add a run of literal command line args, at once via a module constant if there are several."""
+    if len(literals) == 0:
+        return []
+    if len(literals) == 1:
+        return lang.mstr_cargs_add("cargs", MStr(lang.expr_literal(literals[0]), False))
+    return lang.mstr_cargs_add("cargs", MStr(constants.symbol(name, literals), True))
+
+
+def _cargs_add(
+    lang: LanguageProvider,
+    elements: list[tuple[MStr, str | None, LineBuffer | None]],
+    constants: _CargsConstants,
+    name: str,
+) -> LineBuffer:
+    """Add cargs expressions (with their literal value if constant, or statements adding them directly).
+
+    Runs of literals are hoisted.
+    """
+    buf: LineBuffer = []
+    exprs: list[MStr] = []
+    literals: list[str] = []
+
+    def _flush_exprs() -> None:
+        if len(exprs) == 1:
+            buf.extend(lang.mstr_cargs_add("cargs", exprs[0]))
+        elif len(exprs) > 1:
+            buf.extend(lang.mstr_cargs_add("cargs", list(exprs)))
+        exprs.clear()
+
+    def _flush_literals() -> None:
+        if len(literals) > 1:
+            _flush_exprs()
+            buf.extend(_cargs_add_literals(lang, literals, constants, name))
+        else:
+            exprs.extend(MStr(lang.expr_literal(literal), False) for literal in literals)
+        literals.clear()
+
+    for expr, literal, adding in elements:
+        if literal is not None:
+            literals.append(literal)
+            continue
+        _flush_literals()
+        if adding is not None:
+            _flush_exprs()
+            buf.extend(adding)
+            continue
+        exprs.append(expr)
+    _flush_literals()
+    _flush_exprs()
+    return buf
+
+
+@phase("compile_cargs_building")
 def _compile_cargs_building(
     lang: LanguageProvider,
     param: ir.Param[ir.Param.Struct],
     lookup: LookupParam,
     func: GenericFunc,
     access_via_self: bool,
+    constants: _CargsConstants,
+    cargs_passed_in: bool = False,
 ) -> None:
-    func.body.extend(lang.cargs_declare("cargs"))
+    if cargs_passed_in:
+        func.body.extend(lang.cargs_declare_passed_in("cargs"))
+    else:
+        func.body.extend(lang.cargs_declare("cargs"))
+
+    name = param.base.name
+    # Literal args at the end of unconditional groups, merged with those at the start of the next one
+    pending_literals: list[str] = []
 
     for group in param.body.groups:
         group_conditions_py = []
@@ -194,6 +312,10 @@ def _compile_cargs_building(
         # This way later we can use one or the other depending on the surrounding context.
         cargs_exprs: list[MStr] = []  # string expressions for building cargs
         cargs_exprs_maybe_null: list[MStr] = []  # string expressions for building cargs if parameters may be null
+        cargs_literals: list[str | None] = []  # value of cargs only consisting of string tokens
+        # statements adding cargs consisting of a single param directly (e.g. sub-structs), with the
+        # condition of that param being set
+        cargs_adding: list[tuple[LineBuffer, str | None] | None] = []
 
         for carg in group.cargs:
             carg_exprs: list[MStr] = []  # string expressions for building a single carg
@@ -229,25 +351,57 @@ def _compile_cargs_building(
             else:
                 cargs_exprs.append(lang.mstr_concat(carg_exprs))
                 cargs_exprs_maybe_null.append(lang.mstr_concat(carg_exprs_maybe_null))
+            is_literal = all(isinstance(token, str) for token in carg.tokens)
+            cargs_literals.append("".join(carg.tokens) if is_literal else None)  # type: ignore[arg-type]
+            adding = None
+            if len(carg.tokens) == 1 and isinstance(single := carg.tokens[0], ir.Param):
+                elem_symbol = lookup.py_symbol[single.base.id_]
+                if access_via_self:
+                    elem_symbol = lang.expr_access_attr_via_self(elem_symbol)
+                if (buf_adding := lang.param_cargs_add(single, elem_symbol, "cargs")) is not None:
+                    adding = (buf_adding, lang.param_var_is_set_by_user(single, elem_symbol, False))
+            cargs_adding.append(adding)
 
         # Append to cargs buffer
-        buf_appending: LineBuffer = []
-        if len(cargs_exprs) == 1:
-            for str_symbol in cargs_exprs_maybe_null if len(group_conditions_py) > 1 else cargs_exprs:
-                buf_appending.extend(lang.mstr_cargs_add("cargs", str_symbol))
-        else:
-            x = cargs_exprs_maybe_null if len(group_conditions_py) > 1 else cargs_exprs
-            buf_appending.extend(lang.mstr_cargs_add("cargs", x))
+        maybe_null = len(group_conditions_py) > 1
+        x = cargs_exprs_maybe_null if maybe_null else cargs_exprs
+        elements: list[tuple[MStr, str | None, LineBuffer | None]] = []
+        for expr, literal, adding in zip(x, cargs_literals, cargs_adding):
+            if adding is None:
+                elements.append((expr, literal, None))
+                continue
+            buf_adding, param_is_set_expr = adding
+            if maybe_null and param_is_set_expr is not None:
+                buf_adding = lang.if_else_block(condition=param_is_set_expr, truthy=buf_adding)
+            elements.append((expr, literal, buf_adding))
 
         if len(group_conditions_py) > 0:
+            func.body.extend(_cargs_add_literals(lang, pending_literals, constants, name))
+            pending_literals = []
             func.body.extend(
                 lang.if_else_block(
                     condition=lang.expr_conditions_join_or(group_conditions_py),
-                    truthy=buf_appending,
+                    truthy=_cargs_add(lang, elements, constants, name),
                 )
             )
-        else:
-            func.body.extend(buf_appending)
+            continue
+
+        # Unconditional: carry literals over group boundaries
+        start = 0
+        while start < len(elements) and elements[start][1] is not None:
+            start += 1
+        if start == len(elements):
+            pending_literals.extend(literal for _, literal, _ in elements if literal is not None)
+            continue
+        end = len(elements)
+        while elements[end - 1][1] is not None:
+            end -= 1
+        pending_literals.extend(literal for _, literal, _ in elements[:start] if literal is not None)
+        leading = [(MStr(lang.expr_literal(literal), False), literal, None) for literal in pending_literals]
+        func.body.extend(_cargs_add(lang, [*leading, *elements[start:end]], constants, name))
+        pending_literals = [literal for _, literal, _ in elements[end:] if literal is not None]
+
+    func.body.extend(_cargs_add_literals(lang, pending_literals, constants, name))
 
 
 def _compile_outputs_class(
@@ -308,7 +462,7 @@ def _compile_outputs_class(
 
     for sub_struct in struct.body.iter_params():
         if isinstance(sub_struct.body, ir.Param.Struct):
-            if struct_has_outputs(sub_struct):
+            if lookup.has_outputs[sub_struct.base.id_]:
                 output_type = lookup.py_output_type[sub_struct.base.id_]
                 if sub_struct.list_:
                     output_type = lang.type_list(output_type)
@@ -331,11 +485,11 @@ def _compile_outputs_class(
                     )
                 )
         elif isinstance(sub_struct.body, ir.Param.StructUnion):
-            if any([struct_has_outputs(s) for s in sub_struct.body.alts]):
+            if lookup.has_outputs[sub_struct.base.id_]:
                 alt_types = [
                     lookup.py_output_type[sub_command.base.id_]
                     for sub_command in sub_struct.body.alts
-                    if struct_has_outputs(sub_command)
+                    if lookup.has_outputs[sub_command.base.id_]
                 ]
                 if len(alt_types) > 0:
                     output_type = lang.type_union(alt_types)
@@ -350,7 +504,7 @@ def _compile_outputs_class(
                     alt_input_types = [
                         lookup.py_struct_type[sub_command.base.id_]
                         for sub_command in sub_struct.body.alts
-                        if struct_has_outputs(sub_command)
+                        if lookup.has_outputs[sub_command.base.id_]
                     ]
                     docs_append = ""
                     if sub_struct.list_:
@@ -444,12 +598,7 @@ def _compile_outputs_building(
 
     # sub struct outputs
     for sub_struct in struct.body.iter_params():
-        has_outputs = False
-        if isinstance(sub_struct.body, ir.Param.Struct):
-            has_outputs = struct_has_outputs(sub_struct)
-        elif isinstance(sub_struct.body, ir.Param.StructUnion):
-            has_outputs = any([struct_has_outputs(s) for s in sub_struct.body.alts])
-        if not has_outputs:
+        if not lookup.has_outputs[sub_struct.base.id_]:
             continue
 
         output_symbol = lookup.py_output_field_symbol[sub_struct.base.id_]
@@ -467,13 +616,19 @@ def _compile_outputs_building(
     )
 
 
+@phase("compile_interface", lambda lang, interface, *_, **__: interface_subject(interface))
 def compile_interface(
     lang: LanguageProvider,
     interface: ir.Interface,
     package_scope: Scope,
     interface_module: GenericModule,
+    dedupe_structs: bool = False,
 ) -> None:
-    """Entry point to the Python backend."""
+    """Entry point to the Python backend.
+
+    With `dedupe_structs`, structurally identical sub-commands of the interface share their
+    generated classes (see `LookupParam`).
+    """
     interface_module.imports.extend(lang.wrapper_module_imports())
 
     metadata_symbol = generate_static_metadata(
@@ -487,7 +642,7 @@ def compile_interface(
     function_symbol = package_scope.add_or_dodge(lang.symbol_var_case_from(interface.command.base.name))
     interface_module.exports.append(function_symbol)
 
-    function_scope = Scope(lang).language_base_scope()
+    function_scope = lang.language_scope()
     function_scope.add_or_die("runner")
     function_scope.add_or_die("execution")
     function_scope.add_or_die("cargs")
@@ -500,6 +655,7 @@ def compile_interface(
         package_scope=package_scope,
         function_symbol=function_symbol,
         function_scope=function_scope,
+        dedupe_structs=dedupe_structs,
     )
 
     _compile_struct(
@@ -509,6 +665,7 @@ def compile_interface(
         lookup=lookup,
         metadata_symbol=metadata_symbol,
         root_function=True,
+        constants=_CargsConstants(lang, interface_module, package_scope),
         stdout_as_string_output=interface.stdout_as_string_output,
         stderr_as_string_output=interface.stderr_as_string_output,
     )
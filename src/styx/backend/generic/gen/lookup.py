@@ -1,11 +1,16 @@
+import itertools
+
 import styx.ir.core as ir
 from styx.backend.generic.languageprovider import LanguageProvider
 from styx.backend.generic.scope import Scope
+from styx.ir.fingerprint import struct_fingerprints
+from styx.profiling import interface_subject, phase
 
 
 class LookupParam:
     """Pre-compute and store symbols, types, class-names, etc. to reduce spaghetti code everywhere else."""
 
+    @phase("lookup_param", lambda self, lang, interface, *_, **__: interface_subject(interface))
     def __init__(
         self,
         lang: LanguageProvider,
@@ -13,7 +18,20 @@ class LookupParam:
         package_scope: Scope,
         function_symbol: str,
         function_scope: Scope,
+        dedupe_structs: bool = False,
     ) -> None:
+        """Build the lookup tables.
+
+        Args:
+            lang: Language provider.
+            interface: Interface to compile.
+            package_scope: Scope of the package the interface is compiled into.
+            function_symbol: Symbol of the wrapper function.
+            function_scope: Scope of the wrapper function.
+            dedupe_structs: Share the generated classes of structurally identical structs
+                (see `styx.ir.fingerprint`) instead of generating one per occurrence.
+        """
+
         def _collect_output_field_symbols(
             param: ir.Param[ir.Param.Struct], lookup_output_field_symbol: dict[ir.IdType, str]
         ) -> None:
@@ -45,8 +63,13 @@ class LookupParam:
                 assert elem.base.id_ not in lookup_py_symbol
                 lookup_py_symbol[elem.base.id_] = symbol
 
-        self.param: dict[ir.IdType, ir.Param] = {interface.command.base.id_: interface.command}
+        self.index = interface.param_index()
+        """Flat index of all params of the interface."""
+        self.param: dict[ir.IdType, ir.Param] = self.index.params
         """Find param object by its ID. IParam.id_ -> IParam"""
+        self.has_outputs: dict[ir.IdType, bool] = self.index.has_outputs
+        """Find whether a struct (or struct union) has outputs, including those of its sub-structs,
+        by param ID. Computed once, bottom-up. IParam.id_ -> bool"""
         self.py_struct_type: dict[ir.IdType, str] = {interface.command.base.id_: function_symbol}
         """Find Language struct type by param id. IParam.id_ -> Language type
         (this is different from py_type because of optionals and lists)"""
@@ -62,6 +85,28 @@ class LookupParam:
         """Find outputs class name by struct param ID. IStruct.id_ -> Language class name"""
         self.py_output_field_symbol: dict[ir.IdType, str] = {}
         """Find output field symbol by output ID. Output.id_ -> Language symbol"""
+        self.shared_struct: dict[ir.IdType, ir.IdType] = {}
+        """Find the struct whose classes are reused by a structurally identical struct.
+        IStruct.id_ -> IStruct.id_ (only set for the reusing structs)"""
+
+        fingerprints = struct_fingerprints(interface.command) if dedupe_structs else {}
+        first_struct: dict[str, ir.IdType] = {}
+        shared_params: set[ir.IdType] = set()
+
+        def _share_struct(struct: ir.Param[ir.Param.Struct]) -> bool:
+            fingerprint = fingerprints.get(struct.base.id_)
+            if fingerprint is None:
+                return False
+            first = first_struct.setdefault(fingerprint, struct.base.id_)
+            if first == struct.base.id_:
+                return False
+            self.shared_struct[struct.base.id_] = first
+            self.py_struct_type[struct.base.id_] = self.py_struct_type[first]
+            self.py_type[struct.base.id_] = lang.type_param(struct, self.py_struct_type)
+            # Nothing within the struct is compiled
+            shared_params.add(struct.base.id_)
+            shared_params.update(elem.base.id_ for elem in struct.iter_params_recursively())
+            return True
 
         _collect_py_symbol(
             param=interface.command,
@@ -72,10 +117,13 @@ class LookupParam:
             lookup_output_field_symbol=self.py_output_field_symbol,
         )
 
-        for elem in interface.command.iter_params_recursively():
-            self.param[elem.base.id_] = elem
+        for elem in itertools.islice(self.index.params.values(), 1, None):
+            if elem.base.id_ in shared_params:
+                continue
 
             if isinstance(elem.body, ir.Param.Struct):
+                if _share_struct(elem):
+                    continue
                 if elem.base.id_ not in self.py_struct_type:  # Struct unions may resolve these first
                     self.py_struct_type[elem.base.id_] = package_scope.add_or_dodge(
                         lang.symbol_class_case_from(f"{interface.command.body.name}_{elem.body.name}")
@@ -94,6 +142,8 @@ class LookupParam:
                 )
             elif isinstance(elem.body, ir.Param.StructUnion):
                 for alternative in elem.body.alts:
+                    if _share_struct(alternative):
+                        continue
                     self.py_struct_type[alternative.base.id_] = package_scope.add_or_dodge(
                         lang.symbol_class_case_from(f"{interface.command.base.name}_{alternative.base.name}")
                     )
@@ -101,3 +151,6 @@ class LookupParam:
                 self.py_type[elem.base.id_] = lang.type_param(elem, self.py_struct_type)
             else:
                 self.py_type[elem.base.id_] = lang.type_param(elem, self.py_struct_type)
+
+        for struct_id, first in self.shared_struct.items():
+            self.py_output_type[struct_id] = self.py_output_type[first]
@@ -1,10 +1,10 @@
 import pathlib
 import typing
 from abc import ABC, abstractmethod
-from typing import Mapping, Sequence, TypeAlias
+from typing import Mapping, Sequence, TextIO, TypeAlias
 
 import styx.ir.core as ir
-from styx.backend.generic.linebuffer import LineBuffer
+from styx.backend.generic.linebuffer import LineBuffer, collapse
 from styx.backend.generic.model import GenericArg, GenericDataClass, GenericFunc, GenericModule, GenericNamedTuple
 
 if typing.TYPE_CHECKING:
@@ -147,6 +147,8 @@ class LanguageProvider(ABC):
         """Build a scope with all the global keywords, reserved symbols, etc.
 
         (Basically everything we never want to shadow).
+
+        Symbols added to the returned scope must not leak into scopes returned by other calls.
         """
         ...
 
@@ -347,6 +349,14 @@ class LanguageProvider(ABC):
         """Generate module."""
         ...
 
+    def generate_module_source(self, module: GenericModule) -> str:
+        """Generate module source code (like `collapse(generate_module(module))`)."""
+        return collapse(self.generate_module(module))
+
+    def write_module(self, module: GenericModule, stream: TextIO) -> None:
+        """Write module source code to a text stream (the same text as `generate_module_source`)."""
+        stream.write(self.generate_module_source(module))
+
     def generate_model(self, m: GenericFunc | GenericDataClass | GenericNamedTuple) -> LineBuffer:
         if isinstance(m, GenericFunc):
             return self.generate_func(m)
@@ -356,6 +366,15 @@ class LanguageProvider(ABC):
             return self.generate_named_tuple(m)
         assert False
 
+    @abstractmethod
+    def generate_lazy_exports(self, module_exports: dict[str, list[str]]) -> LineBuffer:
+        """Generate package module code which imports sub-modules on first access of their exports.
+
+        Args:
+            module_exports: Exported symbols by sub-module symbol.
+        """
+        ...
+
     @abstractmethod
     def return_statement(self, value: ExprType) -> ExprType:
         """(Possibly early) return statement."""
@@ -398,6 +417,26 @@ class LanguageProvider(ABC):
         """Extend cargs by mstr."""
         ...
 
+    @abstractmethod
+    def cargs_constant_declare(self, symbol: str, values: list[str]) -> LineBuffer:
+        """Declare a module constant of command line args (added to cargs as `MStr(symbol, True)`)."""
+        ...
+
+    def cargs_passed_in(self) -> bool:
+        """Whether sub-structs add their cargs to a list passed in by the caller (see `param_cargs_add`)."""
+        return False
+
+    def cargs_declare_passed_in(self, cargs_symbol: str) -> LineBuffer:
+        """Construct command line args list unless one was passed in (see `cargs_passed_in`)."""
+        return self.cargs_declare(cargs_symbol)
+
+    def param_cargs_add(self, param: ir.Param, symbol: str, cargs_symbol: str) -> LineBuffer | None:
+        """Extend cargs by a param directly.
+
+        Returns `None` if the param is added as `param_var_to_mstr` via `mstr_cargs_add`.
+        """
+        return None
+
     @abstractmethod
     def mstr_collapse(self, mstr: MStr, join: str = "") -> MStr:
         """Join a mstr if it is referring to a list."""
@@ -506,3 +545,11 @@ class LanguageProvider(ABC):
     def styxdefs_compat(cls) -> str:
         """Return what version of styxdefs generated wrappers will be compatible with."""
         return "^0.4.1"
+
+    def cache_key(self) -> str:
+        """Return the code generation options of this provider.
+
+        Part of the keys of cached modules (see `CompileCache`), so providers generating
+        different code never share cache entries.
+        """
+        return ""
@@ -1,4 +1,12 @@
-"""Probably pretty slow but convenient."""
+"""Line buffers for code generation.
+
+`LineBuffer` helpers are convenient for small snippets but copy their input on every call.
+Whole modules are assembled with a `LineBuilder`, which indents lazily.
+"""
+
+import contextlib
+import itertools
+from typing import Iterable, Iterator, TextIO
 
 LineBuffer = list[str]
 INDENT = "    "
@@ -29,7 +37,7 @@ def expand(text: str) -> LineBuffer:
 def concat(line_buffers: list[LineBuffer], separator: LineBuffer | None = None) -> LineBuffer:
     """Concatenate multiple LineBuffers."""
     if separator is None:
-        return sum(line_buffers, [])
+        return list(itertools.chain.from_iterable(line_buffers))
     ret = []
     for i, buf in enumerate(line_buffers):
         if i > 0:
@@ -46,3 +54,99 @@ def blank_before(lines: LineBuffer, blanks: int = 1) -> LineBuffer:
 def blank_after(lines: LineBuffer, blanks: int = 1) -> LineBuffer:
     """Add blank lines at the end of a LineBuffer if it is not empty."""
     return [*lines, *([""] * blanks)] if len(lines) > 0 else lines
+
+
+class LineBuilder:
+    """Append-only line buffer with deferred indentation.
+
+    Lines are not copied into indented strings. Instead, the builder keeps a flat list of
+    chunks (line break plus indentation of the current level, then the line) that is joined
+    (or written) once at the end. Output is identical to building the same lines with
+    `indent` (empty lines are indented too) and joining them with `collapse`.
+
+    Builders with a stream can `flush` their lines to it while building, so that large outputs
+    are never held in memory as a whole.
+    """
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        """Create an empty builder at indentation level 0.
+
+        Args:
+            stream: Text stream that `flush` writes to. Without a stream, `flush` does nothing.
+        """
+        self._stream = stream
+        self._flushed = False
+        self._chunks: list[str] = []
+        self._level = 0
+        self._prefix = ""
+        self._break = "\n"
+        self._lead = ""
+        """Chunk before the first line (not flushed yet): a line break if lines were flushed before."""
+
+    @property
+    def level(self) -> int:
+        """Indentation level of appended lines."""
+        return self._level
+
+    @level.setter
+    def level(self, level: int) -> None:
+        self._level = level
+        self._prefix = INDENT * level
+        self._break = f"\n{self._prefix}"
+        self._lead = self._break if self._flushed else self._prefix
+
+    def append(self, line: str) -> None:
+        """Append a line at the current indentation level."""
+        self._chunks.append(self._break if self._chunks else self._lead)
+        self._chunks.append(line)
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """Append lines at the current indentation level."""
+        chunks = self._chunks
+        line_break = self._break
+        lines = iter(lines)
+        if not chunks:
+            for line in lines:
+                chunks.append(self._lead)
+                chunks.append(line)
+                break
+        for line in lines:
+            chunks.append(line_break)
+            chunks.append(line)
+
+    def blank(self, blanks: int = 1) -> None:
+        """Append blank lines."""
+        self.extend(itertools.repeat("", blanks))
+
+    @contextlib.contextmanager
+    def indent(self, level: int = 1) -> Iterator[None]:
+        """Indent all lines appended within the context by a given level."""
+        self.level += level
+        try:
+            yield
+        finally:
+            self.level -= level
+
+    def lines(self) -> LineBuffer:
+        """Get the indented lines (not flushed yet) as a LineBuffer.
+
+        Appended lines containing line breaks are split.
+        """
+        return self.collapse().split("\n") if self._chunks else []
+
+    def collapse(self) -> str:
+        """Collapse the lines (not flushed yet) into a single string."""
+        return "".join(self._chunks)
+
+    def write(self, stream: TextIO) -> None:
+        """Write the lines (not flushed yet) to a text stream (the same text as `collapse`)."""
+        stream.writelines(self._chunks)
+
+    def flush(self) -> None:
+        """Write all lines to the stream of the builder and drop them (no-op without a stream)."""
+        if self._stream is None or not self._chunks:
+            return
+        self._stream.writelines(self._chunks)
+        self._chunks = []
+        self._flushed = True
+        self.level = self._level  # The next line starts with a line break
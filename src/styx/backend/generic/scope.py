@@ -4,48 +4,84 @@ from styx.backend.generic.languageprovider import LanguageProvider
 
 
 class Scope:
-    def __init__(self, parent: Scope | LanguageProvider) -> None:
-        """Create a scope."""
+    def __init__(self, parent: Scope | LanguageProvider, lang: LanguageProvider | None = None) -> None:
+        """Create a scope.
+
+        Child scopes only store the symbols added to them, so creating a scope on top
+        of a large (e.g. frozen and shared) parent scope is cheap. Lookups go through
+        a flattened chain of the symbol sets of the scope and all its ancestors.
+
+        Child scopes use the language provider of their parent, unless `lang` is given
+        (e.g. for a provider's own scope on top of a scope shared between providers).
+        """
         self.parent: Scope | None = None
         if isinstance(parent, LanguageProvider):
             self._lang = parent
             self.parent = None
         elif isinstance(parent, Scope):
-            self._lang = parent._lang
+            self._lang = parent._lang if lang is None else lang
             self.parent = parent
         else:
             raise ValueError
-        self._symbols: set[str] = set()
+        self._symbols: set[str] = self._new_symbol_set()
+        self._chain: tuple[set[str], ...] = (self._symbols,) + (self.parent._chain if self.parent else ())
+        self._next_dodge: dict[str, int] = {}
+        """Per base symbol the first dodge index that has not been found taken yet."""
+        self._frozen = False
+
+    def _new_symbol_set(self) -> set[str]:
+        """Create the set holding the symbols of this scope."""
+        return set()
 
     def __contains__(self, symbol: str) -> bool:
         """Check if a symbol is in the scope."""
         if not isinstance(symbol, str):
             raise TypeError(f"Symbol must be a string, not {type(symbol)}")
-        return symbol in self._symbols or (self.parent is not None and symbol in self.parent)
+        return any(symbol in symbols for symbols in self._chain)
+
+    @property
+    def frozen(self) -> bool:
+        """Whether symbols can no longer be added to this scope."""
+        return self._frozen
+
+    def freeze(self) -> Scope:
+        """Prevent adding further symbols so the scope can be safely shared as a parent.
+
+        Returns:
+            The scope itself.
+        """
+        self._frozen = True
+        return self
 
     def __repr__(self) -> str:
         """Get a string representation of the scope."""
         return f"Scope({self._symbols})"
 
-    def _add_or_dodge(self, symbol: str, dodge: int) -> str:
-        """Add a symbol to the scope, avoiding collisions."""
+    @staticmethod
+    def _dodge_name(symbol: str, dodge: int) -> str:
         if dodge == 0:
-            dodge_name = symbol
-        elif dodge == 1:
-            dodge_name = f"{symbol}_"
-        else:
-            dodge_name = f"{symbol}_{dodge}"
-        if dodge_name in self:
-            return self._add_or_dodge(symbol, dodge + 1)
-        else:
-            return self.add_or_die(dodge_name)
+            return symbol
+        if dodge == 1:
+            return f"{symbol}_"
+        return f"{symbol}_{dodge}"
 
     def add_or_dodge(self, symbol: str) -> str:
-        """Add a symbol to the scope, avoiding collisions."""
-        return self._add_or_dodge(symbol, 0)
+        """Add a symbol to the scope, avoiding collisions.
+
+        Tries `symbol`, `symbol_`, `symbol_2`, `symbol_3`, ... and adds the first one that is free.
+        Symbols are never removed, so candidates found taken before are skipped on later calls.
+        """
+        dodge = self._next_dodge.get(symbol, 0)
+        while (dodge_name := self._dodge_name(symbol, dodge)) in self:
+            dodge += 1
+        self.add_or_die(dodge_name)
+        self._next_dodge[symbol] = dodge + 1
+        return dodge_name
 
     def add_or_die(self, symbol: str) -> str:
         """Add a symbol to the scope."""
+        if self._frozen:
+            raise ValueError(f"Cannot add symbol '{symbol}' to a frozen scope")
         if not self._legal(symbol):
             raise ValueError(f"Symbol '{symbol}' is not a legal identifier")
         if symbol in self:
@@ -62,7 +62,11 @@ def escape_backslash(s: str) -> str:
 
 
 def struct_has_outputs(struct: ir.Param[ir.Param.Struct]) -> bool:
-    """Check if the sub-command has outputs."""
+    """Check if the sub-command has outputs.
+
+    This walks the sub-command on every call, the backend uses the precomputed
+    `LookupParam.has_outputs` instead.
+    """
     if len(struct.base.outputs) > 0:
         return True
     for p in struct.body.iter_params():
@@ -1,8 +1,9 @@
 import pathlib
 import re
+import typing
 
 from styx.backend.generic.languageprovider import TYPE_PYLITERAL, ExprType, LanguageProvider, MStr
-from styx.backend.generic.linebuffer import LineBuffer, blank_after, blank_before, comment, concat, expand, indent
+from styx.backend.generic.linebuffer import LineBuffer, LineBuilder, comment, expand, indent
 from styx.backend.generic.model import GenericArg, GenericDataClass, GenericFunc, GenericModule, GenericNamedTuple
 from styx.backend.generic.scope import Scope
 from styx.backend.generic.string_case import pascal_case, screaming_snake_case, snake_case
@@ -11,6 +12,22 @@ from styx.ir import core as ir
 
 
 class PythonLanguageProvider(LanguageProvider):
+    _reserved_scope: typing.ClassVar[Scope | None] = None
+    """Frozen scope of reserved symbols shared by all `language_scope()` calls."""
+
+    def __init__(self, flat_cargs: bool = False) -> None:
+        """Create a Python language provider.
+
+        Args:
+            flat_cargs: Build cargs without intermediate lists: one `append`/`extend` per
+                element instead of extending by list displays, and sub-commands adding their
+                cargs to the list of the caller (`run(execution, cargs)`).
+        """
+        self.flat_cargs = flat_cargs
+
+    def cache_key(self) -> str:
+        return "flat_cargs" if self.flat_cargs else ""
+
     # ------------------------------ Types ------------------------------ #
 
     def type_str(self) -> str:
@@ -70,21 +87,26 @@ class PythonLanguageProvider(LanguageProvider):
         return name.isidentifier()
 
     def language_scope(self) -> Scope:
-        import builtins
-        import keyword
-        import sys
+        cls = type(self)
+        if cls._reserved_scope is None:
+            import builtins
+            import keyword
+            import sys
 
-        scope = Scope(self)
+            # Shared by all instances, which only use it as the parent of their own scopes
+            reserved_scope = Scope(self)
 
-        for s in {
-            *keyword.kwlist,
-            *sys.stdlib_module_names,
-            *dir(builtins),
-            *dir(__builtins__),
-        }:
-            scope.add_or_die(s)
+            for s in {
+                *keyword.kwlist,
+                *sys.stdlib_module_names,
+                *dir(builtins),
+                *dir(__builtins__),
+            }:
+                reserved_scope.add_or_die(s)
 
-        return scope
+            cls._reserved_scope = reserved_scope.freeze()
+
+        return Scope(parent=cls._reserved_scope, lang=self)
 
     def symbol_from(self, name: str) -> str:
         alt_prefix: str = "v_"
@@ -182,11 +204,13 @@ class PythonLanguageProvider(LanguageProvider):
     # ------------------------------ Higher level code generation ------------------------------ #
 
     def wrapper_module_imports(self) -> LineBuffer:
+        # Standard library imports first (sorted), followed by third party ones
         return [
-            "import typing",
+            "import dataclasses",
             "import pathlib",
+            "import typing",
+            "",
             "from styxdefs import *",
-            "import dataclasses",
         ]
 
     def struct_collect_outputs(self, struct: ir.Param[ir.Param.Struct], struct_symbol: str) -> str:
@@ -232,9 +256,7 @@ class PythonLanguageProvider(LanguageProvider):
             return f"{arg.name}{annot_type}"
         return f"{arg.name}{annot_type} = {arg.default}"
 
-    def generate_func(self, func: GenericFunc) -> LineBuffer:
-        buf = []
-
+    def _emit_func(self, buf: LineBuilder, func: GenericFunc) -> None:
         # Sort arguments so default arguments come last
         func.args.sort(key=lambda a: a.default is not None)
 
@@ -242,136 +264,190 @@ class PythonLanguageProvider(LanguageProvider):
         buf.append(f"def {func.name}(")
 
         # Add arguments
-        for arg in func.args:
-            buf.extend(indent([f"{self.generate_arg_declaration(arg)},"]))
+        with buf.indent():
+            buf.extend(f"{self.generate_arg_declaration(arg)}," for arg in func.args)
         buf.append(f") -> {func.return_type}:")
 
-        arg_docstr_buf = []
-        for arg in func.args:
-            if arg.name == "self":
-                continue
-            arg_docstr = linebreak_paragraph(
-                f"{arg.name}: {escape_backslash(arg.docstring) if arg.docstring else ''}",
-                width=80 - (4 * 3) - 1,
-                first_line_width=80 - (4 * 2) - 1,
-            )
-            arg_docstr = ensure_endswith("\\\n".join(arg_docstr), ".").split("\n")
-            arg_docstr_buf.append(arg_docstr[0])
-            arg_docstr_buf.extend(indent(arg_docstr[1:]))
-
-        # Add docstring (Google style)
-
-        if func.docstring_body:
-            docstring_linebroken = linebreak_paragraph(escape_backslash(func.docstring_body), width=80 - 4)
-        else:
-            docstring_linebroken = [""]
+        with buf.indent():
+            # Add docstring (Google style)
+            buf.append('"""')
+            if func.docstring_body:
+                buf.extend(linebreak_paragraph(escape_backslash(func.docstring_body), width=80 - 4))
+            else:
+                buf.append("")
+            buf.append("")
+            buf.append("Args:")
+            with buf.indent():
+                for arg in func.args:
+                    if arg.name == "self":
+                        continue
+                    arg_docstr = linebreak_paragraph(
+                        f"{arg.name}: {escape_backslash(arg.docstring) if arg.docstring else ''}",
+                        width=80 - (4 * 3) - 1,
+                        first_line_width=80 - (4 * 2) - 1,
+                    )
+                    arg_docstr = ensure_endswith("\\\n".join(arg_docstr), ".").split("\n")
+                    buf.append(arg_docstr[0])
+                    with buf.indent():
+                        buf.extend(arg_docstr[1:])
+            if func.return_descr:
+                buf.append("Returns:")
+                with buf.indent():
+                    buf.append(f"{escape_backslash(func.return_descr)}")
+            buf.append('"""')
+
+            # Add function body
+            if func.body:
+                buf.extend(func.body)
+            else:
+                buf.append("pass")
+
+    @staticmethod
+    def _field_docstring(arg: GenericArg) -> LineBuffer:
+        if not arg.docstring:
+            return []
+        return linebreak_paragraph(f'"""{escape_backslash(arg.docstring)}"""', width=80 - 4, first_line_width=80 - 4)
+
+    def _emit_data_class(self, buf: LineBuilder, data_class: GenericDataClass) -> None:
+        # Sort fields so default arguments come last
+        data_class.fields.sort(key=lambda a: a.default is not None)
 
+        buf.append("@dataclasses.dataclass")
+        buf.append(f"class {data_class.name}:")
+        with buf.indent():
+            if data_class.docstring:
+                buf.append('"""')
+                buf.extend(
+                    linebreak_paragraph(escape_backslash(data_class.docstring), width=80 - 4, first_line_width=80 - 4)
+                )
+                buf.append('"""')
+            for field in data_class.fields:
+                buf.append(self.generate_arg_declaration(field))
+                buf.extend(self._field_docstring(field))
+            for method in data_class.methods:
+                buf.blank()
+                self._emit_func(buf, method)
+
+    def _emit_named_tuple(self, buf: LineBuilder, data_class: GenericNamedTuple) -> None:
+        # Sort fields so default arguments come last
+        data_class.fields.sort(key=lambda a: a.default is not None)
+
+        buf.append(f"class {data_class.name}(typing.NamedTuple):")
+        if data_class.docstring:
+            with buf.indent():
+                buf.append('"""')
+                buf.append(f"{escape_backslash(data_class.docstring)}")
+                buf.append('"""')
+                for field in data_class.fields:
+                    buf.append(self.generate_arg_declaration(field))
+                    buf.extend(self._field_docstring(field))
+                for method in data_class.methods:
+                    buf.blank()
+                    self._emit_model(buf, method)
+
+    def _emit_model(self, buf: LineBuilder, m: GenericFunc | GenericDataClass | GenericNamedTuple) -> None:
+        if isinstance(m, GenericFunc):
+            self._emit_func(buf, m)
+        elif isinstance(m, GenericDataClass):
+            self._emit_data_class(buf, m)
+        elif isinstance(m, GenericNamedTuple):
+            self._emit_named_tuple(buf, m)
+        else:
+            buf.extend(self.generate_model(m))
+
+    def _emit_module(self, buf: LineBuilder, module: GenericModule) -> None:
+        # Top-level blocks are flushed as soon as they are complete (see `write_module`)
+        if module.docstr:
+            buf.append('"""')
+            buf.extend(linebreak_paragraph(escape_backslash(module.docstr)))
+            buf.append('"""')
         buf.extend(
-            indent([
-                '"""',
-                *docstring_linebroken,
-                "",
-                "Args:",
-                *indent(arg_docstr_buf),
-                *(["Returns:", *indent([f"{escape_backslash(func.return_descr)}"])] if func.return_descr else []),
-                '"""',
+            comment([
+                "This file was auto generated by Styx.",
+                "Do not edit this file directly.",
             ])
         )
+        for lines in (module.imports, module.header):
+            if lines:
+                buf.blank()
+                buf.extend(lines)
+        buf.flush()
+        for func in module.funcs_and_classes:
+            buf.blank(2)
+            self._emit_model(buf, func)
+            buf.flush()
+        if module.footer:
+            buf.blank()
+            buf.extend(module.footer)
+        if module.exports:
+            buf.blank(2)
+            buf.append("__all__ = [")
+            with buf.indent():
+                buf.extend(f"{enquote(x)}," for x in sorted(module.exports))
+            buf.append("]")
+        buf.blank()
 
-        # Add function body
-        if func.body:
-            buf.extend(indent(func.body))
-        else:
-            buf.extend(indent(["pass"]))
-        return buf
+    def generate_func(self, func: GenericFunc) -> LineBuffer:
+        buf = LineBuilder()
+        self._emit_func(buf, func)
+        return buf.lines()
 
     def generate_data_class(self, data_class: GenericDataClass) -> LineBuffer:
-        # Sort fields so default arguments come last
-        data_class.fields.sort(key=lambda a: a.default is not None)
-
-        def _arg_docstring(arg: GenericArg) -> LineBuffer:
-            if not arg.docstring:
-                return []
-            return linebreak_paragraph(
-                f'"""{escape_backslash(arg.docstring)}"""', width=80 - 4, first_line_width=80 - 4
-            )
-
-        args = concat([[self.generate_arg_declaration(f), *_arg_docstring(f)] for f in data_class.fields])
-        methods = concat([self.generate_func(method) for method in data_class.methods], [""])
-
-        buf = [
-            "@dataclasses.dataclass",
-            f"class {data_class.name}:",
-            *indent([
-                *(
-                    [
-                        '"""',
-                        *linebreak_paragraph(
-                            escape_backslash(data_class.docstring), width=80 - 4, first_line_width=80 - 4
-                        ),
-                        '"""',
-                    ]
-                    if data_class.docstring
-                    else []
-                ),
-                *args,
-                *blank_before(methods),
-            ]),
-        ]
-        return buf
+        buf = LineBuilder()
+        self._emit_data_class(buf, data_class)
+        return buf.lines()
 
     def generate_named_tuple(self, data_class: GenericNamedTuple) -> LineBuffer:
-        # Sort fields so default arguments come last
-        data_class.fields.sort(key=lambda a: a.default is not None)
-
-        def _arg_docstring(arg: GenericArg) -> LineBuffer:
-            if not arg.docstring:
-                return []
-            return linebreak_paragraph(
-                f'"""{escape_backslash(arg.docstring)}"""', width=80 - 4, first_line_width=80 - 4
-            )
-
-        args = concat([[self.generate_arg_declaration(f), *_arg_docstring(f)] for f in data_class.fields])
-        methods = concat([self.generate_model(method) for method in data_class.methods], [""])
-
-        buf = [
-            f"class {data_class.name}(typing.NamedTuple):",
-        ]
-        if data_class.docstring:
-            buf.extend(
-                indent([
-                    '"""',
-                    f"{escape_backslash(data_class.docstring)}",
-                    '"""',
-                    *args,
-                    *blank_before(methods),
-                ])
-            )
-        return buf
+        buf = LineBuilder()
+        self._emit_named_tuple(buf, data_class)
+        return buf.lines()
 
     def generate_module(self, module: GenericModule) -> LineBuffer:
-        exports = (
-            [
-                "__all__ = [",
-                *indent(list(map(lambda x: f"{enquote(x)},", sorted(module.exports)))),
-                "]",
-            ]
-            if module.exports
-            else []
-        )
-
-        return blank_after([
-            *(['"""', *linebreak_paragraph(escape_backslash(module.docstr)), '"""'] if module.docstr else []),
-            *comment([
-                "This file was auto generated by Styx.",
-                "Do not edit this file directly.",
+        buf = LineBuilder()
+        self._emit_module(buf, module)
+        return buf.lines()
+
+    def generate_module_source(self, module: GenericModule) -> str:
+        buf = LineBuilder()
+        self._emit_module(buf, module)
+        return buf.collapse()
+
+    def write_module(self, module: GenericModule, stream: typing.TextIO) -> None:
+        buf = LineBuilder(stream)
+        self._emit_module(buf, module)
+        buf.flush()
+
+    def generate_lazy_exports(self, module_exports: dict[str, list[str]]) -> LineBuffer:
+        modules = sorted(module_exports)
+        return [
+            "import importlib",
+            "import typing",
+            "",
+            "if typing.TYPE_CHECKING:",
+            *indent([f"from .{module} import *" for module in modules] or ["pass"]),
+            "",
+            "_LAZY_MODULES = {",
+            *indent([f"{enquote(module)}: {self.expr_literal(sorted(module_exports[module]))}," for module in modules]),
+            "}",
+            "_LAZY_EXPORTS = {symbol: module for module, symbols in _LAZY_MODULES.items() for symbol in symbols}",
+            "",
+            "",
+            "def __getattr__(name: str) -> typing.Any:",
+            *indent([
+                "module_name = _LAZY_EXPORTS.get(name)",
+                "if module_name is None:",
+                *indent(['raise AttributeError(f"module {__name__!r} has no attribute {name!r}")']),
+                'module = importlib.import_module(f".{module_name}", __name__)',
+                "# Bind all exports at once, importing the sub-module shadows same-named exports.",
+                "for symbol in _LAZY_MODULES[module_name]:",
+                *indent(["globals()[symbol] = getattr(module, symbol)"]),
+                "return globals()[name]",
             ]),
-            *blank_before(module.imports),
-            *blank_before(module.header),
-            *[line for func in module.funcs_and_classes for line in blank_before(self.generate_model(func), 2)],
-            *blank_before(module.footer),
-            *blank_before(exports, 2),
-        ])
+            "",
+            "",
+            "def __dir__() -> list[str]:",
+            *indent(["return sorted({*globals(), *_LAZY_EXPORTS})"]),
+        ]
 
     def metadata_symbol(
         self,
@@ -408,7 +484,7 @@ class PythonLanguageProvider(LanguageProvider):
                     if len(param.body.value_true) > 0:
                         if len(param.body.value_false) > 0:
                             return MStr(
-                                f"({self.expr_literal(value_true)} if {symbol} else {self.expr_literal(value_true)})",
+                                f"({self.expr_literal(value_true)} if {symbol} else {self.expr_literal(value_false)})",
                                 as_list,
                             )
                         return MStr(self.expr_literal(value_true), as_list)
@@ -440,6 +516,8 @@ class PythonLanguageProvider(LanguageProvider):
                         extra_args += ", mutable=True"
                     return MStr(f"[execution.input_file(f{extra_args}) for f in {symbol}]", True)
                 if isinstance(param.body, (ir.Param.Struct, ir.Param.StructUnion)):
+                    if self.flat_cargs:
+                        return MStr(f"[a for s in {symbol} for a in s.run(execution)]", True)
                     return MStr(f"[a for c in [s.run(execution) for s in {symbol}] for a in c]", True)
                 assert False
 
@@ -459,6 +537,8 @@ class PythonLanguageProvider(LanguageProvider):
                     extra_args += ", mutable=True"
                 return MStr(f"{sep_join}([execution.input_file(f{extra_args}) for f in {symbol}])", False)
             if isinstance(param.body, (ir.Param.Struct, ir.Param.StructUnion)):
+                if self.flat_cargs:
+                    return MStr(f"{sep_join}([a for s in {symbol} for a in s.run(execution)])", False)
                 return MStr(f"{sep_join}([a for c in [s.run(execution) for s in {symbol}] for a in c])", False)
             assert False
 
@@ -488,6 +568,26 @@ class PythonLanguageProvider(LanguageProvider):
     def cargs_declare(self, cargs_symbol: str) -> LineBuffer:
         return [f"{cargs_symbol} = []"]
 
+    def cargs_constant_declare(self, symbol: str, values: list[str]) -> LineBuffer:
+        elements = ", ".join(map(self.expr_str, values))
+        return [f"{symbol} = ({elements}{',' if len(values) == 1 else ''})"]
+
+    def cargs_passed_in(self) -> bool:
+        return self.flat_cargs
+
+    def cargs_declare_passed_in(self, cargs_symbol: str) -> LineBuffer:
+        return [f"if {cargs_symbol} is None:", *indent(self.cargs_declare(cargs_symbol))]
+
+    def param_cargs_add(self, param: ir.Param, symbol: str, cargs_symbol: str) -> LineBuffer | None:
+        if not self.flat_cargs or not isinstance(param.body, (ir.Param.Struct, ir.Param.StructUnion)):
+            return None
+        if param.list_ is None:
+            return [f"{symbol}.run(execution, {cargs_symbol})"]
+        if param.list_.join is None:
+            # Param symbols never start with an underscore, so the loop variable cannot shadow them
+            return [f"for _s in {symbol}:", *indent([f"_s.run(execution, {cargs_symbol})"])]
+        return None
+
     def mstr_collapse(self, mstr: MStr, join: str = "") -> MStr:
         return MStr(f'"{join}".join({mstr.expr})' if mstr.is_list else mstr.expr, False)
 
@@ -496,6 +596,8 @@ class PythonLanguageProvider(LanguageProvider):
         return MStr(self.expr_concat_strs(list(m.expr for m in inner), outer_join), False)
 
     def mstr_cargs_add(self, cargs_symbol: str, mstr: MStr | list[MStr]) -> LineBuffer:
+        if isinstance(mstr, list) and self.flat_cargs:
+            return [line for element in mstr for line in self.mstr_cargs_add(cargs_symbol, element)]
         if isinstance(mstr, list):
             elements: list[str] = [(f"*{val}" if val_is_list else val) for val, val_is_list in mstr]
             return [
@@ -1,3 +1,4 @@
 """Boutiques frontend."""
 
+from .batch import iter_from_boutiques as iter_from_boutiques
 from .core import from_boutiques as from_boutiques
@@ -0,0 +1,94 @@
+"""Lazy loading of many Boutiques descriptors."""
+
+import json
+import os
+import pathlib
+import tarfile
+import zipfile
+from typing import Any, Generator, Iterator
+
+import styx.ir.core as ir
+from styx.frontend.boutiques.core import from_boutiques
+
+
+def _iter_directory(root: pathlib.Path) -> Generator[tuple[pathlib.PurePath, bytes], Any, None]:
+    """Read JSON files in a directory tree one at a time (sorted, depth-first)."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".json"):
+                path = pathlib.Path(dirpath, filename)
+                yield path.relative_to(root), path.read_bytes()
+
+
+def _iter_tar(path: pathlib.Path) -> Generator[tuple[pathlib.PurePath, bytes], Any, None]:
+    """Read JSON files in a (possibly compressed) tarball one at a time, in archive order."""
+    with tarfile.open(path, "r:*") as archive:
+        for member in archive:
+            if not member.isfile() or not member.name.endswith(".json"):
+                continue
+            file = archive.extractfile(member)
+            assert file is not None
+            with file:
+                yield pathlib.PurePosixPath(member.name), file.read()
+
+
+def _iter_zip(path: pathlib.Path) -> Generator[tuple[pathlib.PurePath, bytes], Any, None]:
+    """Read JSON files in a zip archive one at a time, in archive order."""
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and info.filename.endswith(".json"):
+                yield pathlib.PurePosixPath(info.filename), archive.read(info)
+
+
+def iter_from_boutiques(
+    source: str | pathlib.Path,
+    package_name: str | None = None,
+    package_docs: ir.Documentation | None = None,
+    validate: bool = True,
+) -> Generator[ir.Interface, Any, None]:
+    """Lazily convert all Boutiques descriptors in a directory tree or archive.
+
+    Descriptors are read, parsed and converted one at a time, so the result can be streamed into
+    `compile_language` without holding the whole corpus in memory.
+
+    Args:
+        source: Directory (searched recursively for `*.json` files), tarball, zip archive
+            or single descriptor file.
+        package_name: Package of all interfaces. If None, the name of the directory
+            containing each descriptor is used.
+        package_docs: Package documentation of all interfaces.
+        validate: Check each interface once after conversion (see `from_boutiques`).
+
+    Yields:
+        One IR interface per descriptor.
+    """
+    source = pathlib.Path(source)
+    files: Iterator[tuple[pathlib.PurePath, bytes]]
+    if source.is_dir():
+        files = _iter_directory(source)
+        root_name = source.name
+    elif not source.is_file():
+        raise ValueError(f"Not a directory, archive or file: '{source}'")
+    elif zipfile.is_zipfile(source):
+        files = _iter_zip(source)
+        root_name = source.name.split(".")[0]
+    elif tarfile.is_tarfile(source):
+        files = _iter_tar(source)
+        root_name = source.name.split(".")[0]
+    else:
+        files = iter([(pathlib.PurePath(source.name), source.read_bytes())])
+        root_name = source.parent.name
+
+    for path, content in files:
+        try:
+            interface = from_boutiques(
+                json.loads(content),
+                package_name if package_name is not None else (path.parent.name or root_name),
+                package_docs,
+                validate,
+            )
+        except Exception as e:
+            e.add_note(f"While loading Boutiques descriptor '{path}' from '{source}'")
+            raise
+        yield interface
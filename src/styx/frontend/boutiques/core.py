@@ -1,55 +1,155 @@
 """Boutiques backend."""
 
+import functools
 import hashlib
 import json
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import TypeVar
 
 import styx.ir.core as ir
 from styx.frontend.boutiques.utils import boutiques_split_command
+from styx.ir.validate import validate as validate_interface
+from styx.profiling import phase
 
 T = TypeVar("T")
 
 
-def destruct_template(
+def _destruct_template_by_priority(
     template: str,
     lookup: dict[str, T],
 ) -> list[str | T]:
-    """Destruct a template string to a list of strings and replacements.
-
-    This is used to safely destruct boutiques `command-line` as well as `path-template` strings.
+    """Destruct a template by repeatedly splitting at the first alias (in lookup order) that occurs.
 
-    Example:
-        >>> destruct_template(
-        >>>     template="hello x, I am y",
-        >>>     lookup={"x": 12, "y": 34},
-        >>> )
-        ["hello ", 12, ", I am ", 34]
+    Reference semantics of `destruct_template`. Each fragment is rescanned for every alias.
     """
     destructed: list[str | T] = []
     stack: list[str | T] = [template]
     while len(stack) > 0:
-        x = stack.pop(0)
+        x = stack.pop()
         if not isinstance(x, str):
             destructed.append(x)
             continue
-        did_split = False
         for alias, replacement in lookup.items():
             if alias in x:
                 left, right = x.split(alias, 1)
                 if len(right) > 0:
-                    stack.insert(0, right)
-                stack.insert(0, replacement)
+                    stack.append(right)
+                stack.append(replacement)
                 if len(left) > 0:
-                    stack.insert(0, left)
-                did_split = True
+                    stack.append(left)
                 break
-        if not did_split:
+        else:
             destructed.append(x)
     return destructed
 
 
+@dataclass
+class _TrieNode:
+    children: dict[str, "_TrieNode"] = field(default_factory=dict)
+    num_aliases: int = 0
+    """Number of aliases passing through (or ending at) this node."""
+    is_end: bool = False
+
+
+def _alias_trie(aliases: tuple[str, ...]) -> _TrieNode:
+    root = _TrieNode()
+    for alias in aliases:
+        node = root
+        for char in alias:
+            node = node.children.setdefault(char, _TrieNode())
+            node.num_aliases += 1
+        node.is_end = True
+    return root
+
+
+def _aliases_may_overlap(aliases: tuple[str, ...], trie: _TrieNode) -> bool:
+    """Check whether occurrences of two distinct aliases can overlap in some string."""
+    for alias in aliases:
+        if len(alias) == 0:
+            return True
+        for i in range(len(alias)):
+            node = trie
+            for j in range(i, len(alias)):
+                child = node.children.get(alias[j])
+                if child is None:
+                    break
+                node = child
+                if node.is_end and j - i + 1 < len(alias):
+                    # Another alias is contained in this one
+                    return True
+            else:
+                if i > 0 and node.num_aliases > (1 if alias.startswith(alias[i:]) else 0):
+                    # A suffix of this alias is the start of another alias
+                    return True
+    return False
+
+
+def _trie_pattern(node: _TrieNode) -> str:
+    """Regex pattern matching all paths from a trie node to its leaves."""
+    alternatives = [re.escape(char) + _trie_pattern(child) for char, child in node.children.items()]
+    if len(alternatives) <= 1:
+        return "".join(alternatives)
+    return f"(?:{'|'.join(alternatives)})"
+
+
+@functools.lru_cache(maxsize=256)
+def _template_tokenizer(aliases: tuple[str, ...]) -> re.Pattern | None:
+    """Compile a single-pass tokenizer matching any of the aliases.
+
+    If no two aliases can overlap, splitting at the leftmost match is equivalent to splitting
+    by alias priority. Returns `None` if that is not the case.
+
+    Aliases are compiled as a trie so matching does not scale with the number of aliases.
+    """
+    if len(aliases) == 0:
+        return None
+    trie = _alias_trie(aliases)
+    if _aliases_may_overlap(aliases, trie):
+        return None
+    return re.compile(_trie_pattern(trie))
+
+
+def _destruct_template_tokenized(
+    template: str,
+    lookup: dict[str, T],
+    tokenizer: re.Pattern | None,
+) -> list[str | T]:
+    """Destruct a template with a tokenizer compiled for the aliases of the lookup."""
+    if tokenizer is None:
+        return _destruct_template_by_priority(template, lookup)
+
+    destructed: list[str | T] = []
+    pos = 0
+    for match in tokenizer.finditer(template):
+        if match.start() > pos:
+            destructed.append(template[pos : match.start()])
+        destructed.append(lookup[match.group()])
+        pos = match.end()
+    if pos < len(template) or len(destructed) == 0:
+        destructed.append(template[pos:])
+    return destructed
+
+
+def destruct_template(
+    template: str,
+    lookup: dict[str, T],
+) -> list[str | T]:
+    """Destruct a template string to a list of strings and replacements.
+
+    This is used to safely destruct boutiques `command-line` as well as `path-template` strings.
+
+    Example:
+        >>> destruct_template(
+        >>>     template="hello x, I am y",
+        >>>     lookup={"x": 12, "y": 34},
+        >>> )
+        ["hello ", 12, ", I am ", 34]
+    """
+    return _destruct_template_tokenized(template, lookup, _template_tokenizer(tuple(lookup)))
+
+
 @dataclass
 class IdCounter:
     _counter: int = 0
@@ -71,7 +171,8 @@ def _bt_template_str_parse(
 ) -> list[list[str | dict]]:
     """Parse a Boutiques command line template string into segments."""
     bt_template_str = boutiques_split_command(input_command_line_template)
-    return [destruct_template(arg, lookup_input) for arg in bt_template_str]
+    tokenizer = _template_tokenizer(tuple(lookup_input))
+    return [_destruct_template_tokenized(arg, lookup_input, tokenizer) for arg in bt_template_str]
 
 
 class InputTypePrimitive(Enum):
@@ -180,7 +281,7 @@ def _arg_elem_from_bt_elem(
                 "value-choices must be all string for string input"
             )
 
-            return ir.Param(
+            return ir.Param.trusted(
                 base=dparam,
                 body=ir.Param.String(),
                 list_=dlist,
@@ -199,7 +300,7 @@ def _arg_elem_from_bt_elem(
             assert constraints.value_min is None or isinstance(constraints.value_min, int)
             assert constraints.value_max is None or isinstance(constraints.value_max, int)
 
-            return ir.Param(
+            return ir.Param.trusted(
                 base=dparam,
                 body=ir.Param.Int(
                     min_value=constraints.value_min,
@@ -214,7 +315,7 @@ def _arg_elem_from_bt_elem(
             )
 
         case InputTypePrimitive.Float:
-            return ir.Param(
+            return ir.Param.trusted(
                 base=dparam,
                 body=ir.Param.Float(
                     min_value=constraints.value_min,
@@ -228,7 +329,7 @@ def _arg_elem_from_bt_elem(
             )
 
         case InputTypePrimitive.File:
-            return ir.Param(
+            return ir.Param.trusted(
                 base=dparam,
                 body=ir.Param.File(
                     resolve_parent=d.get("resolve-parent") is True,
@@ -243,7 +344,7 @@ def _arg_elem_from_bt_elem(
             input_prefix = d.get("command-line-flag")
             assert input_prefix is not None, "Flag type input must have command-line-flag"
 
-            return ir.Param(
+            return ir.Param.trusted(
                 base=dparam,
                 body=ir.Param.Bool(
                     value_true=[input_prefix] if input_prefix else [],
@@ -254,7 +355,7 @@ def _arg_elem_from_bt_elem(
             dparam, dstruct = _struct_from_boutiques(d, id_counter)
             ir_id_lookup[input_bt_ref] = dparam.id_  # override
 
-            return ir.Param(
+            return ir.Param.trusted(
                 base=dparam,
                 body=dstruct,
                 list_=dlist,
@@ -270,13 +371,13 @@ def _arg_elem_from_bt_elem(
             for bt_alt in bt_alts:
                 alt_dparam, alt_dstruct = _struct_from_boutiques(bt_alt, id_counter)
                 alts.append(
-                    ir.Param(
+                    ir.Param.trusted(
                         base=alt_dparam,
                         body=alt_dstruct,
                     )
                 )
 
-            return ir.Param(
+            return ir.Param.trusted(
                 base=dparam,
                 body=ir.Param.StructUnion(
                     alts=alts,
@@ -389,9 +490,10 @@ def _struct_from_boutiques(
 
 def _collect_outputs(bt: dict, ir_id_lookup: dict[str, ir.IdType], id_counter: IdCounter) -> list[ir.Output]:
     outputs: list[ir.Output] = []
+    tokenizer = _template_tokenizer(tuple(ir_id_lookup))
     for bt_output in bt.get("output-files", []):
         path_template = bt_output["path-template"]
-        destructed = destruct_template(path_template, ir_id_lookup)
+        destructed = _destruct_template_tokenized(path_template, ir_id_lookup, tokenizer)
         output_sequence: list[str | ir.OutputParamReference] = [
             ir.OutputParamReference(
                 ref_id=x,
@@ -458,12 +560,18 @@ def _collect_stdout_stderr_output(bt: dict, id_counter: IdCounter) -> ir.StdOutE
     )
 
 
+@phase("from_boutiques", lambda tool, package_name, *_, **__: f"{package_name}/{tool.get('id', tool.get('name'))}")
 def from_boutiques(
     tool: dict,
     package_name: str,
     package_docs: ir.Documentation | None = None,
+    validate: bool = True,
 ) -> ir.Interface:
-    """Convert a Boutiques tool to a Styx descriptor."""
+    """Convert a Boutiques tool to a Styx descriptor.
+
+    Params are constructed without runtime checks. With `validate`, the finished interface is
+    checked once (see `styx.ir.validate.validate`).
+    """
     hash_ = _hash_from_boutiques(tool)
 
     docker: str | None = None
@@ -481,7 +589,7 @@ def from_boutiques(
 
     dparam, dstruct = _struct_from_boutiques(tool, id_counter)
 
-    return ir.Interface(
+    interface = ir.Interface(
         uid=f"{hash_}.boutiques",
         package=ir.Package(
             name=package_name,
@@ -489,10 +597,11 @@ def from_boutiques(
             docker=docker,
             docs=package_docs if package_docs else ir.Documentation(),
         ),
-        command=ir.Param(
+        command=ir.Param.trusted(
             base=dparam,
             body=dstruct,
         ),
         stderr_as_string_output=stderr_output,
         stdout_as_string_output=stdout_output,
     )
+    return validate_interface(interface) if validate else interface
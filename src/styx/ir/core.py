@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import dataclasses
 from dataclasses import dataclass
-from typing import Any, Generator, Generic, Optional, TypeGuard, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Generator, Generic, Iterator, Optional, TypeGuard, TypeVar, Union
 
+if TYPE_CHECKING:
+    from styx.ir.index import ParamIndex
 
-@dataclass
+
+@dataclass(slots=True)
 class Documentation:
     """Represents documentation for various elements."""
 
@@ -25,7 +28,7 @@ class Documentation:
     """List of relevant URLs."""
 
 
-@dataclass
+@dataclass(slots=True)
 class Package:
     """Metadata for software package containing command."""
 
@@ -45,7 +48,7 @@ class Package:
 IdType = int
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputParamReference:
     """Represents a reference to an output parameter."""
 
@@ -56,7 +59,7 @@ class OutputParamReference:
     """List of suffixes to remove from file names."""
 
 
-@dataclass
+@dataclass(slots=True)
 class Output:
     """Represents an output."""
 
@@ -79,7 +82,9 @@ T = TypeVar("T")
 class Param(Generic[T]):
     """Generic class to represent various types of parameters."""
 
-    @dataclass
+    __slots__ = ("base", "body", "list_", "nullable", "choices", "default_value")
+
+    @dataclass(slots=True)
     class Base:
         """Base class for all parameters."""
 
@@ -95,7 +100,7 @@ class Param(Generic[T]):
         docs: Documentation = dataclasses.field(default_factory=Documentation)
         """Documentation for the parameter."""
 
-    @dataclass
+    @dataclass(slots=True)
     class List:
         """Represents list parameters."""
 
@@ -113,7 +118,7 @@ class Param(Generic[T]):
 
         pass
 
-    @dataclass
+    @dataclass(slots=True)
     class Bool:
         """Represents boolean parameters."""
 
@@ -123,7 +128,7 @@ class Param(Generic[T]):
         value_false: list[str] = dataclasses.field(default_factory=list)
         """List of strings representing false value."""
 
-    @dataclass
+    @dataclass(slots=True)
     class Int:
         """Represents integer parameters."""
 
@@ -133,7 +138,7 @@ class Param(Generic[T]):
         max_value: int | None = None
         """Maximum allowed value."""
 
-    @dataclass
+    @dataclass(slots=True)
     class Float:
         """Represents float parameters."""
 
@@ -143,13 +148,13 @@ class Param(Generic[T]):
         max_value: float | None = None
         """Maximum allowed value."""
 
-    @dataclass
+    @dataclass(slots=True)
     class String:
         """Represents string parameters."""
 
         pass
 
-    @dataclass
+    @dataclass(slots=True)
     class File:
         """Represents file parameters."""
 
@@ -159,7 +164,7 @@ class Param(Generic[T]):
         mutable: bool = False
         """This file may be mutated."""
 
-    @dataclass
+    @dataclass(slots=True)
     class Struct:
         """Represents struct parameters."""
 
@@ -186,18 +191,31 @@ class Param(Generic[T]):
             for group in self.groups:
                 yield from group.iter_params()
 
+    def iter_children(self) -> Iterator[Param]:
+        """Iterate over the direct child-params (struct members or union alternatives)."""
+        if isinstance(self.body, Param.Struct):
+            return self.body.iter_params()
+        if isinstance(self.body, Param.StructUnion):
+            return iter(self.body.alts)
+        return iter(())
+
     def iter_params_recursively(self, skip_self: bool = True) -> Generator[Param, Any, None]:
-        """Iterate through all child-params recursively."""
+        """Iterate through all child-params recursively (depth-first, parents before their children).
+
+        Uses an explicit stack, so arbitrarily deep nesting does not hit the recursion limit.
+        """
         if not skip_self:
             yield self
-        if isinstance(self.body, Param.Struct):
-            for e in self.body.iter_params():
-                yield from e.iter_params_recursively(False)
-        elif isinstance(self.body, Param.StructUnion):
-            for e in self.body.alts:
-                yield from e.iter_params_recursively(False)
-
-    @dataclass
+        stack = [self.iter_children()]
+        while stack:
+            for param in stack[-1]:
+                yield param
+                stack.append(param.iter_children())
+                break
+            else:
+                stack.pop()
+
+    @dataclass(slots=True)
     class StructUnion:
         """Represents a union of struct parameters."""
 
@@ -237,12 +255,49 @@ class Param(Generic[T]):
         self.default_value = default_value
 
         # Runtime type checking
+        self.validate()
+
+    @classmethod
+    def trusted(
+        cls,
+        base: Base,
+        body: T,
+        list_: Optional[List] = None,
+        nullable: bool = False,
+        choices: Optional[list[Union[str, int, float]]] = None,
+        default_value: Union[
+            bool, str, int, float, list[bool], list[str], list[int], list[float], type[SetToNone], None
+        ] = None,
+    ) -> Param[T]:
+        """Create a Param instance without runtime checks.
+
+        For frontends that already guarantee well-typed arguments. Use `validate`
+        (or `styx.ir.validate.validate` for a whole interface) to check the result later.
+        Arguments are the same as for the constructor.
+        """
+        param: Param[T] = cls.__new__(cls)
+        param.base = base
+        param.body = body
+        param.list_ = list_
+        param.nullable = nullable
+        param.choices = choices
+        param.default_value = default_value
+        return param
+
+    def validate(self) -> None:
+        """Run the runtime type and constraint checks.
+
+        Raises:
+            TypeError: If any of the attribute types are incorrect.
+            ValueError: If there are constraint violations.
+        """
         self._check_base()
         self._check_body_type()
         self._check_list()
         self._check_nullable()
-        self._check_choices()
-        self._check_default_value()
+        expected_type = self._get_expected_type()
+        self._check_choices(expected_type)
+        self._check_default_value(expected_type)
         self._check_constraints()
 
     def _check_base(self) -> None:
@@ -270,16 +325,15 @@ class Param(Generic[T]):
         if not isinstance(self.nullable, bool):
             raise TypeError("nullable must be a boolean")
 
-    def _check_choices(self) -> None:
+    def _check_choices(self, expected_type: tuple[type, ...] | None) -> None:
         """Check if choices is None or a list of the correct type."""
         if self.choices is not None:
             if not isinstance(self.choices, list):
                 raise TypeError("choices must be None or a list")
-            expected_type = self._get_expected_type()
             if expected_type is not None and not all(isinstance(choice, expected_type) for choice in self.choices):
                 raise TypeError(f"All choices must be of type {' or '.join([e.__name__ for e in expected_type])}")
 
-    def _check_default_value(self) -> None:
+    def _check_default_value(self, expected_type: tuple[type, ...] | None) -> None:
         """Check if default_value is of the correct type."""
         if self.default_value is None:
             return
@@ -288,7 +342,6 @@ class Param(Generic[T]):
                 raise ValueError("default_value cannot be SetToNone when nullable is False")
             return
 
-        expected_type = self._get_expected_type()
         if expected_type is None:
             raise TypeError("default_value must be a None for this type")
         if self.list_:
@@ -470,7 +523,7 @@ def is_struct_union(param: Param[Any]) -> TypeGuard[Param[Param.StructUnion]]:
     return isinstance(param.body, Param.StructUnion)
 
 
-@dataclass
+@dataclass(slots=True)
 class Carg:
     """Represents command arguments."""
 
@@ -492,7 +545,7 @@ class Carg:
                 yield token
 
 
-@dataclass
+@dataclass(slots=True)
 class ConditionalGroup:
     """Represents a group of command arguments.
 
@@ -517,7 +570,7 @@ class ConditionalGroup:
             yield from carg.iter_params()
 
 
-@dataclass
+@dataclass(slots=True)
 class StdOutErrAsStringOutput:
     id_: IdType
     """Unique ID of the output. Unique including param IDs."""
@@ -529,7 +582,7 @@ class StdOutErrAsStringOutput:
     """Documentation for the output."""
 
 
-@dataclass
+@dataclass(slots=True)
 class Interface:
     """Represents an interface."""
 
@@ -547,3 +600,17 @@ class Interface:
 
     stderr_as_string_output: StdOutErrAsStringOutput | None = None
     """Collect stderr as string output."""
+
+    _param_index: ParamIndex | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+
+    def param_index(self) -> ParamIndex:
+        """Flat index of all params of the command (see `styx.ir.index.ParamIndex`).
+
+        The index is computed on first use and not updated afterwards, params must not be
+        added or removed once it exists.
+        """
+        if self._param_index is None:
+            from styx.ir.index import ParamIndex
+
+            self._param_index = ParamIndex(self.command)
+        return self._param_index
@@ -0,0 +1,97 @@
+"""Structural fingerprints of IR sub-commands.
+
+The fingerprint of a struct param covers everything that determines the code generated for its
+class: the struct body (name, documentation, groups and cargs), its child params (recursively)
+and its outputs. It ignores IDs (references of outputs to child params are numbered by position)
+and the attributes of the param the struct is bound to (name, documentation, list, nullable,
+default value), which only affect the parent.
+
+Structs with equal fingerprints are therefore interchangeable, e.g. a sub-command that is
+embedded as several inputs of the same descriptor.
+"""
+
+import hashlib
+
+import styx.ir.core as ir
+
+
+def _leaf_key(param: ir.Param) -> tuple:
+    return (
+        param.base.name,
+        repr(param.base.docs),
+        repr(param.list_),
+        param.nullable,
+        repr(param.choices),
+        "<unset>" if param.default_value is ir.Param.SetToNone else repr(param.default_value),
+    )
+
+
+def _output_key(output: ir.Output, positions: dict[ir.IdType, int]) -> tuple:
+    return (
+        output.name,
+        repr(output.docs),
+        [
+            token
+            if isinstance(token, str)
+            # References outside the struct keep their ID and never match another struct.
+            else (positions.get(token.ref_id, f"#{token.ref_id}"), token.file_remove_suffixes)
+            for token in output.tokens
+        ],
+    )
+
+
+def _struct_fingerprint(struct: ir.Param[ir.Param.Struct], fingerprints: dict[ir.IdType, str]) -> str:
+    positions = {param.base.id_: position for position, param in enumerate(struct.body.iter_params())}
+
+    def _param_key(param: ir.Param) -> tuple:
+        body = param.body
+        if isinstance(body, ir.Param.Struct):
+            body_key = _struct_fingerprint(param, fingerprints)
+        elif isinstance(body, ir.Param.StructUnion):
+            body_key = repr([_struct_fingerprint(alt, fingerprints) for alt in body.alts])
+        else:
+            body_key = repr(body)
+        return *_leaf_key(param), body_key
+
+    key = (
+        struct.body.name,
+        repr(struct.body.docs),
+        struct.body.join,
+        [_output_key(output, positions) for output in struct.base.outputs],
+        [
+            (
+                group.join,
+                [
+                    (carg.join, [token if isinstance(token, str) else _param_key(token) for token in carg.tokens])
+                    for carg in group.cargs
+                ],
+            )
+            for group in struct.body.groups
+        ],
+    )
+    fingerprint = hashlib.sha1(repr(key).encode()).hexdigest()
+    fingerprints[struct.base.id_] = fingerprint
+    return fingerprint
+
+
+def struct_fingerprints(param: ir.Param) -> dict[ir.IdType, str]:
+    """Fingerprint every struct param in a param tree.
+
+    Args:
+        param: Root param (usually `Interface.command`).
+
+    Returns:
+        Mapping from struct param IDs (including `param`, if it is a struct) to hex digests.
+    """
+    fingerprints: dict[ir.IdType, str] = {}
+    if isinstance(param.body, ir.Param.Struct):
+        _struct_fingerprint(param, fingerprints)
+    elif isinstance(param.body, ir.Param.StructUnion):
+        for alt in param.body.alts:
+            _struct_fingerprint(alt, fingerprints)
+    return fingerprints
+
+
+def struct_fingerprint(struct: ir.Param[ir.Param.Struct]) -> str:
+    """Fingerprint of a single struct param (see `struct_fingerprints`)."""
+    return _struct_fingerprint(struct, {})
@@ -0,0 +1,56 @@
+"""Flat index of the params of an IR param tree."""
+
+import styx.ir.core as ir
+
+
+class ParamIndex:
+    """Params of a param tree with their parent links, depths and output flags.
+
+    Computed in a single iterative walk (no recursion, so arbitrarily deep nesting is fine).
+    Use `Interface.param_index` to share the index of an interface between its users.
+    """
+
+    __slots__ = ("root", "params", "parent", "depth", "has_outputs")
+
+    def __init__(self, root: ir.Param) -> None:
+        """Index a param and all its child-params.
+
+        Args:
+            root: Root param (usually `Interface.command`).
+        """
+        self.root = root
+        self.params: dict[ir.IdType, ir.Param] = {root.base.id_: root}
+        """Find param by ID, in `Param.iter_params_recursively` order (starting with the root)."""
+        self.parent: dict[ir.IdType, ir.IdType | None] = {root.base.id_: None}
+        """Find the ID of the parent (struct or struct union) param by param ID. None for the root."""
+        self.depth: dict[ir.IdType, int] = {root.base.id_: 0}
+        """Find nesting depth by param ID. Root is 0, union alternatives are one deeper than their union."""
+        self.has_outputs: dict[ir.IdType, bool] = {root.base.id_: len(root.base.outputs) > 0}
+        """Find whether a param or any of its child-params (recursively) has outputs by param ID."""
+
+        stack = [(root.base.id_, 1, root.iter_children())]
+        while stack:
+            parent_id, depth, children = stack[-1]
+            for param in children:
+                id_ = param.base.id_
+                self.params[id_] = param
+                self.parent[id_] = parent_id
+                self.depth[id_] = depth
+                self.has_outputs[id_] = len(param.base.outputs) > 0
+                stack.append((id_, depth + 1, param.iter_children()))
+                break
+            else:
+                stack.pop()
+
+        # Children come after their parents, so propagating in reverse visits all of them first
+        for id_ in reversed(self.params):
+            if self.has_outputs[id_] and (parent := self.parent[id_]) is not None:
+                self.has_outputs[parent] = True
+
+    def __len__(self) -> int:
+        """Number of params (including the root)."""
+        return len(self.params)
+
+    def max_depth(self) -> int:
+        """Deepest nesting level."""
+        return max(self.depth.values())
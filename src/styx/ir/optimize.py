@@ -1,35 +1,102 @@
-from typing import Generator
+from typing import Callable, Iterable
 
 import styx.ir.core as ir
+from styx.profiling import interface_subject, phase
 
 
-def _merge_string_tokens(interface: ir.Interface) -> ir.Interface:
-    """Merge neighbouring string literals in Carg tokens."""
+def _is_always_set(param: ir.Param) -> bool:
+    """Check if a param is always set (and never makes its group conditional)."""
+    if param.nullable:
+        return False
+    if isinstance(param.body, ir.Param.Bool):
+        return len(param.body.value_true) > 0 and len(param.body.value_false) > 0
+    return True
 
-    def _iter_cargs() -> Generator[ir.Carg, None, None]:
-        for param in interface.command.iter_params_recursively(False):
-            if isinstance(param.body, ir.Param.Struct):
-                for group in param.body.groups:
-                    yield from group.cargs
-
-    for carg in _iter_cargs():
-        old_tokens = carg.tokens
-        new_tokens: list[ir.Param | str] = []
-        for token in old_tokens:
-            if len(new_tokens) == 0:
-                new_tokens.append(token)
+
+def _is_unconditional(group: ir.ConditionalGroup) -> bool:
+    """Check if a group is always emitted."""
+    for carg in group.cargs:
+        for token in carg.tokens:
+            if not isinstance(token, str) and not _is_always_set(token):
+                return False
+    return True
+
+
+def _merge_string_tokens(struct: ir.Param.Struct) -> None:
+    """Merge neighbouring string literals in Carg tokens."""
+    for group in struct.groups:
+        for carg in group.cargs:
+            if carg.join is not None:
                 continue
-            if isinstance(token, str) and isinstance(new_tokens[-1], str):
-                new_tokens[-1] += token
+            old_tokens = carg.tokens
+            new_tokens: list[ir.Param | str] = []
+            for token in old_tokens:
+                if len(new_tokens) == 0:
+                    new_tokens.append(token)
+                    continue
+                if isinstance(token, str) and isinstance(new_tokens[-1], str):
+                    new_tokens[-1] += token
+                    continue
+                new_tokens.append(token)
+            if len(old_tokens) > len(new_tokens):
+                carg.tokens = new_tokens
+
+
+def _collapse_unconditional_groups(struct: ir.Param.Struct) -> None:
+    """Collapse neighbouring ConditionalGroups that are always emitted into one group.
+
+    Groups only containing string tokens and params that are always set (most commonly
+    single Carg groups of required params) need no condition. The backend adds the cargs
+    of each group at once, so a collapsed run is added by a single statement.
+    """
+    if struct.join is not None:
+        return
+    new_groups: list[ir.ConditionalGroup] = []
+    merging = False
+    for group in struct.groups:
+        if group.join is None and _is_unconditional(group):
+            if merging:
+                new_groups[-1].cargs.extend(group.cargs)
                 continue
-            new_tokens.append(token)
-        if len(old_tokens) > len(new_tokens):
-            carg.tokens = new_tokens
+            merging = True
+        else:
+            merging = False
+        new_groups.append(group)
+    if len(new_groups) < len(struct.groups):
+        struct.groups = new_groups
 
-    return interface
 
+PASSES: dict[str, Callable[[ir.Param.Struct], None]] = {
+    "merge_string_tokens": _merge_string_tokens,
+    "collapse_unconditional_groups": _collapse_unconditional_groups,
+}
+"""Optimization passes by name, in the order they are run. Passes optimize a single struct in place."""
+
+
+@phase("optimize", interface_subject)
+def optimize(interface: ir.Interface, passes: Iterable[str] | None = None) -> ir.Interface:
+    """Simplify IR without changing meaning.
+
+    Args:
+        interface: Interface to optimize (in place).
+        passes: Names of the passes to run (see `PASSES`), all by default. Passes always
+            run in the order of `PASSES`.
+
+    Returns:
+        The optimized interface.
 
-def optimize(interface: ir.Interface) -> ir.Interface:
-    """Simplify IR without changing meaning."""
-    interface = _merge_string_tokens(interface)
+    Raises:
+        ValueError: If a pass name is unknown.
+    """
+    if passes is None:
+        selected = set(PASSES)
+    else:
+        selected = set(passes)
+        if unknown := selected - PASSES.keys():
+            raise ValueError(f"Unknown optimization passes: {', '.join(sorted(unknown))}")
+    optimization_passes = [optimization_pass for name, optimization_pass in PASSES.items() if name in selected]
+    for param in interface.command.iter_params_recursively(False):
+        if isinstance(param.body, ir.Param.Struct):
+            for optimization_pass in optimization_passes:
+                optimization_pass(param.body)
     return interface
@@ -0,0 +1,311 @@
+"""Compact versioned binary serialization of IR interfaces.
+
+Interfaces are converted to trees of tuples and primitives and written with `marshal`, which
+is fast but specific to the Python version. Data is therefore prefixed with a header containing
+the format version, the `marshal` version and the kind of data (a single interface written by
+`dumps` or a stream of interfaces written by `dump`), and rejected if any of them does not match.
+
+Param and output IDs are preserved, so `OutputParamReference`s stay valid. Params are restored
+without runtime checks (see `Param.trusted`), they were valid when serialized.
+"""
+
+import contextlib
+import gc
+import hashlib
+import marshal
+import struct
+from typing import IO, Any, Generator, Iterable
+
+import styx.ir.core as ir
+
+FORMAT_VERSION = 2
+"""Version of the serialized tree layout. Bump on any change."""
+
+_MAGIC = b"STYXIR"
+_HEADER = struct.Struct("<6sHHc")
+_KIND_INTERFACE = b"I"
+_KIND_STREAM = b"S"
+_KIND_NAMES = {
+    _KIND_INTERFACE: "a single interface (see `loads`)",
+    _KIND_STREAM: "a stream of interfaces (see `load`)",
+}
+_RECORD = struct.Struct("<I")
+
+_BODY_BOOL = 0
+_BODY_INT = 1
+_BODY_FLOAT = 2
+_BODY_STRING = 3
+_BODY_FILE = 4
+_BODY_STRUCT = 5
+_BODY_STRUCT_UNION = 6
+
+
+def _header(kind: bytes) -> bytes:
+    return _HEADER.pack(_MAGIC, FORMAT_VERSION, marshal.version, kind)
+
+
+def _check_header(data: bytes, kind: bytes) -> None:
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a serialized Styx IR (too short)")
+    magic, format_version, marshal_version, data_kind = _HEADER.unpack(data[: _HEADER.size])
+    if magic != _MAGIC:
+        raise ValueError("Not a serialized Styx IR")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported Styx IR format version {format_version} (expected {FORMAT_VERSION})")
+    if marshal_version != marshal.version:
+        raise ValueError(f"Styx IR was serialized with marshal version {marshal_version} (expected {marshal.version})")
+    if data_kind != kind:
+        raise ValueError(f"Styx IR contains {_KIND_NAMES.get(data_kind, 'unknown data')}, not {_KIND_NAMES[kind]}")
+
+
+# ------------------------------ Encoding ------------------------------ #
+
+
+def _enc_docs(docs: ir.Documentation) -> tuple:
+    return docs.title, docs.description, docs.authors, docs.literature, docs.urls
+
+
+def _enc_output(output: ir.Output) -> tuple:
+    return (
+        output.id_,
+        output.name,
+        [token if isinstance(token, str) else (token.ref_id, token.file_remove_suffixes) for token in output.tokens],
+        _enc_docs(output.docs),
+    )
+
+
+def _enc_body(body: Any) -> tuple:  # noqa: ANN401
+    match body:
+        case ir.Param.Bool():
+            return _BODY_BOOL, body.value_true, body.value_false
+        case ir.Param.Int():
+            return _BODY_INT, body.min_value, body.max_value
+        case ir.Param.Float():
+            return _BODY_FLOAT, body.min_value, body.max_value
+        case ir.Param.String():
+            return (_BODY_STRING,)
+        case ir.Param.File():
+            return _BODY_FILE, body.resolve_parent, body.mutable
+        case ir.Param.Struct():
+            return (
+                _BODY_STRUCT,
+                body.name,
+                [
+                    (
+                        [
+                            (
+                                [token if isinstance(token, str) else _enc_param(token) for token in carg.tokens],
+                                carg.join,
+                            )
+                            for carg in group.cargs
+                        ],
+                        group.join,
+                    )
+                    for group in body.groups
+                ],
+                body.join,
+                None if body.docs is None else _enc_docs(body.docs),
+            )
+        case ir.Param.StructUnion():
+            return _BODY_STRUCT_UNION, [_enc_param(alt) for alt in body.alts]
+    raise TypeError(f"Cannot serialize param body {body!r}")
+
+
+def _enc_param(param: ir.Param) -> tuple:
+    base = param.base
+    list_ = param.list_
+    set_to_none = param.default_value is ir.Param.SetToNone
+    return (
+        (base.id_, base.name, [_enc_output(output) for output in base.outputs], _enc_docs(base.docs)),
+        _enc_body(param.body),
+        None if list_ is None else (list_.count_min, list_.count_max, list_.join),
+        param.nullable,
+        param.choices,
+        None if set_to_none else param.default_value,
+        set_to_none,
+    )
+
+
+def _enc_std_output(output: ir.StdOutErrAsStringOutput | None) -> tuple | None:
+    return None if output is None else (output.id_, output.name, _enc_docs(output.docs))
+
+
+def _enc_interface(interface: ir.Interface) -> tuple:
+    package = interface.package
+    return (
+        interface.uid,
+        (package.name, package.version, package.docker, _enc_docs(package.docs)),
+        _enc_param(interface.command),
+        _enc_std_output(interface.stdout_as_string_output),
+        _enc_std_output(interface.stderr_as_string_output),
+    )
+
+
+# ------------------------------ Decoding ------------------------------ #
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Generator[None, Any, None]:
+    """Pause cyclic garbage collection.
+
+    Decoding allocates many objects without reference cycles, which otherwise trigger
+    repeated (and for large corpora, dominating) garbage collection passes.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _dec_docs(data: tuple) -> ir.Documentation:
+    title, description, authors, literature, urls = data
+    return ir.Documentation(title=title, description=description, authors=authors, literature=literature, urls=urls)
+
+
+def _dec_output(data: tuple) -> ir.Output:
+    id_, name, tokens, docs = data
+    return ir.Output(
+        id_=id_,
+        name=name,
+        tokens=[
+            token if isinstance(token, str) else ir.OutputParamReference(ref_id=token[0], file_remove_suffixes=token[1])
+            for token in tokens
+        ],
+        docs=_dec_docs(docs),
+    )
+
+
+def _dec_body(data: tuple) -> Any:  # noqa: ANN401
+    kind = data[0]
+    if kind == _BODY_BOOL:
+        return ir.Param.Bool(value_true=data[1], value_false=data[2])
+    if kind == _BODY_INT:
+        return ir.Param.Int(min_value=data[1], max_value=data[2])
+    if kind == _BODY_FLOAT:
+        return ir.Param.Float(min_value=data[1], max_value=data[2])
+    if kind == _BODY_STRING:
+        return ir.Param.String()
+    if kind == _BODY_FILE:
+        return ir.Param.File(resolve_parent=data[1], mutable=data[2])
+    if kind == _BODY_STRUCT:
+        _, name, groups, join, docs = data
+        return ir.Param.Struct(
+            name=name,
+            groups=[
+                ir.ConditionalGroup(
+                    cargs=[
+                        ir.Carg(
+                            tokens=[token if isinstance(token, str) else _dec_param(token) for token in tokens],
+                            join=carg_join,
+                        )
+                        for tokens, carg_join in cargs
+                    ],
+                    join=group_join,
+                )
+                for cargs, group_join in groups
+            ],
+            join=join,
+            docs=None if docs is None else _dec_docs(docs),
+        )
+    if kind == _BODY_STRUCT_UNION:
+        return ir.Param.StructUnion(alts=[_dec_param(alt) for alt in data[1]])
+    raise ValueError(f"Unknown param body kind {kind}")
+
+
+def _dec_param(data: tuple) -> ir.Param:
+    (id_, name, outputs, docs), body, list_, nullable, choices, default_value, set_to_none = data
+    return ir.Param.trusted(
+        base=ir.Param.Base(
+            id_=id_, name=name, outputs=[_dec_output(output) for output in outputs], docs=_dec_docs(docs)
+        ),
+        body=_dec_body(body),
+        list_=None if list_ is None else ir.Param.List(count_min=list_[0], count_max=list_[1], join=list_[2]),
+        nullable=nullable,
+        choices=choices,
+        default_value=ir.Param.SetToNone if set_to_none else default_value,
+    )
+
+
+def _dec_std_output(data: tuple | None) -> ir.StdOutErrAsStringOutput | None:
+    return None if data is None else ir.StdOutErrAsStringOutput(id_=data[0], name=data[1], docs=_dec_docs(data[2]))
+
+
+def _dec_interface(data: tuple) -> ir.Interface:
+    uid, (package_name, package_version, package_docker, package_docs), command, stdout, stderr = data
+    return ir.Interface(
+        uid=uid,
+        package=ir.Package(
+            name=package_name, version=package_version, docker=package_docker, docs=_dec_docs(package_docs)
+        ),
+        command=_dec_param(command),
+        stdout_as_string_output=_dec_std_output(stdout),
+        stderr_as_string_output=_dec_std_output(stderr),
+    )
+
+
+# ------------------------------ API ------------------------------ #
+
+
+def dumps(interface: ir.Interface) -> bytes:
+    """Serialize an interface."""
+    return _header(_KIND_INTERFACE) + marshal.dumps(_enc_interface(interface))
+
+
+def loads(data: bytes) -> ir.Interface:
+    """Deserialize an interface serialized with `dumps`.
+
+    Raises:
+        ValueError: If the data is not a serialized interface of the current format version.
+    """
+    _check_header(data, _KIND_INTERFACE)
+    with _gc_paused():
+        return _dec_interface(marshal.loads(data[_HEADER.size :]))
+
+
+def digest(interface: ir.Interface) -> str:
+    """Hash of the contents of an interface (all data that `dumps` serializes).
+
+    Interfaces with equal contents have equal digests, regardless of how their objects are
+    shared (e.g. interned strings), so digests identify interfaces across processes.
+    """
+    # marshal version 0 writes no back-references to repeated objects, only values
+    return hashlib.sha1(marshal.dumps(_enc_interface(interface), 0)).hexdigest()
+
+
+def dump(interfaces: Iterable[ir.Interface], file: IO[bytes]) -> int:
+    """Serialize a stream of interfaces (e.g. a parsed corpus) to a binary file.
+
+    Returns:
+        Number of interfaces written.
+    """
+    file.write(_header(_KIND_STREAM))
+    count = 0
+    for interface in interfaces:
+        data = marshal.dumps(_enc_interface(interface))
+        file.write(_RECORD.pack(len(data)))
+        file.write(data)
+        count += 1
+    return count
+
+
+def load(file: IO[bytes]) -> Generator[ir.Interface, Any, None]:
+    """Lazily deserialize interfaces written with `dump`.
+
+    Raises:
+        ValueError: If the file does not contain serialized interfaces of the current format version
+            or is truncated.
+    """
+    _check_header(file.read(_HEADER.size), _KIND_STREAM)
+    while record := file.read(_RECORD.size):
+        if len(record) < _RECORD.size:
+            raise ValueError("Truncated Styx IR file")
+        (size,) = _RECORD.unpack(record)
+        data = file.read(size)
+        if len(data) < size:
+            raise ValueError("Truncated Styx IR file")
+        with _gc_paused():
+            interface = _dec_interface(marshal.loads(data))
+        yield interface
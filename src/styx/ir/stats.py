@@ -1,41 +1,167 @@
-import styx.ir.core as ir
+"""Complexity statistics of interfaces and corpora of interfaces."""
 
+import array
+import heapq
+import math
+from typing import Iterable, Iterator
 
-def _expr_counter(expr: ir.Param) -> int:
-    if isinstance(expr.body, ir.Param.Struct):
-        return 1 + sum([_expr_counter(e) for e in expr.body.iter_params()])
-    if isinstance(expr.body, ir.Param.StructUnion):
-        return 1 + sum([_expr_counter(e) for e in expr.body.alts])
-    return 1
+import styx.ir.core as ir
 
+COLUMNS = (
+    "num_expressions",
+    "num_params",
+    "mccabe",
+    "max_depth",
+    "num_structs",
+    "num_unions",
+    "num_lists",
+    "num_outputs",
+)
+"""Statistics computed per interface (see `interface_stats`)."""
 
-def _param_counter(expr: ir.Param) -> int:
-    if isinstance(expr.body, ir.Param.Struct):
-        return sum([_param_counter(e) for e in expr.body.iter_params()])
-    if isinstance(expr.body, ir.Param.StructUnion):
-        return sum([_param_counter(e) for e in expr.body.alts])
-    return 1
 
+def interface_stats(interface: ir.Interface) -> dict[str, int]:
+    """Compute all statistics of an interface in a single iterative traversal.
 
-def _mccabe(expr: ir.Param) -> int:
-    complexity = 1
+    - `num_expressions`: Number of params including structs and unions.
+    - `num_params`: Number of leaf params (excluding structs and unions).
+    - `mccabe`: Number of distinct shapes of the command line (optional or list structs multiply).
+    - `max_depth`: Deepest nesting of params (params of the command are at depth 1).
+    - `num_structs`, `num_unions`, `num_lists`: Number of structs (including the command),
+      struct unions and list params.
+    - `num_outputs`: Number of output files.
+    """
+    num_structs = num_unions = num_lists = num_outputs = max_depth = 0
 
-    if expr.nullable or (isinstance(expr.body, (ir.Param.Struct, ir.Param.StructUnion)) and expr.list_):
-        complexity = 2
+    # Post-order: each param is summarized (expressions, params, mccabe) once all its children are
+    stack: list[tuple[ir.Param, Iterator[ir.Param], int, list[tuple[int, int, int]]]] = [
+        (interface.command, interface.command.iter_children(), 0, [])
+    ]
+    result = (0, 0, 0)
+    while stack:
+        param, children, depth, summaries = stack[-1]
+        for child in children:
+            stack.append((child, child.iter_children(), depth + 1, []))
+            break
+        else:
+            stack.pop()
+            max_depth = max(max_depth, depth)
+            num_outputs += len(param.base.outputs)
+            if param.list_ is not None:
+                num_lists += 1
+            body = param.body
+            is_struct = isinstance(body, ir.Param.Struct)
+            is_union = isinstance(body, ir.Param.StructUnion)
+            complexity = 2 if param.nullable or ((is_struct or is_union) and param.list_) else 1
+            if is_struct:
+                num_structs += 1
+                result = (
+                    1 + sum(s[0] for s in summaries),
+                    sum(s[1] for s in summaries),
+                    complexity * (sum(s[2] for s in summaries) - len(summaries) + 1),
+                )
+            elif is_union:
+                num_unions += 1
+                result = (
+                    1 + sum(s[0] for s in summaries),
+                    sum(s[1] for s in summaries),
+                    complexity * sum(s[2] for s in summaries),
+                )
+            else:
+                result = (1, 1, complexity)
+            if stack:
+                stack[-1][3].append(result)
 
-    match expr.body:
-        case ir.Param.Struct():
-            x = [_mccabe(e) for e in expr.body.iter_params()]
-            return complexity * (sum(x) - len(x) + 1)
-        case ir.Param.StructUnion():
-            return complexity * sum([_mccabe(e) for e in expr.body.alts])
-    return complexity
+    num_expressions, num_params, mccabe = result
+    return {
+        "num_expressions": num_expressions,
+        "num_params": num_params,
+        "mccabe": mccabe,
+        "max_depth": max_depth,
+        "num_structs": num_structs,
+        "num_unions": num_unions,
+        "num_lists": num_lists,
+        "num_outputs": num_outputs,
+    }
 
 
 def stats(interface: ir.Interface) -> dict[str, str | int | float]:
+    interface_stats_ = interface_stats(interface)
     return {
         "name": interface.command.base.name,
-        "num_expressions": _expr_counter(interface.command),
-        "num_params": _param_counter(interface.command),
-        "mccabe": _mccabe(interface.command),
+        "num_expressions": interface_stats_["num_expressions"],
+        "num_params": interface_stats_["num_params"],
+        "mccabe": interface_stats_["mccabe"],
     }
+
+
+class CorpusStats:
+    """Statistics of a corpus of interfaces in columns (one row per interface).
+
+    Columns are `array.array`s of 64 bit integers, which keeps large corpora compact and
+    can be wrapped without copying (e.g. `numpy.frombuffer`).
+    """
+
+    def __init__(self, interfaces: Iterable[ir.Interface] = ()) -> None:
+        """Compute the statistics of a stream of interfaces.
+
+        Args:
+            interfaces: Interfaces to add (see `add`).
+        """
+        self.names: list[str] = []
+        """Interface names ('package/command') by row."""
+        self.columns: dict[str, array.array[int]] = {column: array.array("q") for column in COLUMNS}
+        """Statistic values by column name (see `COLUMNS`), by row."""
+        for interface in interfaces:
+            self.add(interface)
+
+    def __len__(self) -> int:
+        """Number of interfaces."""
+        return len(self.names)
+
+    def add(self, interface: ir.Interface) -> None:
+        """Add a row for an interface."""
+        self.names.append(f"{interface.package.name}/{interface.command.base.name}")
+        for column, value in interface_stats(interface).items():
+            self.columns[column].append(value)
+
+    def row(self, index: int) -> dict[str, int]:
+        """Statistics of a single interface by row index."""
+        return {column: values[index] for column, values in self.columns.items()}
+
+    def percentile(self, column: str, q: float) -> float:
+        """Percentile of a column (linear interpolation between the closest ranks).
+
+        Args:
+            column: Column name.
+            q: Percentile between 0 and 100.
+
+        Raises:
+            ValueError: If there are no rows or `q` is out of range.
+        """
+        return self.percentiles(column, (q,))[0]
+
+    def percentiles(self, column: str, qs: Iterable[float]) -> list[float]:
+        """Several percentiles of a column (see `percentile`), sorting the column only once."""
+        qs = list(qs)
+        if any(not 0 <= q <= 100 for q in qs):
+            raise ValueError(f"Percentiles must be between 0 and 100, not {qs}")
+        if len(self) == 0:
+            raise ValueError("Percentile of an empty corpus")
+        values = sorted(self.columns[column])
+        result = []
+        for q in qs:
+            position = (len(values) - 1) * q / 100
+            lower = math.floor(position)
+            upper = min(lower + 1, len(values) - 1)
+            result.append(values[lower] + (values[upper] - values[lower]) * (position - lower))
+        return result
+
+    def top(self, column: str, n: int = 10) -> list[tuple[str, int]]:
+        """Interfaces with the largest values of a column (largest first).
+
+        Returns:
+            List of tuples (interface name, value).
+        """
+        values = self.columns[column]
+        return [(self.names[i], values[i]) for i in heapq.nlargest(n, range(len(values)), key=values.__getitem__)]
@@ -0,0 +1,45 @@
+"""One-shot validation of a finished IR interface."""
+
+import styx.ir.core as ir
+
+
+def validate(interface: ir.Interface) -> ir.Interface:
+    """Check an interface built from trusted `Param`s (see `Param.trusted`).
+
+    Runs the runtime checks of every param (see `Param.validate`) and checks that
+    param and output IDs are unique. Type errors of params are reported as `ValueError`s
+    as well, so callers only need to handle a single error type for invalid interfaces.
+
+    Args:
+        interface: Interface to check.
+
+    Returns:
+        The interface.
+
+    Raises:
+        ValueError: If any param attribute types are incorrect, there are constraint
+            violations or duplicate IDs.
+    """
+    ids: set[ir.IdType] = set()
+
+    def _claim(id_: ir.IdType, name: str) -> None:
+        if id_ in ids:
+            raise ValueError(f"Duplicate id {id_} of '{name}'")
+        ids.add(id_)
+
+    for param in (interface.command, *interface.command.iter_params_recursively()):
+        try:
+            param.validate()
+        except (TypeError, ValueError) as e:
+            error = e if isinstance(e, ValueError) else ValueError(str(e))
+            error.add_note(f"In parameter '{param.base.name}' (id {param.base.id_})")
+            if error is e:
+                raise
+            raise error from e
+        _claim(param.base.id_, param.base.name)
+        for output in param.base.outputs:
+            _claim(output.id_, output.name)
+    for std_output in (interface.stdout_as_string_output, interface.stderr_as_string_output):
+        if std_output is not None:
+            _claim(std_output.id_, std_output.name)
+    return interface
@@ -0,0 +1,210 @@
+"""Styx command line interface."""
+
+import argparse
+import collections
+import contextlib
+import os
+import pathlib
+import sys
+import time
+from typing import Any, Generator, Iterable, TypeVar
+
+from styx.backend.generic.cache import CompileCache
+from styx.backend.generic.core import ModuleSource, compile_language_modules
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import iter_from_boutiques
+from styx.ir.optimize import PASSES, optimize
+from styx.profiling import Profiler
+
+T = TypeVar("T")
+
+
+class _PhaseTimer:
+    """Accumulate exclusive wall time per phase. Nested phases pause their parent."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = collections.defaultdict(float)
+        self._stack: list[str] = []
+        self._started = 0.0
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Generator[None, Any, None]:
+        now = time.perf_counter()
+        if self._stack:
+            self.seconds[self._stack[-1]] += now - self._started
+        self._stack.append(name)
+        self._started = now
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.seconds[self._stack.pop()] += now - self._started
+            self._started = now
+
+    def iterate(self, name: str, iterable: Iterable[T]) -> Generator[T, Any, None]:
+        """Attribute the time spent producing each item to a phase."""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+def _write_if_changed(path: pathlib.Path, module: ModuleSource) -> bool:
+    """Write a module file unless it already has the same contents.
+
+    New files are streamed to disk without rendering the module source in memory.
+
+    Returns:
+        True if the file was written.
+    """
+    try:
+        existing = path.read_bytes()
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8", newline="") as f:
+            module.write(f)
+        return True
+    data = module.source().encode("utf-8")
+    if existing == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def build(
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    package_name: str | None = None,
+    workers: int = 1,
+    cache_path: pathlib.Path | None = None,
+    lazy_init: bool = False,
+    dedupe_structs: bool = False,
+    flat_cargs: bool = False,
+    optimize_passes: list[str] | None = None,
+    profile: int = 0,
+    profile_allocations: bool = False,
+) -> None:
+    """Compile all Boutiques descriptors in a directory tree or archive to Python wrappers.
+
+    `optimize_passes` selects the IR optimization passes (all by default, see `styx.ir.optimize`).
+    `flat_cargs` generates cargs building without intermediate lists (see `PythonLanguageProvider`).
+    With `profile` > 0, a report of the slowest descriptors is printed (see `styx.profiling`).
+    """
+    timer = _PhaseTimer()
+    time_start = time.perf_counter()
+    cache = CompileCache(cache_path) if cache_path is not None else None
+
+    interfaces = timer.iterate("load", iter_from_boutiques(input_path, package_name=package_name))
+    optimized = timer.iterate("optimize", (optimize(interface, optimize_passes) for interface in interfaces))
+    modules = timer.iterate(
+        "compile",
+        compile_language_modules(
+            PythonLanguageProvider(flat_cargs), optimized, workers, cache, lazy_init, dedupe_structs
+        ),
+    )
+
+    num_written = 0
+    num_unchanged = 0
+    profiler = Profiler(trace_allocations=profile_allocations)
+    with profiler if profile > 0 else contextlib.nullcontext():
+        for module, module_path in modules:
+            with timer.phase("write"):
+                path = output_path.joinpath(*module_path[:-1], f"{module_path[-1]}.py")
+                if _write_if_changed(path, module):
+                    num_written += 1
+                else:
+                    num_unchanged += 1
+
+    time_total = time.perf_counter() - time_start
+    print("Phase timings:")
+    for phase, seconds in timer.seconds.items():
+        print(f"  {phase:<10} {seconds:>9.3f}s")
+    if cache is not None:
+        print(f"Compile cache: {cache.hits} hits, {cache.misses} misses")
+    modules_written = f"{num_written} module{'' if num_written == 1 else 's'}"
+    print(f"Wrote {modules_written} ({num_unchanged} unchanged) in {time_total:.3f}s")
+    if profile > 0:
+        print(profiler.report(top=profile))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="styx", description="Command line tool wrapper compiler.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_build = subparsers.add_parser("build", help="Compile Boutiques descriptors to Python wrappers.")
+    parser_build.add_argument(
+        "input", type=pathlib.Path, help="Descriptor directory tree, tarball, zip archive or single descriptor."
+    )
+    parser_build.add_argument("output", type=pathlib.Path, help="Output directory.")
+    parser_build.add_argument(
+        "-p", "--package", help="Package name of all wrappers (default: directory containing each descriptor)."
+    )
+    parser_build.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Number of worker processes (0: one per CPU, default: 1)."
+    )
+    parser_build.add_argument("--cache-dir", type=pathlib.Path, help="Directory of the incremental compile cache.")
+    parser_build.add_argument(
+        "--lazy-init", action="store_true", help="Import wrapper modules on first use in package '__init__' modules."
+    )
+    parser_build.add_argument(
+        "--dedupe-structs",
+        action="store_true",
+        help="Generate a single class for identical sub-commands within a descriptor.",
+    )
+    parser_build.add_argument(
+        "--flat-cargs",
+        action="store_true",
+        help="Build command line arguments without intermediate lists (sub-commands extend the caller's list).",
+    )
+    parser_build.add_argument(
+        "--no-optimize",
+        action="append",
+        default=[],
+        choices=list(PASSES),
+        metavar="PASS",
+        help=f"Disable an IR optimization pass (can be repeated). Passes: {', '.join(PASSES)}.",
+    )
+    parser_build.add_argument(
+        "--profile",
+        type=int,
+        nargs="?",
+        const=20,
+        default=0,
+        metavar="N",
+        help="Print wall time and call counts per phase for the N slowest descriptors (default N: 20).",
+    )
+    parser_build.add_argument(
+        "--profile-allocations", action="store_true", help="Also record memory allocations when profiling (slow)."
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.jobs < 0:
+            parser.error("--jobs must not be negative")
+        try:
+            build(
+                input_path=args.input,
+                output_path=args.output,
+                package_name=args.package,
+                workers=args.jobs or os.cpu_count() or 1,
+                cache_path=args.cache_dir,
+                lazy_init=args.lazy_init,
+                dedupe_structs=args.dedupe_structs,
+                flat_cargs=args.flat_cargs,
+                optimize_passes=[name for name in PASSES if name not in args.no_optimize],
+                profile=args.profile,
+                profile_allocations=args.profile_allocations,
+            )
+        except ValueError as e:
+            print(f"error: {e}", *getattr(e, "__notes__", []), sep="\n", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
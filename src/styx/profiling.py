@@ -0,0 +1,217 @@
+"""Opt-in instrumentation of compiler phases.
+
+Compiler phases are decorated with `phase`. While a `Profiler` is active, every call records
+wall time, call count and (optionally) memory allocations for the current subject (usually
+the interface being compiled). Without an active profiler the decorators only add a global
+lookup per call.
+
+Example:
+    with Profiler(trace_allocations=True) as profiler:
+        ...  # compile
+    print(profiler.report(top=10))
+
+Phases nest (e.g. `LookupParam` runs within `compile_interface`); phase times are inclusive.
+Recursive phases are only timed at their outermost call but every call is counted.
+Only the current process is profiled, interfaces compiled in worker processes are not recorded.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import dataclasses
+import functools
+import time
+import tracemalloc
+from typing import Any, Callable, Generator, ParamSpec, TypeVar
+
+import styx.ir.core as ir
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+UNKNOWN_SUBJECT = "<unknown>"
+
+_active: Profiler | None = None
+
+
+@dataclasses.dataclass
+class PhaseStats:
+    """Statistics of a single phase for a single subject."""
+
+    calls: int = 0
+    """Number of calls (including recursive calls)."""
+    seconds: float = 0.0
+    """Wall time of the outermost calls."""
+    allocated: int = 0
+    """Net bytes allocated by the outermost calls (only if allocations are traced)."""
+
+
+@dataclasses.dataclass
+class SubjectStats:
+    """Statistics of all phases for a single subject."""
+
+    seconds: float = 0.0
+    """Wall time spent in any phase."""
+    allocated: int = 0
+    """Net bytes allocated in any phase (only if allocations are traced)."""
+    phases: dict[str, PhaseStats] = dataclasses.field(default_factory=lambda: collections.defaultdict(PhaseStats))
+
+
+def interface_subject(interface: ir.Interface) -> str:
+    """Subject name of an interface."""
+    return f"{interface.package.name}/{interface.command.base.name}"
+
+
+class Profiler:
+    """Records compiler phase statistics per subject while active (as a context manager)."""
+
+    def __init__(self, trace_allocations: bool = False) -> None:
+        """Create a profiler.
+
+        Args:
+            trace_allocations: Also record allocations using `tracemalloc` (slow).
+        """
+        self.trace_allocations = trace_allocations
+        self.subjects: dict[str, SubjectStats] = collections.defaultdict(SubjectStats)
+        self._subject_stack: list[str] = []
+        self._phase_depth: dict[str, int] = collections.defaultdict(int)
+        self._depth = 0
+        self._stop_tracemalloc = False
+
+    def __enter__(self) -> Profiler:
+        """Activate the profiler."""
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another profiler is already active")
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._stop_tracemalloc = True
+        _active = self
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Deactivate the profiler."""
+        global _active
+        _active = None
+        if self._stop_tracemalloc:
+            tracemalloc.stop()
+            self._stop_tracemalloc = False
+
+    def _allocated(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.trace_allocations else 0
+
+    @contextlib.contextmanager
+    def _subject(self, name: str) -> Generator[None, Any, None]:
+        self._subject_stack.append(name)
+        try:
+            yield
+        finally:
+            self._subject_stack.pop()
+
+    @contextlib.contextmanager
+    def _phase(self, name: str) -> Generator[None, Any, None]:
+        subject = self.subjects[self._subject_stack[-1] if self._subject_stack else UNKNOWN_SUBJECT]
+        stats = subject.phases[name]
+        stats.calls += 1
+        if self._phase_depth[name] > 0:
+            yield
+            return
+        outermost = self._depth == 0
+        self._phase_depth[name] += 1
+        self._depth += 1
+        allocated = self._allocated()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            allocated = self._allocated() - allocated
+            self._phase_depth[name] -= 1
+            self._depth -= 1
+            stats.seconds += seconds
+            stats.allocated += allocated
+            if outermost:
+                subject.seconds += seconds
+                subject.allocated += allocated
+
+    def slowest(self, top: int | None = None) -> list[tuple[str, SubjectStats]]:
+        """Subjects sorted by the wall time spent in compiler phases (slowest first)."""
+        return sorted(self.subjects.items(), key=lambda item: item[1].seconds, reverse=True)[:top]
+
+    def report(self, top: int | None = 20) -> str:
+        """Table of the slowest subjects with their per-phase wall times (and allocations)."""
+        phases = list(dict.fromkeys(name for stats in self.subjects.values() for name in stats.phases))
+        widths = [max(18, len(name) + 2) for name in phases]
+        slowest = self.slowest(top)
+        total_seconds = sum(stats.seconds for stats in self.subjects.values())
+        lines = [
+            f"Slowest {len(slowest)} of {len(self.subjects)} subjects ({total_seconds:.3f}s in compiler phases)",
+            "".join([
+                f"{'total [ms]':>12}",
+                *(f"{name:>{width}}" for name, width in zip(phases, widths)),
+                f"{'alloc [KiB]':>12}" if self.trace_allocations else "",
+                "  subject",
+            ]),
+        ]
+        for subject, stats in slowest:
+            lines.append(
+                "".join([
+                    f"{stats.seconds * 1000:>12.3f}",
+                    *(
+                        f"{stats.phases[name].seconds * 1000:>{width - 7}.3f} ({stats.phases[name].calls:>4})"
+                        if name in stats.phases
+                        else f"{'-':>{width}}"
+                        for name, width in zip(phases, widths)
+                    ),
+                    f"{stats.allocated / 1024:>12.1f}" if self.trace_allocations else "",
+                    f"  {subject}",
+                ])
+            )
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def subject(name: str) -> Generator[None, Any, None]:
+    """Attribute phases within the context to a subject (if a profiler is active)."""
+    if _active is None:
+        yield
+        return
+    with _active._subject(name):
+        yield
+
+
+@contextlib.contextmanager
+def timed(name: str) -> Generator[None, Any, None]:
+    """Record the context as a phase (if a profiler is active)."""
+    if _active is None:
+        yield
+        return
+    with _active._phase(name):
+        yield
+
+
+def phase(name: str, subject_of: Callable[..., str] | None = None) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorate a function as a compiler phase.
+
+    Args:
+        name: Phase name.
+        subject_of: Derive the subject from the call arguments. Calls without subject are
+            attributed to the subject of the enclosing phase.
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            profiler = _active
+            if profiler is None:
+                return func(*args, **kwargs)
+            with contextlib.ExitStack() as stack:
+                if subject_of is not None:
+                    stack.enter_context(profiler._subject(subject_of(*args, **kwargs)))
+                stack.enter_context(profiler._phase(name))
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,60 @@
+"""Test loading many Boutiques descriptors."""
+
+import json
+import pathlib
+import tarfile
+import zipfile
+
+import pytest
+
+from styx.frontend.boutiques import iter_from_boutiques
+from tests.utils.dynmodule import boutiques_dummy
+
+
+def _write_tree(root: pathlib.Path) -> None:
+    """Write descriptors of two packages to a directory tree."""
+    for package, names in (("pkg_a", ["b_tool", "a_tool"]), ("pkg_b", ["c_tool"])):
+        (root / package).mkdir(parents=True)
+        for name in names:
+            (root / package / f"{name}.json").write_text(json.dumps(boutiques_dummy({"name": name})))
+    (root / "pkg_b" / "notes.txt").write_text("not a descriptor")
+
+
+def test_iter_directory(tmp_path: pathlib.Path) -> None:
+    """Descriptors are loaded in sorted order with the directory as package."""
+    _write_tree(tmp_path / "tree")
+    interfaces = iter_from_boutiques(tmp_path / "tree")
+
+    first = next(interfaces)
+    assert (first.package.name, first.command.base.name) == ("pkg_a", "a_tool")
+    assert [(i.package.name, i.command.base.name) for i in interfaces] == [("pkg_a", "b_tool"), ("pkg_b", "c_tool")]
+
+
+def test_iter_package_name(tmp_path: pathlib.Path) -> None:
+    """An explicit package name overrides the directory name."""
+    _write_tree(tmp_path)
+    assert {i.package.name for i in iter_from_boutiques(tmp_path, package_name="pkg")} == {"pkg"}
+
+
+def test_iter_archives(tmp_path: pathlib.Path) -> None:
+    """Tarballs and zip archives yield the same interfaces as directories."""
+    _write_tree(tmp_path / "tree")
+    expected = sorted((i.package.name, i.command.base.name, i.uid) for i in iter_from_boutiques(tmp_path / "tree"))
+
+    with tarfile.open(tmp_path / "tree.tar.gz", "w:gz") as tar:
+        tar.add(tmp_path / "tree", arcname="tree")
+    with zipfile.ZipFile(tmp_path / "tree.zip", "w") as archive:
+        for path in sorted((tmp_path / "tree").rglob("*")):
+            archive.write(path, path.relative_to(tmp_path))
+
+    for archive_path in (tmp_path / "tree.tar.gz", tmp_path / "tree.zip"):
+        interfaces = iter_from_boutiques(archive_path)
+        assert sorted((i.package.name, i.command.base.name, i.uid) for i in interfaces) == expected
+
+
+def test_iter_invalid_descriptor(tmp_path: pathlib.Path) -> None:
+    """Errors name the offending descriptor."""
+    (tmp_path / "broken.json").write_text("{")
+    with pytest.raises(ValueError) as e:
+        list(iter_from_boutiques(tmp_path))
+    assert "broken.json" in "".join(e.value.__notes__)
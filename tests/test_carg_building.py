@@ -1,6 +1,10 @@
 """Test command line argument building."""
 
+import styx.ir.core as ir
 import tests.utils.dummy_runner
+from styx.backend.generic.core import compile_language
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
 from tests.utils.compile_boutiques import boutiques2python
 from tests.utils.dynmodule import (
     BT_TYPE_FILE,
@@ -109,6 +113,38 @@ def test_flag_arg() -> None:
     assert dummy_runner.last_cargs == ["dummy", "-x"]
 
 
+def test_flag_arg_with_false_value() -> None:
+    """Flag argument with command line values for both states."""
+    interface = from_boutiques(
+        boutiques_dummy({
+            "command-line": "dummy [X]",
+            "inputs": [
+                {
+                    "id": "x",
+                    "name": "The x",
+                    "value-key": "[X]",
+                    "type": BT_TYPE_FLAG,
+                    "command-line-flag": "--x",
+                }
+            ],
+        }),
+        "no_package",
+    )
+    # Boutiques flags have no false value, so set one in the IR
+    param = next(interface.command.iter_params_recursively())
+    assert isinstance(param.body, ir.Param.Bool)
+    param.body.value_false = ["--no-x"]
+
+    compiled_module = next(compile_language(PythonLanguageProvider(), [interface]))[0]
+
+    test_module = dynamic_module(compiled_module, "test_module")
+    dummy_runner = tests.utils.dummy_runner.DummyRunner()
+    test_module.dummy(runner=dummy_runner, x=True)
+    assert dummy_runner.last_cargs == ["dummy", "--x"]
+    test_module.dummy(runner=dummy_runner, x=False)
+    assert dummy_runner.last_cargs == ["dummy", "--no-x"]
+
+
 def test_named_arg() -> None:
     """Named argument."""
     model = boutiques_dummy({
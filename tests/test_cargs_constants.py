@@ -0,0 +1,47 @@
+"""Test hoisting literal command line args into module constants."""
+
+import pytest
+
+import tests.utils.dummy_runner
+from styx.backend.generic.core import compile_language
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.optimize import optimize
+from tests.utils.dynmodule import BT_TYPE_FLAG, BT_TYPE_STRING, boutiques_dummy, dynamic_module
+
+_SUB = {
+    "id": "sub",
+    "command-line": "sub --fixed value [Y]",
+    "inputs": [{"id": "y", "name": "Y", "value-key": "[Y]", "type": BT_TYPE_STRING}],
+}
+
+_DESCRIPTOR = boutiques_dummy({
+    "command-line": "dummy run --mode fast [C] [A] [B] --end",
+    "inputs": [
+        {"id": "c", "name": "C", "value-key": "[C]", "type": BT_TYPE_FLAG, "command-line-flag": "-c"},
+        {"id": "a", "name": "A", "value-key": "[A]", "type": _SUB},
+        {"id": "b", "name": "B", "value-key": "[B]", "type": {**_SUB, "id": "other"}, "optional": True},
+    ],
+})
+
+
+@pytest.mark.parametrize("passes", [[], None], ids=["unoptimized", "optimized"])
+@pytest.mark.parametrize("flat_cargs", [False, True])
+def test_literal_runs(passes: list[str] | None, flat_cargs: bool) -> None:
+    interface = optimize(from_boutiques(_DESCRIPTOR, "no_package"), passes)
+    source = next(compile_language(PythonLanguageProvider(flat_cargs), [interface]))[0]
+    assert 'DUMMY_CARGS_0 = ("dummy", "run", "--mode", "fast")' in source
+    # Identical runs are declared once
+    assert source.count('("sub", "--fixed", "value")') == 1
+
+    module = dynamic_module(source, "test_module")
+    runner = tests.utils.dummy_runner.DummyRunner()
+    module.dummy(c=False, a=module.DummySub(y="a"), runner=runner)
+    assert runner.last_cargs == ["dummy", "run", "--mode", "fast", "sub", "--fixed", "value", "a", "--end"]
+    module.dummy(c=True, a=module.DummySub(y="a"), b=module.DummyOther(y="b"), runner=runner)
+    assert runner.last_cargs == [
+        *["dummy", "run", "--mode", "fast", "-c"],
+        *["sub", "--fixed", "value", "a"],
+        *["sub", "--fixed", "value", "b"],
+        "--end",
+    ]
@@ -0,0 +1,205 @@
+"""Test compiling multiple interfaces into packages."""
+
+import importlib
+import io
+import pathlib
+import sys
+import tracemalloc
+from typing import Callable, Iterable
+
+import pytest
+
+import styx.ir.core as ir
+from styx.backend.generic.cache import CompileCache
+from styx.backend.generic.core import compile_language, compile_language_modules
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from tests.utils.dynmodule import (
+    BT_TYPE_NUMBER,
+    boutiques_dummy,
+)
+
+
+class _NullStream(io.StringIO):
+    """Text stream discarding everything written to it."""
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        for _ in lines:
+            pass
+
+
+def _interfaces() -> list[ir.Interface]:
+    """Interfaces with symbol collisions within and across packages."""
+    interfaces = []
+    for package in ("pkg_a", "pkg_b"):
+        for name in ("dummy", "dummy", "other", "dummy_metadata"):
+            model = boutiques_dummy({
+                "name": name,
+                "command-line": f"{name} [X]",
+                "inputs": [
+                    {
+                        "id": "x",
+                        "name": "The x",
+                        "value-key": "[X]",
+                        "type": BT_TYPE_NUMBER,
+                    }
+                ],
+                "output-files": [
+                    {
+                        "id": "dummy",
+                        "name": "Colliding output",
+                        "path-template": "[X].txt",
+                    }
+                ],
+            })
+            interfaces.append(from_boutiques(model, package))
+    return interfaces
+
+
+def test_parallel_matches_serial() -> None:
+    """Parallel compilation yields the same modules in the same order."""
+    serial = list(compile_language(PythonLanguageProvider(), _interfaces()))
+    parallel = list(compile_language(PythonLanguageProvider(), _interfaces(), workers=2))
+
+    assert [path for _, path in parallel] == [path for _, path in serial]
+    assert parallel == serial
+
+
+def test_streamed_modules(tmp_path: pathlib.Path) -> None:
+    """Streamed modules write the same source, whether compiled in this process or cached."""
+    serial = list(compile_language(PythonLanguageProvider(), _interfaces()))
+    cache = CompileCache(tmp_path)
+    for workers, cache_ in ((1, None), (1, cache), (2, cache)):
+        streamed = []
+        for module, module_path in compile_language_modules(PythonLanguageProvider(), _interfaces(), workers, cache_):
+            stream = io.StringIO()
+            module.write(stream)
+            assert stream.getvalue() == module.source()
+            streamed.append((stream.getvalue(), module_path))
+        assert streamed == serial
+
+
+def test_streamed_module_memory() -> None:
+    """Streaming a module keeps only one top-level block at a time in memory."""
+    sub_commands = [
+        {
+            "id": f"s{i}",
+            "value-key": f"[S{i}]",
+            "type": {
+                "id": f"sub{i}",
+                "command-line": f"sub{i} [X]",
+                "inputs": [{"id": "x", "value-key": "[X]", "type": BT_TYPE_NUMBER}],
+            },
+        }
+        for i in range(40)
+    ]
+    model = boutiques_dummy({
+        "command-line": "dummy " + " ".join(f"[S{i}]" for i in range(40)),
+        "inputs": sub_commands,
+        "output-files": [],
+    })
+    module = next(compile_language_modules(PythonLanguageProvider(), [from_boutiques(model, "dummy")]))[0]
+
+    def _peak(call: Callable[[], object]) -> int:
+        call()
+        tracemalloc.start()
+        try:
+            call()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    stream = io.StringIO()
+    module.write(stream)
+    assert stream.getvalue() == module.source()
+    assert _peak(lambda: module.write(_NullStream())) * 4 < _peak(module.source)
+
+
+def test_symbols_dodge_across_interfaces() -> None:
+    """Interfaces in the same package do not reuse each others symbols."""
+    modules = list(compile_language(PythonLanguageProvider(), _interfaces(), workers=2))
+
+    assert "def dummy(" in modules[0][0]
+    assert "def dummy_(" in modules[1][0]
+    assert "DUMMY_METADATA_ = Metadata(" in modules[1][0]
+    assert "def dummy(" in modules[4][0]
+
+
+def test_compile_cache(tmp_path: pathlib.Path) -> None:
+    """Cached compiles are reused and only changed interfaces are recompiled."""
+    serial = list(compile_language(PythonLanguageProvider(), _interfaces()))
+
+    cache = CompileCache(tmp_path)
+    assert list(compile_language(PythonLanguageProvider(), _interfaces(), cache=cache)) == serial
+    assert cache.misses == 6  # identical descriptors share an entry
+
+    cache = CompileCache(tmp_path)
+    assert list(compile_language(PythonLanguageProvider(), _interfaces(), workers=2, cache=cache)) == serial
+    assert cache.misses == 0
+
+    changed = _interfaces()
+    changed[1] = from_boutiques(boutiques_dummy({"name": "dummy", "command-line": "dummy --changed"}), "pkg_a")
+    cache = CompileCache(tmp_path)
+    modules = list(compile_language(PythonLanguageProvider(), changed, cache=cache))
+    assert cache.misses == 1
+    assert modules == list(compile_language(PythonLanguageProvider(), changed))
+
+
+def test_compile_cache_contents(tmp_path: pathlib.Path) -> None:
+    """Interfaces changed after loading (e.g. by optimization passes) do not share cache entries."""
+    interfaces = _interfaces()[:1]
+    cache = CompileCache(tmp_path)
+    original = list(compile_language(PythonLanguageProvider(), interfaces, cache=cache))
+
+    # Same uid, other contents
+    interfaces[0].command.body.groups.append(ir.ConditionalGroup(cargs=[ir.Carg(tokens=["--extra"])]))
+    changed = list(compile_language(PythonLanguageProvider(), interfaces, cache=cache))
+    assert changed != original
+    assert changed == list(compile_language(PythonLanguageProvider(), interfaces))
+    assert cache.misses == 2
+
+
+def test_compile_cache_providers(tmp_path: pathlib.Path) -> None:
+    """Providers with other code generation options do not share cache entries."""
+    interfaces = _interfaces()[:1]
+    cache = CompileCache(tmp_path)
+    default = list(compile_language(PythonLanguageProvider(), interfaces, cache=cache))
+    flat = list(compile_language(PythonLanguageProvider(flat_cargs=True), interfaces, cache=cache))
+    assert cache.misses == 2
+    assert default == list(compile_language(PythonLanguageProvider(), interfaces))
+    assert flat == list(compile_language(PythonLanguageProvider(flat_cargs=True), interfaces))
+    assert flat != default
+
+
+def test_compile_cache_python_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Modules compiled by other Python versions (with other reserved symbols) are not reused."""
+    lang, interface = PythonLanguageProvider(), _interfaces()[0]
+    cache = CompileCache("unused")
+    key = cache.key(lang, interface)
+    monkeypatch.setattr(sys, "version_info", (3, sys.version_info[1] + 1, 0))
+    assert cache.key(lang, interface) != key
+
+
+def test_lazy_init(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Lazy package modules only import wrapper modules once one of their symbols is used."""
+    for source, module_path in compile_language(PythonLanguageProvider(), _interfaces(), lazy_init=True):
+        path = tmp_path.joinpath(*module_path[:-1], f"{module_path[-1]}.py")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "modules", dict(sys.modules))
+
+    package = importlib.import_module("pkg_a")
+    assert "pkg_a.other" not in sys.modules
+    assert "OTHER_METADATA" in dir(package)
+
+    assert package.OTHER_METADATA.name == "other"
+    assert "pkg_a.other" in sys.modules
+    assert callable(package.other)
+    assert "pkg_a.dummy_metadata" not in sys.modules
+
+    with pytest.raises(AttributeError):
+        package.missing
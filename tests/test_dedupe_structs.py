@@ -0,0 +1,101 @@
+"""Test sharing classes of structurally identical sub-commands."""
+
+import copy
+import re
+
+import styx.ir.core as ir
+import tests.utils.dummy_runner
+from styx.backend.generic.core import compile_language
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.fingerprint import struct_fingerprint, struct_fingerprints
+from tests.utils.dynmodule import BT_TYPE_FILE, BT_TYPE_NUMBER, boutiques_dummy, dynamic_module
+
+_OPTIONS = {
+    "id": "options",
+    "command-line": "[IN] [LEVEL]",
+    "inputs": [
+        {"id": "in_file", "name": "Input", "value-key": "[IN]", "type": BT_TYPE_FILE},
+        {
+            "id": "level",
+            "name": "Level",
+            "value-key": "[LEVEL]",
+            "type": BT_TYPE_NUMBER,
+            "integer": True,
+            "command-line-flag": "-l",
+            "optional": True,
+        },
+    ],
+    "output-files": [{"id": "out", "name": "Output", "path-template": "[IN].out"}],
+}
+
+
+def _descriptor(options_b: dict = _OPTIONS) -> dict:
+    return boutiques_dummy({
+        "command-line": "dummy [A] [B] [C]",
+        "inputs": [
+            {"id": "a", "name": "A", "value-key": "[A]", "type": copy.deepcopy(_OPTIONS)},
+            {"id": "b", "name": "B", "description": "Other", "value-key": "[B]", "type": copy.deepcopy(options_b)},
+            {
+                "id": "c",
+                "name": "C",
+                "value-key": "[C]",
+                "type": [copy.deepcopy(_OPTIONS), {"id": "other", "command-line": "other"}],
+                "list": True,
+            },
+        ],
+    })
+
+
+def _structs(interface: ir.Interface) -> list[ir.Param]:
+    return [p for p in interface.command.iter_params_recursively() if isinstance(p.body, ir.Param.Struct)]
+
+
+def _options_classes(source: str) -> int:
+    return len(re.findall(r"^class DummyOptions_*\d*:", source, re.MULTILINE))
+
+
+def _compile(descriptor: dict, dedupe_structs: bool) -> str:
+    interface = from_boutiques(descriptor, "no_package")
+    return next(compile_language(PythonLanguageProvider(), [interface], dedupe_structs=dedupe_structs))[0]
+
+
+def test_fingerprints() -> None:
+    """Fingerprints ignore IDs and the binding param, but not structure."""
+    interface = from_boutiques(_descriptor(), "no_package")
+    a, b, c_options, c_other = _structs(interface)
+    fingerprints = struct_fingerprints(interface.command)
+    assert fingerprints[a.base.id_] == fingerprints[b.base.id_] == fingerprints[c_options.base.id_]
+    assert fingerprints[a.base.id_] != fingerprints[c_other.base.id_]
+    assert fingerprints[a.base.id_] == struct_fingerprint(a)
+    assert interface.command.base.id_ in fingerprints
+
+    changed = copy.deepcopy(_OPTIONS)
+    changed["inputs"][1]["command-line-flag"] = "-m"
+    a, b, *_ = _structs(from_boutiques(_descriptor(changed), "no_package"))
+    assert struct_fingerprint(a) != struct_fingerprint(b)
+
+
+def test_shared_classes() -> None:
+    """Identical sub-commands share one class and behave as before."""
+    default = _compile(_descriptor(), dedupe_structs=False)
+    deduped = _compile(_descriptor(), dedupe_structs=True)
+    assert _options_classes(default) == 3
+    assert _options_classes(deduped) == 1
+    assert deduped.count("class DummyOptionsOutputs") == 1
+    assert len(deduped) < len(default)
+
+    for source in (default, deduped):
+        module = dynamic_module(source, "test_module")
+        runner = tests.utils.dummy_runner.DummyRunner()
+        options = module.DummyOptions(in_file="x.nii", level=2)
+        out = module.dummy(a=options, b=options, c=[options], runner=runner)
+        assert runner.last_cargs == ["dummy", "x.nii", "-l", "2", "x.nii", "-l", "2", "x.nii", "-l", "2"]
+        assert out.a.out == out.b.out == out.c[0].out == "x.nii.out"
+
+
+def test_different_structs_not_shared() -> None:
+    """Sub-commands that differ in any generated detail keep their own classes (`a` and `c` still share)."""
+    changed = copy.deepcopy(_OPTIONS)
+    changed["inputs"][1]["command-line-flag"] = "-m"
+    assert _options_classes(_compile(_descriptor(changed), dedupe_structs=True)) == 2
@@ -0,0 +1,32 @@
+"""Test splitting of Boutiques templates."""
+
+import random
+
+from styx.frontend.boutiques.core import _destruct_template_by_priority, destruct_template
+
+
+def test_destruct_template() -> None:
+    """Aliases are replaced and surrounding text is kept."""
+    assert destruct_template("hello x, I am y", {"x": 12, "y": 34}) == ["hello ", 12, ", I am ", 34]
+    assert destruct_template("[A][B]", {"[A]": 1, "[B]": 2}) == [1, 2]
+    assert destruct_template("[A]_[A].txt", {"[A]": 1}) == [1, "_", 1, ".txt"]
+    assert destruct_template("no aliases", {"[A]": 1}) == ["no aliases"]
+    assert destruct_template("", {"[A]": 1}) == [""]
+    assert destruct_template("abc", {}) == ["abc"]
+
+
+def test_destruct_template_overlapping_aliases() -> None:
+    """Overlapping aliases are resolved by lookup order."""
+    assert destruct_template("abc", {"bc": 1, "ab": 2}) == ["a", 1]
+    assert destruct_template("abc", {"ab": 2, "bc": 1}) == [2, "c"]
+    assert destruct_template("[X_Y]", {"[X": 1, "[X_Y]": 2}) == [1, "_Y]"]
+
+
+def test_destruct_template_matches_reference() -> None:
+    """Single-pass tokenizing is equivalent to splitting by alias priority."""
+    rng = random.Random(0)
+    for _ in range(2000):
+        aliases = ["".join(rng.choices("ab[]", k=rng.randint(1, 4))) for _ in range(rng.randint(1, 4))]
+        lookup = {alias: i for i, alias in enumerate(aliases)}
+        template = "".join(rng.choices("ab[]c", k=rng.randint(0, 16)))
+        assert destruct_template(template, lookup) == _destruct_template_by_priority(template, lookup)
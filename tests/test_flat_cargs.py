@@ -0,0 +1,94 @@
+"""Test flat cargs building."""
+
+from types import ModuleType
+
+import pytest
+
+import styx.ir.core as ir
+import tests.utils.dummy_runner
+from styx.backend.generic.core import compile_language
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.optimize import optimize
+from tests.utils.dynmodule import BT_TYPE_FILE, BT_TYPE_FLAG, BT_TYPE_NUMBER, boutiques_dummy, dynamic_module
+
+_SUB = {
+    "id": "sub",
+    "command-line": "sub [Y] [Z]",
+    "inputs": [
+        {"id": "y", "name": "Y", "value-key": "[Y]", "type": BT_TYPE_FILE, "command-line-flag": "-y"},
+        {"id": "z", "name": "Z", "value-key": "[Z]", "type": BT_TYPE_NUMBER, "list": True, "optional": True},
+    ],
+}
+_OTHER = {**_SUB, "id": "other", "command-line": "other [Y]", "inputs": _SUB["inputs"][:1]}
+
+_DESCRIPTOR = boutiques_dummy({
+    "command-line": "dummy [F] [A] [B] [C] [D]",
+    "inputs": [
+        {"id": "f", "name": "F", "value-key": "[F]", "type": BT_TYPE_FLAG, "command-line-flag": "--on"},
+        {"id": "a", "name": "A", "value-key": "[A]", "type": _SUB},
+        {"id": "b", "name": "B", "value-key": "[B]", "type": [_SUB, _OTHER], "optional": True},
+        {"id": "c", "name": "C", "value-key": "[C]", "type": _SUB, "list": True, "optional": True},
+        {"id": "d", "name": "D", "value-key": "[D]", "type": _OTHER, "list": True, "list-separator": ","},
+    ],
+})
+
+
+def _source(flat_cargs: bool) -> str:
+    interface = from_boutiques(_DESCRIPTOR, "no_package")
+    # Boutiques flags have no false value, give it one
+    flag = interface.command.body.groups[1].cargs[0].tokens[0]
+    assert isinstance(flag, ir.Param) and isinstance(flag.body, ir.Param.Bool)
+    flag.body.value_false = ["--off"]
+    # Compile like `styx build` does, i.e. with required groups collapsed
+    interface = optimize(interface)
+    return next(compile_language(PythonLanguageProvider(flat_cargs=flat_cargs), [interface]))[0]
+
+
+def _module(flat_cargs: bool) -> ModuleType:
+    return dynamic_module(_source(flat_cargs), "test_module")
+
+
+@pytest.mark.parametrize("flat_cargs", [False, True])
+def test_same_cargs(flat_cargs: bool) -> None:
+    module = _module(flat_cargs)
+    runner = tests.utils.dummy_runner.DummyRunner()
+    module.dummy(
+        f=True,
+        a=module.DummySub(y="a.nii", z=[1, 2]),
+        b=module.DummyOther(y="b.nii"),
+        c=[module.DummySub(y="c1.nii"), module.DummySub(y="c2.nii", z=[3])],
+        d=[module.DummyOther(y="d1.nii"), module.DummyOther(y="d2.nii")],
+        runner=runner,
+    )
+    assert runner.last_cargs == [
+        "dummy",
+        "--on",
+        *["sub", "-y", "a.nii", "1", "2"],
+        *["other", "-y", "b.nii"],
+        *["sub", "-y", "c1.nii", "sub", "-y", "c2.nii", "3"],
+        "other,-y,d1.nii,other,-y,d2.nii",
+    ]
+
+    module.dummy(f=False, a=module.DummySub(y="a.nii"), d=[], runner=runner)
+    assert runner.last_cargs == ["dummy", "--off", "sub", "-y", "a.nii", ""]
+
+
+def test_sub_command_run() -> None:
+    """Sub-commands extend a passed list or return a new one."""
+    module = _module(True)
+    runner = tests.utils.dummy_runner.DummyRunner()
+    sub = module.DummySub(y="a.nii", z=[1])
+    assert sub.run(runner) == ["sub", "-y", "a.nii", "1"]
+    cargs = ["x"]
+    assert sub.run(runner, cargs) is cargs
+    assert cargs == ["x", "sub", "-y", "a.nii", "1"]
+
+
+def test_collapsed_groups() -> None:
+    """Sub-commands in collapsed groups are passed the cargs list as well."""
+    source = _source(True)
+    assert "a.run(execution, cargs)" in source
+    assert "_s.run(execution, cargs)" in source
+    # Only joined lists of sub-commands still need their own lists
+    assert source.count("s.run(execution)") == 1
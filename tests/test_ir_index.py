@@ -0,0 +1,81 @@
+"""Test the flat param index and iterative param traversal."""
+
+import styx.ir.core as ir
+from styx.backend.generic.utils import struct_has_outputs
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.index import ParamIndex
+from tests.utils.dynmodule import BT_TYPE_FILE, BT_TYPE_NUMBER, boutiques_dummy
+
+_SUB = {
+    "id": "sub",
+    "command-line": "sub [Y]",
+    "inputs": [{"id": "y", "name": "Y", "value-key": "[Y]", "type": BT_TYPE_FILE}],
+}
+_SUB_WITH_OUTPUT = {**_SUB, "id": "sub_out", "output-files": [{"id": "out", "path-template": "[Y].out"}]}
+
+
+def _interface() -> ir.Interface:
+    return from_boutiques(
+        boutiques_dummy({
+            "command-line": "dummy [X] [A] [B]",
+            "inputs": [
+                {"id": "x", "name": "X", "value-key": "[X]", "type": BT_TYPE_NUMBER},
+                {"id": "a", "name": "A", "value-key": "[A]", "type": _SUB},
+                {"id": "b", "name": "B", "value-key": "[B]", "type": [_SUB, _SUB_WITH_OUTPUT]},
+            ],
+            "output-files": [],
+        }),
+        "dummy",
+    )
+
+
+def _recursive(param: ir.Param) -> list[ir.Param]:
+    """Reference implementation of `iter_params_recursively`."""
+    return [param for child in param.iter_children() for param in [child, *_recursive(child)]]
+
+
+def _nested(depth: int) -> ir.Param:
+    param = ir.Param.trusted(base=ir.Param.Base(id_=depth, name=f"p{depth}"), body=ir.Param.String())
+    for id_ in range(depth - 1, -1, -1):
+        param = ir.Param.trusted(
+            base=ir.Param.Base(id_=id_, name=f"p{id_}"),
+            body=ir.Param.Struct(name=f"s{id_}", groups=[ir.ConditionalGroup(cargs=[ir.Carg(tokens=[param])])]),
+        )
+    return param
+
+
+def test_iter_params_recursively_order() -> None:
+    command = _interface().command
+    assert list(command.iter_params_recursively()) == _recursive(command)
+    assert list(command.iter_params_recursively(False)) == [command, *_recursive(command)]
+
+
+def test_param_index() -> None:
+    interface = _interface()
+    index = interface.param_index()
+    assert index is interface.param_index()
+    command = interface.command
+    assert list(index.params.values()) == [command, *command.iter_params_recursively()]
+    assert len(index) == 9
+
+    by_name = {param.base.name: param.base.id_ for param in index.params.values()}
+    assert index.parent[command.base.id_] is None
+    assert index.parent[by_name["x"]] == command.base.id_
+    assert index.parent[by_name["sub_out"]] == by_name["b"]
+    assert index.depth[by_name["sub_out"]] == 2
+    assert index.max_depth() == 3
+
+    for param in index.params.values():
+        if isinstance(param.body, ir.Param.Struct):
+            assert index.has_outputs[param.base.id_] == struct_has_outputs(param)
+    assert index.has_outputs[by_name["b"]]
+    assert not index.has_outputs[by_name["a"]]
+
+
+def test_deep_nesting() -> None:
+    """Deeply nested params do not hit the recursion limit."""
+    root = _nested(5000)
+    assert sum(1 for _ in root.iter_params_recursively()) == 5000
+    index = ParamIndex(root)
+    assert index.max_depth() == 5000
+    assert index.parent[5000] == 4999
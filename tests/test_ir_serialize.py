@@ -0,0 +1,124 @@
+"""Test binary serialization of IR interfaces."""
+
+import io
+
+import pytest
+
+import styx.ir.core as ir
+from styx.backend.generic.core import compile_language
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from styx.ir import serialize
+from tests.utils.dynmodule import BT_TYPE_FILE, BT_TYPE_FLAG, BT_TYPE_NUMBER, BT_TYPE_STRING, boutiques_dummy
+
+
+def _interface() -> ir.Interface:
+    subcommand = {"id": "sub", "command-line": "sub [F]", "inputs": [{"id": "f", "value-key": "[F]", "type": "File"}]}
+    return from_boutiques(
+        boutiques_dummy({
+            "command-line": "dummy [A] [B] [C] [D] [E] [S] [U]",
+            "author": "Someone",
+            "inputs": [
+                {"id": "a", "value-key": "[A]", "type": BT_TYPE_FILE, "optional": True},
+                {"id": "b", "value-key": "[B]", "type": BT_TYPE_NUMBER, "integer": True, "minimum": 0, "list": True},
+                {"id": "c", "value-key": "[C]", "type": BT_TYPE_NUMBER, "default-value": 1.5, "optional": True},
+                {"id": "d", "value-key": "[D]", "type": BT_TYPE_STRING, "value-choices": ["x", "y"]},
+                {"id": "e", "value-key": "[E]", "type": BT_TYPE_FLAG, "command-line-flag": "-e"},
+                {"id": "s", "value-key": "[S]", "type": subcommand},
+                {"id": "u", "value-key": "[U]", "type": [subcommand, {**subcommand, "id": "other"}], "list": True},
+            ],
+            "output-files": [
+                {
+                    "id": "out_a",
+                    "name": "Output",
+                    "path-template": "[A]_out.nii.gz",
+                    "path-template-stripped-extensions": [".nii.gz"],
+                }
+            ],
+        }),
+        "dummy",
+    )
+
+
+def _slots(cls: type) -> list[str]:
+    return [slot for base in cls.__mro__ for slot in getattr(base, "__slots__", ())]
+
+
+def _assert_same(a: object, b: object, path: str = "interface") -> None:
+    """Compare IR objects field by field (all slots of the IR classes, independent of the encoder)."""
+    assert type(a) is type(b), path
+    if isinstance(a, (list, tuple)):
+        assert isinstance(b, (list, tuple))
+        assert len(a) == len(b), path
+        for index, (item_a, item_b) in enumerate(zip(a, b)):
+            _assert_same(item_a, item_b, f"{path}[{index}]")
+    elif slots := _slots(type(a)):
+        for slot in slots:
+            _assert_same(getattr(a, slot), getattr(b, slot), f"{path}.{slot}")
+    else:
+        assert a == b, path
+
+
+def test_round_trip() -> None:
+    """Serialized interfaces are equal and compile to the same code."""
+    interface = _interface()
+    data = serialize.dumps(interface)
+    loaded = serialize.loads(data)
+
+    _assert_same(loaded, interface)
+    assert loaded.uid == interface.uid
+    assert loaded.command.base.docs.authors == ["Someone"]
+    output = loaded.command.base.outputs[0]
+    ref = output.tokens[0]
+    assert isinstance(ref, ir.OutputParamReference)
+    assert ref.file_remove_suffixes == [".nii.gz"]
+    assert any(p.base.id_ == ref.ref_id and p.base.name == "a" for p in loaded.command.iter_params_recursively())
+    assert list(compile_language(PythonLanguageProvider(), [loaded])) == list(
+        compile_language(PythonLanguageProvider(), [interface])
+    )
+
+
+def test_stream() -> None:
+    """Corpora are written and lazily read as streams."""
+    interfaces = [
+        _interface(),
+        from_boutiques(boutiques_dummy({"name": "other", "stdout-output": {"id": "out"}}), "dummy"),
+    ]
+    stream = io.BytesIO()
+    assert serialize.dump(interfaces, stream) == 2
+
+    stream.seek(0)
+    loaded = list(serialize.load(stream))
+    _assert_same(loaded, interfaces)
+    assert loaded[1].stdout_as_string_output is not None
+
+    with pytest.raises(ValueError, match="Truncated"):
+        list(serialize.load(io.BytesIO(stream.getvalue()[:-1])))
+
+
+def test_compare_all_fields() -> None:
+    """The comparison catches changes the encoder does not know about."""
+    interface = _interface()
+    loaded = serialize.loads(serialize.dumps(interface))
+    loaded.command.base.docs.urls = ["https://example.com"]
+    with pytest.raises(AssertionError, match="interface.command.base.docs.urls"):
+        _assert_same(loaded, interface)
+
+
+def test_version_mismatch() -> None:
+    """Data of other formats is rejected."""
+    data = serialize.dumps(_interface())
+    with pytest.raises(ValueError, match="format version"):
+        serialize.loads(data[:6] + b"\xff\xff" + data[8:])
+    with pytest.raises(ValueError, match="Not a serialized"):
+        serialize.loads(b"{}")
+
+
+def test_kind_mismatch() -> None:
+    """Single interfaces and streams are not mistaken for each other."""
+    stream = io.BytesIO()
+    serialize.dump([_interface()], stream)
+    with pytest.raises(ValueError, match="stream of interfaces"):
+        serialize.loads(stream.getvalue())
+    with pytest.raises(ValueError, match="single interface"):
+        list(serialize.load(io.BytesIO(serialize.dumps(_interface()))))
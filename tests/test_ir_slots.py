@@ -0,0 +1,36 @@
+"""Test that IR nodes are compact (no per-instance `__dict__`)."""
+
+import pickle
+
+import styx.ir.core as ir
+from styx.frontend.boutiques import from_boutiques
+from tests.utils.dynmodule import BT_TYPE_NUMBER, boutiques_dummy
+
+
+def test_ir_nodes_slotted() -> None:
+    """All IR nodes of an interface use slots and survive pickling."""
+    interface = from_boutiques(
+        boutiques_dummy({
+            "command-line": "dummy [X]",
+            "inputs": [{"id": "x", "value-key": "[X]", "type": BT_TYPE_NUMBER, "list": True}],
+        }),
+        "dummy",
+    )
+    params = [interface.command, *interface.command.iter_params_recursively()]
+    groups = interface.command.body.groups
+    nodes = [
+        interface,
+        interface.package,
+        *params,
+        *(param.base for param in params),
+        *(param.body for param in params),
+        *(param.list_ for param in params if param.list_),
+        *groups,
+        *(carg for group in groups for carg in group.cargs),
+        *interface.command.base.outputs,
+        interface.command.base.docs,
+    ]
+    for node in nodes:
+        assert not hasattr(node, "__dict__"), type(node)
+
+    assert isinstance(pickle.loads(pickle.dumps(interface)), ir.Interface)
@@ -0,0 +1,74 @@
+"""Test interface and corpus statistics."""
+
+import pytest
+
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.stats import COLUMNS, CorpusStats, interface_stats, stats
+from tests.utils.dynmodule import BT_TYPE_FILE, BT_TYPE_NUMBER, BT_TYPE_STRING, boutiques_dummy
+
+_SUB = {
+    "id": "sub",
+    "command-line": "sub [Y]",
+    "inputs": [{"id": "y", "name": "Y", "value-key": "[Y]", "type": BT_TYPE_FILE, "optional": True}],
+    "output-files": [{"id": "out", "path-template": "out.txt"}],
+}
+
+
+def _descriptor(name: str, num_inputs: int) -> dict:
+    return boutiques_dummy({
+        "name": name,
+        "command-line": " ".join(f"[X{i}]" for i in range(num_inputs)) + " [A] [B]",
+        "inputs": [
+            *(
+                {"id": f"x{i}", "name": "X", "value-key": f"[X{i}]", "type": BT_TYPE_NUMBER, "list": True}
+                for i in range(num_inputs)
+            ),
+            {"id": "a", "name": "A", "value-key": "[A]", "type": _SUB, "optional": True},
+            {"id": "b", "name": "B", "value-key": "[B]", "type": [_SUB, {**_SUB, "id": "other"}], "list": True},
+        ],
+    })
+
+
+def test_interface_stats() -> None:
+    interface = from_boutiques(_descriptor("tool", 2), "pkg")
+    assert interface_stats(interface) == {
+        "num_expressions": 10,  # command, x0, x1, a, y, b, sub, y, other, y
+        "num_params": 5,
+        "mccabe": 11,  # x0 + x1 + (a: 2 * y) + (b: 2 * (sub + other)) - 4 + 1
+        "max_depth": 3,
+        "num_structs": 4,
+        "num_unions": 1,
+        "num_lists": 3,
+        "num_outputs": 4,
+    }
+    assert stats(interface) == {"name": "tool", "num_expressions": 10, "num_params": 5, "mccabe": 11}
+
+
+def test_corpus_stats() -> None:
+    corpus = CorpusStats(from_boutiques(_descriptor(f"tool_{i}", i), "pkg") for i in range(5))
+    assert len(corpus) == 5
+    assert set(corpus.columns) == set(COLUMNS)
+    assert list(corpus.columns["num_params"]) == [3, 4, 5, 6, 7]
+    assert corpus.row(2)["num_lists"] == 3
+
+    assert corpus.percentile("num_params", 0) == 3
+    assert corpus.percentile("num_params", 50) == 5
+    assert corpus.percentile("num_params", 90) == pytest.approx(6.6)
+    assert corpus.percentiles("num_params", [25, 100]) == [4, 7]
+    assert corpus.top("num_params", 2) == [("pkg/tool_4", 7), ("pkg/tool_3", 6)]
+
+    with pytest.raises(ValueError):
+        corpus.percentile("num_params", 101)
+    with pytest.raises(ValueError):
+        CorpusStats().percentile("num_params", 50)
+
+
+def test_string_params_counted() -> None:
+    interface = from_boutiques(
+        boutiques_dummy({
+            "command-line": "dummy [S]",
+            "inputs": [{"id": "s", "name": "S", "value-key": "[S]", "type": BT_TYPE_STRING, "optional": True}],
+        }),
+        "pkg",
+    )
+    assert interface_stats(interface)["mccabe"] == 2
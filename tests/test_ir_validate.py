@@ -0,0 +1,63 @@
+"""Test trusted param construction and interface validation."""
+
+import pytest
+
+import styx.ir.core as ir
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.validate import validate
+from tests.utils.dynmodule import BT_TYPE_NUMBER, boutiques_dummy
+
+
+def test_trusted_param() -> None:
+    """Trusted params skip checks until validated."""
+    base = ir.Param.Base(id_=1, name="x")
+    with pytest.raises(ValueError):
+        ir.Param(base=base, body=ir.Param.Int(min_value=2, max_value=1))
+
+    param = ir.Param.trusted(base=base, body=ir.Param.Int(min_value=2, max_value=1))
+    assert param.body.min_value == 2
+    with pytest.raises(ValueError):
+        param.validate()
+
+
+def test_validate_interface() -> None:
+    """Invalid descriptors are only rejected when validated."""
+    descriptor = boutiques_dummy({
+        "command-line": "dummy [X]",
+        "inputs": [{"id": "x", "value-key": "[X]", "type": BT_TYPE_NUMBER, "minimum": 2, "maximum": 1}],
+    })
+    interface = from_boutiques(descriptor, "dummy", validate=False)
+    with pytest.raises(ValueError) as e:
+        validate(interface)
+    assert "In parameter 'x'" in "".join(e.value.__notes__)
+    with pytest.raises(ValueError):
+        from_boutiques(descriptor, "dummy")
+
+
+def test_validate_duplicate_ids() -> None:
+    """Param and output IDs must be unique."""
+    interface = from_boutiques(boutiques_dummy({}), "dummy")
+    assert validate(interface) is interface
+
+    interface.command.base.outputs[0].id_ = interface.command.base.id_
+    with pytest.raises(ValueError, match="Duplicate id"):
+        validate(interface)
+
+
+def test_validate_type_errors() -> None:
+    """Malformed trusted params are reported as ValueError (like constraint violations)."""
+    interface = from_boutiques(
+        boutiques_dummy({
+            "command-line": "dummy [X]",
+            "inputs": [{"id": "x", "value-key": "[X]", "type": BT_TYPE_NUMBER}],
+        }),
+        "dummy",
+    )
+    param = next(interface.command.iter_params_recursively())
+    param.nullable = "yes"  # type: ignore[assignment]
+    with pytest.raises(TypeError):
+        param.validate()
+    with pytest.raises(ValueError, match="nullable must be a boolean") as e:
+        validate(interface)
+    assert isinstance(e.value.__cause__, TypeError)
+    assert "In parameter 'x'" in "".join(e.value.__notes__)
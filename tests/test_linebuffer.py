@@ -0,0 +1,89 @@
+"""Test the codegen line buffer module."""
+
+import io
+
+from styx.backend.generic.linebuffer import LineBuilder, blank_before, collapse, concat, indent
+
+
+def test_concat() -> None:
+    """Test concatenating LineBuffers."""
+    assert concat([["a"], [], ["b", "c"]]) == ["a", "b", "c"]
+    assert concat([["a"], [], ["b", "c"]], [""]) == ["a", "", "", "b", "c"]
+    assert concat([]) == []
+
+
+def test_line_builder() -> None:
+    """Test that the line builder produces the same text as the LineBuffer helpers."""
+    expected = [
+        "def foo(",
+        *indent(["x: int,", "y: int,"]),
+        ") -> None:",
+        *indent([
+            '"""',
+            "",
+            "Args:",
+            *indent(["x: The x.", *indent(["continued."])]),
+            '"""',
+            *blank_before(["pass"]),
+        ]),
+    ]
+
+    buf = LineBuilder()
+    buf.append("def foo(")
+    with buf.indent():
+        buf.extend(["x: int,", "y: int,"])
+    buf.append(") -> None:")
+    with buf.indent():
+        buf.extend(['"""', ""])
+        buf.append("Args:")
+        with buf.indent():
+            buf.append("x: The x.")
+            with buf.indent():
+                buf.extend(iter(["continued."]))
+        buf.append('"""')
+        buf.blank()
+        buf.append("pass")
+    assert buf.level == 0
+
+    assert buf.lines() == expected
+    assert buf.collapse() == collapse(expected)
+    stream = io.StringIO()
+    buf.write(stream)
+    assert stream.getvalue() == collapse(expected)
+
+
+def test_line_builder_leading_indent() -> None:
+    """Test builders starting with indented or blank lines."""
+    buf = LineBuilder()
+    assert buf.lines() == []
+    assert buf.collapse() == ""
+    with buf.indent(2):
+        buf.extend(["a", ""])
+    buf.blank(2)
+    assert buf.lines() == [*indent(["a", ""], 2), "", ""]
+    assert buf.collapse() == collapse([*indent(["a", ""], 2), "", ""])
+
+
+def test_line_builder_flush() -> None:
+    """Flushed lines are written to the stream and dropped, the text stays the same."""
+    stream = io.StringIO()
+    buf = LineBuilder(stream)
+    buf.flush()
+    with buf.indent():
+        buf.append("a")
+    buf.flush()
+    assert stream.getvalue() == "    a"
+    assert buf.collapse() == ""
+    with buf.indent():
+        buf.extend(["b", ""])
+        buf.flush()
+        buf.append("c")
+    buf.blank()
+    buf.flush()
+    buf.flush()
+    assert stream.getvalue() == collapse([*indent(["a", "b", "", "c"]), ""])
+
+    buf = LineBuilder()
+    buf.append("a")
+    buf.flush()
+    assert buf.collapse() == "a"
@@ -0,0 +1,44 @@
+"""Test the command line interface."""
+
+import json
+import pathlib
+
+import pytest
+
+from styx.main import main
+from tests.utils.dynmodule import boutiques_dummy
+
+
+def _write_descriptors(root: pathlib.Path) -> None:
+    (root / "pkg").mkdir(parents=True)
+    for name in ("tool_a", "tool_b"):
+        (root / "pkg" / f"{name}.json").write_text(json.dumps(boutiques_dummy({"name": name})))
+
+
+def test_build(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture) -> None:
+    """Modules are written once and left untouched if unchanged."""
+    _write_descriptors(tmp_path / "descriptors")
+    args = ["build", str(tmp_path / "descriptors"), str(tmp_path / "out"), "--cache-dir", str(tmp_path / "cache")]
+
+    assert main(args) == 0
+    assert "Wrote 3 modules (0 unchanged)" in capsys.readouterr().out
+    modules = sorted(p.relative_to(tmp_path / "out").as_posix() for p in (tmp_path / "out").rglob("*.py"))
+    assert modules == ["pkg/__init__.py", "pkg/tool_a.py", "pkg/tool_b.py"]
+
+    assert main([*args, "-j", "2"]) == 0
+    output = capsys.readouterr().out
+    assert "Wrote 0 modules (3 unchanged)" in output
+    assert "2 hits, 0 misses" in output
+
+    tool_a = tmp_path / "out" / "pkg" / "tool_a.py"
+    source = tool_a.read_text()
+    tool_a.write_text("")
+    assert main(args) == 0
+    assert "Wrote 1 module (2 unchanged)" in capsys.readouterr().out
+    assert tool_a.read_text() == source
+
+
+def test_build_missing_input(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture) -> None:
+    """Missing inputs are reported as errors."""
+    assert main(["build", str(tmp_path / "missing"), str(tmp_path / "out")]) == 1
+    assert "missing" in capsys.readouterr().err
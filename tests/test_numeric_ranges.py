@@ -135,3 +135,146 @@ def test_outside_range() -> None:
 
     with pytest.raises(ValueError):
         test_module.dummy(runner=dummy_runner, x=4)
+
+
+def test_sub_command_range() -> None:
+    """Sub-command params are range checked via their attributes."""
+    model = boutiques_dummy({
+        "command-line": "dummy [A]",
+        "inputs": [
+            {
+                "id": "a",
+                "name": "A",
+                "value-key": "[A]",
+                "type": {
+                    "id": "sub",
+                    "command-line": "sub [X]",
+                    "inputs": [
+                        {
+                            "id": "x",
+                            "name": "The x",
+                            "value-key": "[X]",
+                            "type": BT_TYPE_NUMBER,
+                            "list": True,
+                            "minimum": 5,
+                            "maximum": 10,
+                            "integer": True,
+                        }
+                    ],
+                },
+            }
+        ],
+    })
+
+    compiled_module = boutiques2python(model)
+
+    test_module = dynamic_module(compiled_module, "test_module")
+    dummy_runner = tests.utils.dummy_runner.DummyRunner()
+    test_module.dummy(runner=dummy_runner, a=test_module.DummySub(x=[5, 10]))
+    assert dummy_runner.last_cargs == ["dummy", "sub", "5", "10"]
+
+    with pytest.raises(ValueError, match="'x'"):
+        test_module.dummy(runner=dummy_runner, a=test_module.DummySub(x=[5, 11]))
+
+
+class _Array(list):
+    """Stand-in for a NumPy array (scans itself natively)."""
+
+    scans = 0
+
+    def min(self) -> float:
+        _Array.scans += 1
+        return min(iter(self))
+
+    def max(self) -> float:
+        _Array.scans += 1
+        return max(iter(self))
+
+
+def test_list_range() -> None:
+    """Numeric lists are range checked in one helper, naming the offending element."""
+    model = boutiques_dummy({
+        "command-line": "dummy [X] [Y]",
+        "inputs": [
+            {
+                "id": "x",
+                "name": "The x",
+                "value-key": "[X]",
+                "type": BT_TYPE_NUMBER,
+                "list": True,
+                "minimum": 5,
+                "maximum": 10,
+            },
+            {
+                "id": "y",
+                "name": "The y",
+                "value-key": "[Y]",
+                "type": BT_TYPE_NUMBER,
+                "list": True,
+                "optional": True,
+                "max-list-entries": 2,
+                "maximum": 3,
+            },
+        ],
+    })
+
+    compiled_module = boutiques2python(model)
+    assert compiled_module.count("def _check_list_bounds(") == 1
+
+    test_module = dynamic_module(compiled_module, "test_module")
+    dummy_runner = tests.utils.dummy_runner.DummyRunner()
+    test_module.dummy(runner=dummy_runner, x=[])
+    test_module.dummy(runner=dummy_runner, x=[5, 10], y=[3])
+    assert dummy_runner.last_cargs == ["dummy", "5", "10", "3"]
+
+    with pytest.raises(ValueError, match="'x' must be between 5 <= x <= 10 but 11 is not"):
+        test_module.dummy(runner=dummy_runner, x=[5, 11, 12])
+    with pytest.raises(ValueError, match="'x' must be between 5 <= x <= 10 but 4 is not"):
+        test_module.dummy(runner=dummy_runner, x=[4])
+    with pytest.raises(ValueError, match="'y' must be less than x <= 3 but 4 is not"):
+        test_module.dummy(runner=dummy_runner, x=[5], y=[4])
+    with pytest.raises(ValueError, match="Length of 'y'"):
+        test_module.dummy(runner=dummy_runner, x=[5], y=[1, 2, 3])
+
+    test_module.dummy(runner=dummy_runner, x=_Array([5, 6]))
+    assert _Array.scans == 2
+    with pytest.raises(ValueError, match="but 4 is not"):
+        test_module.dummy(runner=dummy_runner, x=_Array([4, 6]))
+
+
+def test_skip_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Constraint checks (also of sub-commands) are skipped if STYX_SKIP_VALIDATION is set on import."""
+    model = boutiques_dummy({
+        "command-line": "dummy [X] [A]",
+        "inputs": [
+            {"id": "x", "name": "The x", "value-key": "[X]", "type": BT_TYPE_NUMBER, "maximum": 5, "integer": True},
+            {
+                "id": "a",
+                "name": "A",
+                "value-key": "[A]",
+                "type": {
+                    "id": "sub",
+                    "command-line": "sub [Y]",
+                    "inputs": [
+                        {"id": "y", "name": "Y", "value-key": "[Y]", "type": BT_TYPE_NUMBER, "minimum": 0},
+                    ],
+                },
+            },
+        ],
+    })
+    compiled_module = boutiques2python(model)
+    # Imported once (for both structs), keeping the standard library imports sorted
+    assert "import dataclasses\nimport os\nimport pathlib\nimport typing\n\nfrom styxdefs import *\n" in compiled_module
+    assert compiled_module.count("import os\n") == 1
+    dummy_runner = tests.utils.dummy_runner.DummyRunner()
+
+    test_module = dynamic_module(compiled_module, "test_module")
+    with pytest.raises(ValueError):
+        test_module.dummy(runner=dummy_runner, x=6, a=test_module.DummySub(y=0))
+    with pytest.raises(ValueError):
+        test_module.dummy(runner=dummy_runner, x=5, a=test_module.DummySub(y=-1))
+
+    monkeypatch.setenv("STYX_SKIP_VALIDATION", "1")
+    test_module = dynamic_module(compiled_module, "test_module")
+    test_module.dummy(runner=dummy_runner, x=6, a=test_module.DummySub(y=-1))
+    assert dummy_runner.last_cargs == ["dummy", "6", "sub", "-1"]
@@ -0,0 +1,147 @@
+"""Test IR optimization passes."""
+
+import pytest
+
+import styx.ir.core as ir
+import tests.utils.dummy_runner
+from styx.backend.generic.core import compile_language
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.optimize import PASSES, optimize
+from tests.utils.dynmodule import (
+    BT_TYPE_FILE,
+    BT_TYPE_FLAG,
+    BT_TYPE_NUMBER,
+    BT_TYPE_STRING,
+    boutiques_dummy,
+    dynamic_module,
+)
+
+_DESCRIPTOR = boutiques_dummy({
+    "command-line": "dummy sub --mode fast [A] [B] [C] lit [D] [E] [F] end",
+    "inputs": [
+        {"id": "a", "name": "A", "value-key": "[A]", "type": BT_TYPE_FILE},
+        {
+            "id": "b",
+            "name": "B",
+            "value-key": "[B]",
+            "type": BT_TYPE_NUMBER,
+            "integer": True,
+            "command-line-flag": "-b",
+            "command-line-flag-separator": "=",
+        },
+        {"id": "c", "name": "C", "value-key": "[C]", "type": BT_TYPE_FLAG, "command-line-flag": "-c", "optional": True},
+        {
+            "id": "d",
+            "name": "D",
+            "value-key": "[D]",
+            "type": BT_TYPE_STRING,
+            "list": True,
+            "command-line-flag": "-d",
+        },
+        {
+            "id": "e",
+            "name": "E",
+            "value-key": "[E]",
+            "type": BT_TYPE_STRING,
+            "command-line-flag": "-e",
+            "optional": True,
+        },
+        {
+            "id": "f",
+            "name": "F",
+            "value-key": "[F]",
+            "type": {
+                "id": "sub",
+                "command-line": "sub [X]",
+                "inputs": [{"id": "x", "name": "X", "value-key": "[X]", "type": BT_TYPE_STRING}],
+            },
+        },
+    ],
+})
+
+_DESCRIPTOR_PREFIXED = boutiques_dummy({
+    "command-line": "dummy pre[A]",
+    "inputs": [
+        {
+            "id": "a",
+            "name": "A",
+            "value-key": "[A]",
+            "type": BT_TYPE_STRING,
+            "command-line-flag": "-a",
+            "command-line-flag-separator": "=",
+        }
+    ],
+})
+
+_PASS_DESCRIPTORS = {
+    "merge_string_tokens": _DESCRIPTOR_PREFIXED,
+    "collapse_unconditional_groups": _DESCRIPTOR,
+}
+"""Descriptors whose generated code each pass changes."""
+
+_ARGUMENTS = [
+    {"a": "in.nii", "b": 1, "c": False, "d": [], "e": None},
+    {"a": "in.nii", "b": 2, "c": True, "d": ["x", "y"], "e": "z"},
+]
+
+
+def _groups(interface: ir.Interface) -> list[list[list[str | ir.Param]]]:
+    return [[carg.tokens for carg in group.cargs] for group in interface.command.body.groups]
+
+
+def _compile(descriptor: dict, passes: list[str]) -> str:
+    return next(
+        compile_language(PythonLanguageProvider(), [optimize(from_boutiques(descriptor, "no_package"), passes)])
+    )[0]
+
+
+def _num_cargs_statements(source: str) -> int:
+    return source.count("cargs.append(") + source.count("cargs.extend(")
+
+
+def test_collapse_unconditional_groups() -> None:
+    interface = optimize(from_boutiques(_DESCRIPTOR, "no_package"), ["collapse_unconditional_groups"])
+    groups = _groups(interface)
+    # Literals and required params are merged, optional flag [C] and string [E] keep their own groups
+    assert [len(group) for group in groups] == [6, 1, 3, 2, 2]
+    # Each group is added by a single statement
+    collapsed = _num_cargs_statements(_compile(_DESCRIPTOR, ["collapse_unconditional_groups"]))
+    assert collapsed < _num_cargs_statements(_compile(_DESCRIPTOR, []))
+
+
+@pytest.mark.parametrize("name", PASSES)
+def test_pass_changes_code(name: str) -> None:
+    """Every pass changes the generated code (passes without effect do not belong in the registry)."""
+    descriptor = _PASS_DESCRIPTORS[name]
+    assert _compile(descriptor, [name]) != _compile(descriptor, [])
+
+
+def test_merge_string_tokens() -> None:
+    interface = optimize(from_boutiques(_DESCRIPTOR_PREFIXED, "no_package"), ["merge_string_tokens"])
+    assert _groups(interface)[1][0][0] == "pre-a="
+    assert '"pre-a=" + a' in _compile(_DESCRIPTOR_PREFIXED, ["merge_string_tokens"])
+
+
+def test_unknown_pass() -> None:
+    with pytest.raises(ValueError, match="Unknown optimization passes: foo"):
+        optimize(from_boutiques(_DESCRIPTOR, "no_package"), ["foo"])
+
+
+@pytest.mark.parametrize(
+    "passes",
+    [[], *([name] for name in PASSES), list(PASSES)],
+    ids=["none", *PASSES, "all"],
+)
+def test_same_cargs(passes: list[str]) -> None:
+    """Optimized wrappers build the same command line arguments."""
+    expected = [
+        ["dummy", "sub", "--mode", "fast", "in.nii", "-b=1", "lit", "-d", "sub", "x", "end"],
+        ["dummy", "sub", "--mode", "fast", "in.nii", "-b=2", "-c", "lit", "-d", "x", "y", "-e", "z", "sub", "x", "end"],
+    ]
+    interface = optimize(from_boutiques(_DESCRIPTOR, "no_package"), passes)
+    module = dynamic_module(next(compile_language(PythonLanguageProvider(), [interface]))[0], "test_module")
+    for arguments, cargs in zip(_ARGUMENTS, expected):
+        runner = tests.utils.dummy_runner.DummyRunner()
+        module.dummy(**arguments, f=module.DummySub(x="x"), runner=runner)
+        assert runner.last_cargs == cargs
@@ -108,3 +108,44 @@ def test_output_file_with_template_and_stripped_extensions() -> None:
     assert dummy_runner.last_cargs == ["dummy", "in.txt"]
     assert out is not None
     assert out.out == "out-in.png"
+
+
+def test_sub_command_outputs() -> None:
+    """Test outputs of nested sub-commands, where only some union alternatives have outputs."""
+    sub = {
+        "id": "sub",
+        "command-line": "sub [Y]",
+        "inputs": [{"id": "y", "name": "The y", "value-key": "[Y]", "type": BT_TYPE_FILE}],
+    }
+    sub_out = {**sub, "id": "sub_out", "output-files": [{"id": "out", "name": "The out", "path-template": "[Y].out"}]}
+    nested = {
+        "id": "nested",
+        "command-line": "nested [Z]",
+        "inputs": [{"id": "z", "name": "The z", "value-key": "[Z]", "type": sub_out}],
+    }
+    model = boutiques_dummy({
+        "command-line": "dummy [A] [B] [C]",
+        "inputs": [
+            {"id": "a", "name": "The a", "value-key": "[A]", "type": sub},
+            {"id": "b", "name": "The b", "value-key": "[B]", "type": [sub, sub_out]},
+            {"id": "c", "name": "The c", "value-key": "[C]", "type": nested},
+        ],
+    })
+
+    compiled_module = boutiques2python(model)
+
+    test_module = dynamic_module(compiled_module, "test_module")
+    assert "a" not in test_module.DummyOutputs._fields
+    assert not hasattr(test_module.DummySub, "outputs")
+
+    dummy_runner = tests.utils.dummy_runner.DummyRunner()
+    out = test_module.dummy(
+        runner=dummy_runner,
+        a=test_module.DummySub(y="a.txt"),
+        b=test_module.DummySubOut(y="b.txt"),
+        c=test_module.DummyNested(z=test_module.DummySubOut(y="c.txt")),
+    )
+
+    assert dummy_runner.last_cargs == ["dummy", "sub", "a.txt", "sub", "b.txt", "nested", "sub", "c.txt"]
+    assert out.b.out == "b.txt.out"
+    assert out.c.z.out == "c.txt.out"
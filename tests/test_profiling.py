@@ -0,0 +1,56 @@
+"""Test the compiler phase profiler."""
+
+import pytest
+
+from styx.backend.generic.core import compile_language
+from styx.backend.python.languageprovider import PythonLanguageProvider
+from styx.frontend.boutiques import from_boutiques
+from styx.ir.optimize import optimize
+from styx.profiling import Profiler
+from tests.utils.dynmodule import BT_TYPE_NUMBER, boutiques_dummy
+
+
+def _descriptor(name: str, num_subcommands: int) -> dict:
+    subcommand = {"id": "sub", "command-line": "sub [X]", "inputs": [{"id": "x", "value-key": "[X]", "type": "File"}]}
+    return boutiques_dummy({
+        "name": name,
+        "command-line": " ".join(f"[S{i}]" for i in range(num_subcommands)) + " [N]",
+        "inputs": [
+            *({"id": f"s{i}", "value-key": f"[S{i}]", "type": subcommand} for i in range(num_subcommands)),
+            {"id": "n", "value-key": "[N]", "type": BT_TYPE_NUMBER},
+        ],
+    })
+
+
+def test_profiler() -> None:
+    """Phases are recorded per interface and sorted by time."""
+    with Profiler(trace_allocations=True) as profiler:
+        interfaces = [optimize(from_boutiques(_descriptor(name, n), "pkg")) for name, n in (("small", 0), ("big", 30))]
+        modules = list(compile_language(PythonLanguageProvider(), interfaces))
+
+    assert len(modules) == 3
+    assert [subject for subject, _ in profiler.slowest()][:2] == ["pkg/big", "pkg/small"]
+    big = profiler.subjects["pkg/big"]
+    assert big.phases["from_boutiques"].calls == 1
+    assert big.phases["lookup_param"].calls == 1
+    assert big.phases["compile_struct"].calls == 31
+    assert big.phases["generate_module"].calls == 1
+    assert big.allocated > 0
+    assert big.seconds >= big.phases["compile_interface"].seconds > big.phases["lookup_param"].seconds
+
+    report = profiler.report(top=1)
+    assert "compile_cargs_building" in report
+    assert "pkg/big" in report
+    assert "pkg/small" not in report
+
+
+def test_profiler_inactive() -> None:
+    """Nothing is recorded without an active profiler and profilers do not nest."""
+    profiler = Profiler()
+    from_boutiques(_descriptor("small", 0), "pkg")
+    assert not profiler.subjects
+
+    with profiler:
+        with pytest.raises(RuntimeError):
+            with Profiler():
+                pass
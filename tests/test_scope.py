@@ -71,3 +71,78 @@ def test_scope_parent() -> None:
         child.add_or_die("foo")
     with pytest.raises(ValueError):
         parent.add_or_die("foo")
+
+
+def test_scope_frozen() -> None:
+    """Test that frozen scopes reject new symbols but accept children."""
+    parent = Scope(PythonLanguageProvider())
+    parent.add_or_die("foo")
+    assert parent.freeze() is parent
+    assert parent.frozen
+
+    with pytest.raises(ValueError):
+        parent.add_or_die("bar")
+    with pytest.raises(ValueError):
+        parent.add_or_dodge("bar")
+
+    child = Scope(parent)
+    assert not child.frozen
+    assert child.add_or_dodge("foo") == "foo_"
+    assert "foo_" not in parent
+
+
+def test_scope_python_shared() -> None:
+    """Test that Python language scopes share their reserved symbols but not additions."""
+    lang = PythonLanguageProvider()
+    a = lang.language_scope()
+    b = PythonLanguageProvider().language_scope()
+    assert a.parent is not None and a.parent is b.parent
+    assert a.parent.frozen
+
+    a.add_or_die("foo")
+    assert "foo" not in b
+    assert b.add_or_dodge("foo") == "foo"
+
+
+def test_scope_python_provider() -> None:
+    """Test that Python language scopes use their own provider, not the one of the shared scope."""
+
+    class _Provider(PythonLanguageProvider):
+        def __init__(self, allow_foo: bool) -> None:
+            super().__init__()
+            self.allow_foo = allow_foo
+
+        def symbol_legal(self, name: str) -> bool:
+            return super().symbol_legal(name) and (self.allow_foo or name != "foo")
+
+    _Provider(allow_foo=True).language_scope().add_or_die("foo")
+    scope = Scope(_Provider(allow_foo=False).language_scope())
+    with pytest.raises(ValueError):
+        scope.add_or_die("foo")
+
+
+def test_scope_add_or_dodge_parent_changes() -> None:
+    """Test that dodging accounts for symbols added to parents and by other bases."""
+    parent = Scope(PythonLanguageProvider())
+    child = Scope(parent)
+    assert child.add_or_dodge("foo") == "foo"
+    parent.add_or_die("foo_")
+    child.add_or_die("foo_2")
+    assert child.add_or_dodge("foo") == "foo_3"
+    assert child.add_or_dodge("foo_") == "foo__"
+    parent.add_or_die("foo_4")
+    assert child.add_or_dodge("foo") == "foo_5"
+
+
+def test_scope_add_or_dodge_many() -> None:
+    """Test dodging more collisions than the recursion limit and deeply nested scopes."""
+    scope = Scope(PythonLanguageProvider())
+    for _ in range(3000):
+        scope.add_or_dodge("input")
+    assert "input_2999" in scope
+    assert scope.add_or_dodge("input") == "input_3000"
+
+    for _ in range(3000):
+        scope = Scope(scope)
+    assert "input_3000" in scope
+    assert scope.add_or_dodge("input") == "input_3001"